@@ -0,0 +1,368 @@
+"""Benchmarks of the hot paths, run with `pytest benchmarks/`.
+
+The benchmarks listed in the baseline file are tracked: the session fails when
+one of them is slower than its baseline by more than the regression threshold.
+Baseline times are scaled by a calibration workload, so that a baseline
+recorded on one machine remains usable on another. The workload is timed
+after every benchmark and the fastest time of the run is used. A machine that
+is busy for a few seconds can slow down a whole benchmark, so tracked
+benchmarks that regressed are run again at the end of the run, a few seconds
+apart and up to `MAX_ATTEMPTS` times in total, and the fastest run is kept.
+
+Options:
+    --baseline-file: the baseline to compare against, defaults to
+        benchmarks/baseline.json
+    --regression-threshold: the allowed slowdown in percent, defaults to the
+        BENCHMARK_REGRESSION_THRESHOLD environment variable or 25
+    --micro-regression-threshold: the allowed slowdown in percent of
+        benchmarks faster than 100us, defaults to the
+        BENCHMARK_MICRO_REGRESSION_THRESHOLD environment variable or 50
+    --update-baseline: record the results of this run as the new baseline
+"""
+
+import json
+import os
+import platform
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+# The statistic that is compared, the minimum is the least sensitive to noise
+# from other processes
+STAT = "min"
+# Lower bounds for the pytest-benchmark options of the same name. Enough
+# rounds are needed for the minimum to be reached, and microsecond scale
+# benchmarks are timed over many calls per round to even out timer jitter.
+MIN_ROUNDS = 20
+MIN_ROUND_TIME = 0.0001
+# Benchmarks faster than this are compared with the micro regression
+# threshold, as small differences in memory layout and caches already change
+# them by tens of percent
+MICRO_BENCHMARK_TIME = 0.0001
+# The number of times a tracked benchmark is run while it is regressed, and
+# the pause in seconds before each rerun so that it does not fall in the same
+# busy period of the machine
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 2.0
+
+
+class BenchmarkResult(NamedTuple):
+    time: float
+    # The pytest-benchmark stats of the run
+    metadata: Any
+
+
+class Comparison(NamedTuple):
+    name: str
+    expected: float
+    actual: float
+    change: float
+    regressed: bool
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark baseline")
+    group.addoption(
+        "--baseline-file",
+        default=str(BASELINE_PATH),
+        help="Baseline file to compare the benchmarks against",
+    )
+    group.addoption(
+        "--regression-threshold",
+        type=float,
+        default=float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "25")),
+        help="Fail when a tracked benchmark is slower by more than this percentage",
+    )
+    group.addoption(
+        "--micro-regression-threshold",
+        type=float,
+        default=float(os.getenv("BENCHMARK_MICRO_REGRESSION_THRESHOLD", "50")),
+        help="Fail when a tracked benchmark faster than 100us is slower by more than this percentage",
+    )
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="Record the results of this run as the new baseline",
+    )
+
+
+def _calibrate(repeat: int = 20) -> float:
+    """Time a fixed pure Python workload, best of `repeat`"""
+    pattern = re.compile(r"(\w+)-(\d+)")
+
+    def workload():
+        data = {}
+        for i in range(20_000):
+            match = pattern.match(f"key-{i}")
+            data[match.group(1) + match.group(2)] = [i, str(i)]
+        return sorted(data, key=len)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def _is_benchmark(item) -> bool:
+    benchmark_session = getattr(item.config, "_benchmarksession", None)
+    return (
+        benchmark_session is not None
+        and not benchmark_session.disabled
+        and "benchmark" in getattr(item, "fixturenames", ())
+    )
+
+
+def _compare(config, name: str, result: BenchmarkResult) -> Comparison:
+    baseline = config._baseline
+    scale = config._calibration / baseline["calibration"]
+    expected = baseline["benchmarks"][name] * scale
+    change = (result.time / expected - 1) * 100
+    if expected < MICRO_BENCHMARK_TIME:
+        threshold = config.getoption("micro_regression_threshold")
+    else:
+        threshold = config.getoption("regression_threshold")
+
+    return Comparison(name, expected, result.time, change, change > threshold)
+
+
+def _load_baseline(config) -> Optional[dict]:
+    baseline_path = Path(config.getoption("baseline_file"))
+    if config.getoption("update_baseline") or not baseline_path.exists():
+        return None
+
+    return json.loads(baseline_path.read_text())
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    benchmark_session = getattr(config, "_benchmarksession", None)
+    if benchmark_session is not None:
+        options = benchmark_session.options
+        options["min_rounds"] = max(options["min_rounds"], MIN_ROUNDS)
+        options["min_time"] = max(options["min_time"], MIN_ROUND_TIME)
+
+    config._baseline = _load_baseline(config)
+    config._calibration = _calibrate()
+    config._results = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtestloop(session):
+    yield
+
+    config = session.config
+    if config._baseline is None or session.testsfailed:
+        return
+
+    # Run once all of the benchmarks ran, so that they are compared with the
+    # calibration of the whole run and rerun seconds after they regressed
+    items = {item.name: item for item in session.items if _is_benchmark(item)}
+    for attempt in range(2, MAX_ATTEMPTS + 1):
+        regressed = [
+            items[name]
+            for name in sorted(config._baseline["benchmarks"])
+            if name in config._results
+            and name in items
+            and _compare(config, name, config._results[name]).regressed
+        ]
+        if not regressed:
+            break
+
+        config.get_terminal_writer().line(
+            f"\nRunning {len(regressed)} regressed benchmarks again ({attempt}/{MAX_ATTEMPTS})",
+        )
+        time.sleep(RETRY_DELAY)
+        for item, nextitem in zip(regressed, [*regressed[1:], None]):
+            # Gives the run its own fixtures, as rerunning plugins do
+            item._initrequest()
+            runtestprotocol(item, nextitem=nextitem, log=False)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    if not _is_benchmark(item):
+        return
+
+    config = item.config
+    config._calibration = min(config._calibration, _calibrate(5))
+
+    fixture = item.funcargs["benchmark"]
+    metadata = fixture.stats
+    if metadata is None or fixture.has_error:
+        return
+
+    # Only the fastest run of a benchmark is kept and reported
+    result = BenchmarkResult(getattr(metadata.stats, STAT), metadata)
+    best = config._results.get(item.name)
+    benchmarks = config._benchmarksession.benchmarks
+    if best is None or result.time < best.time:
+        config._results[item.name] = result
+        if best is not None:
+            benchmarks.remove(best.metadata)
+    else:
+        benchmarks.remove(metadata)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = getattr(config, "_results", None)
+    if not results or exitstatus != 0:
+        return
+
+    baseline_path = Path(config.getoption("baseline_file"))
+    if config.getoption("update_baseline"):
+        baseline = {
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "stat": STAT,
+            "calibration": config._calibration,
+            "benchmarks": {name: result.time for name, result in results.items()},
+        }
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        config._baseline_report = (f"Baseline written to {baseline_path}", [])
+        return
+
+    if config._baseline is None:
+        config._baseline_report = (f"No baseline found at {baseline_path}", [])
+        return
+
+    rows = [
+        _compare(config, name, results[name])
+        for name in sorted(config._baseline["benchmarks"])
+        if name in results
+    ]
+    regressions = [row for row in rows if row.regressed]
+    summary = (
+        f"{len(regressions)} of {len(rows)} tracked benchmarks regressed by "
+        f"more than {config.getoption('regression_threshold'):g}% "
+        f"({config.getoption('micro_regression_threshold'):g}% below "
+        f"{MICRO_BENCHMARK_TIME * 1e6:g}us)"
+    )
+    config._baseline_report = (summary, rows)
+    if regressions:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    report = getattr(config, "_baseline_report", None)
+    if report is None:
+        return
+
+    summary, rows = report
+    terminalreporter.section("benchmark baseline")
+    for name, expected, actual, change, regressed in rows:
+        terminalreporter.write_line(
+            f"{'REGRESSED' if regressed else 'ok':<10}{name:<60}"
+            f"{expected * 1e6:>12.1f}us {actual * 1e6:>12.1f}us {change:>+8.1f}%",
+            red=regressed,
+        )
+    terminalreporter.write_line(summary, bold=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+
+@pytest.fixture(scope="session")
+def buckets_config() -> dict:
+    return {
+        bucket: {"name": f"stack-cumulus-dev-{bucket}", "type": type}
+        for bucket, type in (
+            ("browse", "public"),
+            ("private", "private"),
+            ("protected", "protected"),
+            ("public", "public"),
+            ("staging", "workflow"),
+        )
+    }
+
+
+BEGINNING_DATE_TIME = "cmrMetadata.TemporalExtent.RangeDateTime.BeginningDateTime"
+
+
+@pytest.fixture(scope="session")
+def collection() -> dict:
+    """A collection with a file spec per product file type"""
+    return {
+        "updatedAt": 1728584062910,
+        "name": "SAMPLE-COLLECTION",
+        "version": "1",
+        "url_path": "{cmrMetadata.CollectionReference.ShortName}/{granule.granuleId}/",
+        "granuleId": "^SAMPLE.*$",
+        "granuleIdExtraction": "(SAMPLE_[0-9]+)\\..*",
+        "files": [
+            {
+                "regex": f"^SAMPLE_[0-9]+\\.{extension}$",
+                "bucket": bucket,
+                "url_path": url_path,
+            }
+            for extension, bucket, url_path in (
+                ("nc", "protected", f"{{extractYear({BEGINNING_DATE_TIME})}}/{{granule.granuleId}}/"),
+                ("nc\\.md5", "protected", None),
+                ("h5", "protected", None),
+                ("iso\\.xml", "public", "metadata/{substring(granule.granuleId, 0, 10)}/"),
+                ("cmr\\.json", "public", "metadata/"),
+                ("png", "browse", f"browse/{{dateFormat({BEGINNING_DATE_TIME}, YYYY/MM/DD)}}/"),
+                ("jpg", "browse", "browse/"),
+                ("kml", "public", None),
+                ("log", "private", "logs/{granule.granuleId}/"),
+                ("txt", "private", None),
+            )
+        ],
+    }
+
+
+@pytest.fixture(scope="session")
+def granules() -> list[tuple[dict, dict]]:
+    """1000 granules of 5 files each, with their UMM-G metadata"""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    granules = []
+    for i in range(1000):
+        granule_id = f"SAMPLE_{i:06d}"
+        granule = {
+            "granuleId": granule_id,
+            "dataType": "SAMPLE-COLLECTION",
+            "version": "1",
+            "files": [
+                {
+                    "bucket": "stack-cumulus-dev-staging",
+                    "key": f"staging/{granule_id}/{file_name}",
+                    "fileName": file_name,
+                }
+                for file_name in (
+                    f"{granule_id}.nc",
+                    f"{granule_id}.nc.md5",
+                    f"{granule_id}.iso.xml",
+                    f"{granule_id}.png",
+                    f"{granule_id}.log.v20240101T000000000",
+                )
+            ],
+        }
+        cmr_metadata = {
+            "GranuleUR": granule_id,
+            "CollectionReference": {"ShortName": "SAMPLE", "Version": "1"},
+            "TemporalExtent": {
+                "RangeDateTime": {
+                    "BeginningDateTime": (start + timedelta(hours=i)).isoformat(),
+                },
+            },
+        }
+        granules.append((granule, cmr_metadata))
+
+    return granules
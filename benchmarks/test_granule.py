@@ -0,0 +1,49 @@
+import re
+
+from cumulus_port.ingest.granule import (
+    extract_granule_id,
+    is_file_renamed,
+    unversion_filename,
+    unversion_filenames,
+)
+
+FILENAMES = [
+    f"SAMPLE_{i:06d}.nc.v20240101T{i % 24:02d}0000000" if i % 2 else f"SAMPLE_{i:06d}.nc"
+    for i in range(10_000)
+]
+GRANULE_ID_EXTRACTION = re.compile(r"(SAMPLE_[0-9]+)\..*")
+
+
+def test_unversion_filename(benchmark):
+    results = benchmark(lambda: [unversion_filename(filename) for filename in FILENAMES])
+
+    assert results[1] == "SAMPLE_000001.nc"
+
+
+def test_is_file_renamed(benchmark):
+    results = benchmark(lambda: [is_file_renamed(filename) for filename in FILENAMES])
+
+    assert sum(results) == 5000
+
+
+def test_unversion_filenames_loop(benchmark):
+    # The per name equivalent of unversion_filenames
+    def unversion_each():
+        names = [unversion_filename(filename) for filename in FILENAMES]
+        renamed = [is_file_renamed(filename) for filename in FILENAMES]
+        granule_ids = [extract_granule_id(name, GRANULE_ID_EXTRACTION) for name in names]
+        return names, renamed, granule_ids
+
+    names, renamed, granule_ids = benchmark(unversion_each)
+
+    assert names[1] == "SAMPLE_000001.nc"
+    assert sum(renamed) == 5000
+    assert granule_ids[1] == "SAMPLE_000001"
+
+
+def test_unversion_filenames(benchmark):
+    result = benchmark(unversion_filenames, FILENAMES, granule_id_extraction=GRANULE_ID_EXTRACTION)
+
+    assert result.names[1] == "SAMPLE_000001.nc"
+    assert sum(result.renamed) == 5000
+    assert result.granule_ids[1] == "SAMPLE_000001"
@@ -0,0 +1,54 @@
+"""Cold import time of the modules used by the move and search tasks.
+
+Every module is imported in a fresh interpreter with `python -X importtime`,
+the best of a few runs is compared to its budget. The budgets can be scaled
+for slow machines with the IMPORT_TIME_BUDGET_SCALE environment variable.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+RUNS = 5
+# Milliseconds, including the standard library modules imported on the way
+BUDGETS = {
+    "cumulus_port": 10,
+    "cumulus_port.aws_client.s3": 40,
+    "cumulus_port.cmr_client": 10,
+    "cumulus_port.cmr_client.cmr": 300,
+    "cumulus_port.cmrjs.cmr_utils": 60,
+    "cumulus_port.ingest.url_path_template": 40,
+    "cumulus_port.launchpad_auth": 60,
+    "cumulus_port.move_granules": 75,
+}
+
+
+def import_time(module: str) -> float:
+    """Import a module in a new interpreter
+
+    :returns: float - the cumulative import time of the module in ms
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        # import time: <self us> | <cumulative us> | <indented module name>
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+
+    raise ValueError(f"{module} not found in the import times")
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_time(module):
+    budget = BUDGETS[module] * float(os.getenv("IMPORT_TIME_BUDGET_SCALE", "1"))
+
+    best = min(import_time(module) for _ in range(RUNS))
+
+    assert best <= budget, f"importing {module} took {best:.1f}ms, budget {budget:g}ms"
@@ -0,0 +1,20 @@
+from cumulus_port._internal import jsonpath
+
+DATA = {
+    "granule": {
+        "granuleId": "SAMPLE_000001",
+        "files": [{"name": f"file-{i}", "size": i} for i in range(20)],
+    },
+}
+
+
+def test_jsonpath_get(benchmark):
+    assert benchmark(jsonpath.get, DATA, "granule.granuleId") == ["SAMPLE_000001"]
+
+
+def test_jsonpath_get_index(benchmark):
+    assert benchmark(jsonpath.get, DATA, "granule.files[10].name") == ["file-10"]
+
+
+def test_jsonpath_get_wildcard(benchmark):
+    assert len(benchmark(jsonpath.get, DATA, "granule.files[*].name")) == 20
@@ -0,0 +1,35 @@
+from cumulus_port.move_granules import get_bucket_and_key_for_file
+
+
+def test_get_bucket_and_key_for_file(benchmark, collection, granules, buckets_config):
+    def move_all():
+        return [
+            get_bucket_and_key_for_file(file, granule, collection, cmr_metadata, buckets_config)
+            for granule, cmr_metadata in granules
+            for file in granule["files"]
+        ]
+
+    results = benchmark(move_all)
+
+    assert len(results) == 5000
+    assert results[0] == ("stack-cumulus-dev-protected", "2024/SAMPLE_000000/SAMPLE_000000.nc")
+
+
+def test_get_bucket_and_key_for_file_lazy_metadata(benchmark, collection, granules, buckets_config):
+    # Files that do not need the metadata never load it
+    files = [
+        (file, granule, lambda: cmr_metadata)
+        for granule, cmr_metadata in granules
+        for file in granule["files"]
+        if file["key"].endswith((".iso.xml", ".log.v20240101T000000000"))
+    ]
+
+    def move_all():
+        return [
+            get_bucket_and_key_for_file(file, granule, collection, loader, buckets_config)
+            for file, granule, loader in files
+        ]
+
+    results = benchmark(move_all)
+
+    assert len(results) == 2000
@@ -0,0 +1,45 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from cumulus_port.aws_client.s3 import s3_join, s3_object_exists
+
+
+@pytest.fixture
+def s3_client():
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="benchmark-bucket")
+        for i in range(100):
+            client.put_object(Bucket="benchmark-bucket", Key=f"granules/{i:04d}.nc", Body=b"x")
+        yield client
+
+
+def test_s3_join(benchmark):
+    result = benchmark(s3_join, "/products/", "2024", "SAMPLE_000001/", "SAMPLE_000001.nc")
+
+    assert result == "products/2024/SAMPLE_000001/SAMPLE_000001.nc"
+
+
+def test_s3_join_list(benchmark):
+    tokens = ["/stack-cumulus-dev/", "SAMPLE-COLLECTION___1", "SAMPLE_000001/", "file.nc"]
+
+    assert benchmark(s3_join, tokens) == "stack-cumulus-dev/SAMPLE-COLLECTION___1/SAMPLE_000001/file.nc"
+
+
+def test_s3_object_exists(benchmark, s3_client):
+    def check():
+        return [
+            s3_object_exists(s3_client, Bucket="benchmark-bucket", Key=f"granules/{i:04d}.nc")
+            for i in range(0, 200, 20)
+        ]
+
+    assert benchmark(check) == [True] * 5 + [False] * 5
+
+
+def test_s3_put_get_object(benchmark, s3_client):
+    def put_get():
+        s3_client.put_object(Bucket="benchmark-bucket", Key="benchmark/object", Body=b"x" * 1024)
+        return s3_client.get_object(Bucket="benchmark-bucket", Key="benchmark/object")["Body"].read()
+
+    assert len(benchmark(put_get)) == 1024
@@ -0,0 +1,85 @@
+import pytest
+
+from cumulus_port._internal import throttle
+from cumulus_port.cmr_client.search_concept import (
+    search_concept,
+    search_concept_chunked,
+    search_concept_pages,
+)
+from tests.cumulus.stub_server import StubServer, make_granules
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with StubServer(granules=make_granules(2000)) as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def stub_cmr(stub_server, monkeypatch):
+    monkeypatch.setattr(
+        "cumulus_port.cmr_client.search_concept.get_search_url",
+        lambda **kwargs: f"{stub_server.url}/search/",
+    )
+    monkeypatch.setattr(throttle, "_throttle", throttle.Throttle())
+
+
+def test_search_concept_paging(benchmark):
+    results = benchmark(
+        search_concept,
+        type="granules",
+        search_params={},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_limit=1000,
+        cmr_page_size=100,
+    )
+
+    assert len(results) == 1000
+
+
+def test_search_concept_stream(benchmark):
+    results = benchmark(
+        search_concept,
+        type="granules",
+        search_params={},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_limit=1000,
+        cmr_page_size=100,
+        stream=True,
+    )
+
+    assert len(results) == 1000
+
+
+def test_search_concept_pages(benchmark):
+    def search():
+        return sum(
+            len(page.items)
+            for page in search_concept_pages(
+                type="granules",
+                search_params={},
+                format="umm_json",
+                cmr_environment="UAT",
+                cmr_page_size=500,
+            )
+        )
+
+    assert benchmark(search) == 2000
+
+
+def test_search_concept_chunked(benchmark):
+    granule_urs = [f"granule-{i:06d}" for i in range(0, 2000, 4)]
+
+    results = benchmark(
+        search_concept_chunked,
+        type="granules",
+        search_params={"granule_ur[]": granule_urs},
+        format="json",
+        cmr_environment="UAT",
+        chunk_size=100,
+        max_workers=4,
+    )
+
+    assert len(results) == 500
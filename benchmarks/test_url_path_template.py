@@ -0,0 +1,44 @@
+from cumulus_port.ingest.url_path_template import url_path_template
+
+CONTEXT = {
+    "granule": {"granuleId": "SAMPLE_000001", "files": [{"name": "a"}, {"name": "b"}]},
+    "cmrMetadata": {
+        "CollectionReference": {"ShortName": "SAMPLE"},
+        "TemporalExtent": {
+            "RangeDateTime": {"BeginningDateTime": "2024-03-05T06:07:08.123Z"},
+        },
+    },
+}
+
+
+def test_url_path_template_simple(benchmark):
+    result = benchmark(
+        url_path_template,
+        "{cmrMetadata.CollectionReference.ShortName}/{granule.granuleId}/",
+        CONTEXT,
+    )
+
+    assert result == "SAMPLE/SAMPLE_000001/"
+
+
+def test_url_path_template_operations(benchmark):
+    result = benchmark(
+        url_path_template,
+        "{extractYear(cmrMetadata.TemporalExtent.RangeDateTime.BeginningDateTime)}/"
+        "{dateFormat(cmrMetadata.TemporalExtent.RangeDateTime.BeginningDateTime, YYYY-MM-DD)}/"
+        "{substring(granule.granuleId, 0, 6)}/"
+        "{defaultTo(granule.missing, default)}/",
+        CONTEXT,
+    )
+
+    assert result == "2024/2024-03-05/SAMPLE/default/"
+
+
+def test_url_path_template_nested(benchmark):
+    result = benchmark(
+        url_path_template,
+        "{granule.files[1].name}/{granule.granuleId}/",
+        CONTEXT,
+    )
+
+    assert result == "b/SAMPLE_000001/"
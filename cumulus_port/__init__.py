@@ -0,0 +1,14 @@
+from typing import TYPE_CHECKING
+
+from cumulus_port._internal.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .lambda_init import warmup
+
+__all__ = [
+    "warmup",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "warmup": ".lambda_init",
+})
@@ -1,7 +1,25 @@
-import jsonpath_ng
-import jsonpath_ng.ext
+"""This modules contains internal implementations that don't exist in cumulus
+but are necessary to be able to port code to Python.
+"""
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import jsonpath_ng
+
+
+@functools.lru_cache(maxsize=1024)
+def parse(path: str) -> "jsonpath_ng.JSONPath":
+    """Parse a jsonpath expression, reusing previously parsed expressions
+
+    NOTE: jsonpath_ng builds its parser tables when it is imported, so it is
+    only imported once a template is compiled.
+    """
+    import jsonpath_ng.ext
+
+    return jsonpath_ng.ext.parse(path)
 
 
 def get(data: dict, path: str) -> list:
-    expr = jsonpath_ng.ext.parse(path)
+    expr = parse(path)
     return [match.value for match in expr.find(data)]
@@ -0,0 +1,40 @@
+"""Lazy exports for package `__init__` modules.
+
+Importing a package only imports the modules that its exports come from when
+one of the exports is first accessed, so that importing the package does not
+pull in heavy dependencies such as boto3 or requests.
+
+Example:
+>>> __getattr__, __dir__ = lazy_exports(__name__, {"CMR": ".cmr"})
+"""
+
+import importlib
+import sys
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str,
+    exports: dict[str, str],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Create the module level `__getattr__` and `__dir__` of a package
+
+    :param package: the name of the package, `__name__` of the `__init__`
+    :param exports: the module that each exported name is imported from,
+        relative to the package or absolute
+    :returns: the `__getattr__` and `__dir__` functions
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Later accesses don't go through `__getattr__`
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*vars(sys.modules[package]), *exports})
+
+    return __getattr__, __dir__
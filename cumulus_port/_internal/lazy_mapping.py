@@ -0,0 +1,51 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator
+
+
+class LazyMapping(Mapping):
+    """A read only mapping where some of the values are computed the first
+    time they are accessed.
+
+    Example:
+    >>> context = LazyMapping(
+    ...     {"granule": {"granuleId": "foo"}},
+    ...     loaders={"cmrMetadata": lambda: fetch_metadata()},
+    ... )
+    >>> context["granule"]  # fetch_metadata has not been called
+    {'granuleId': 'foo'}
+    """
+
+    def __init__(
+        self,
+        values: Mapping,
+        loaders: Mapping[str, Callable[[], Any]],
+    ):
+        """
+        :param values: the values that are known up front
+        :param loaders: functions to call to compute the remaining values
+        """
+        self._values = dict(values)
+        self._loaders = {
+            key: loader
+            for key, loader in loaders.items()
+            if key not in self._values
+        }
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values and key in self._loaders:
+            self._values[key] = self._loaders.pop(key)()
+
+        return self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._loaders
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._values)
+        yield from list(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._loaders)
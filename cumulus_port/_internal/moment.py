@@ -0,0 +1,152 @@
+"""Helpers for reproducing the JavaScript `Date` and `moment` date handling
+used by cumulus templates.
+"""
+import functools
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Union
+
+ISO_DATE_PATTERN = re.compile(
+    r"^\s*(\d{4})-(\d{2})(?:-(\d{2}))?"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?)?"
+    r"\s*(Z|[+-]\d{2}(?::?\d{2})?)?\s*$",
+    re.IGNORECASE,
+)
+FORMAT_TOKEN_PATTERN = re.compile(
+    r"\[[^\[\]]*\]|Do|DDDD|DDD|DD|D|dddd|ddd|dd|d|YYYY|YY|Q|MMMM|MMM|MM|M"
+    r"|HH|H|hh|h|mm|m|ss|s|S{1,9}|A|a|X|x|ZZ|Z|.",
+    re.DOTALL,
+)
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June", "July", "August",
+    "September", "October", "November", "December",
+]
+WEEKDAY_NAMES = [
+    "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday",
+    "Saturday",
+]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date(value: Union[str, int, float]) -> datetime:
+    """Parse a date the way `new Date(value)` does for the values found in
+    granule metadata: ISO 8601 strings and milliseconds since the epoch.
+
+    Dates without a timezone are treated as UTC. Results are cached, since the
+    same timestamps are typically parsed for every file in a granule.
+
+    :param value: the date to parse
+    :returns: datetime - a timezone aware datetime in UTC
+    :raises: ValueError - if the value is not a valid date
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid date {repr(value)}")
+    if isinstance(value, (int, float)):
+        return EPOCH + timedelta(milliseconds=value)
+
+    m = ISO_DATE_PATTERN.match(str(value))
+    if not m:
+        raise ValueError(f"Invalid date {repr(value)}")
+
+    year, month, day, hour, minute, second, fraction, offset = m.groups()
+    microsecond = int((fraction or "0")[:6].ljust(6, "0"))
+
+    tz = timezone.utc
+    if offset and offset.upper() != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        tz = timezone(sign * timedelta(
+            hours=int(digits[:2]),
+            minutes=int(digits[2:] or "0"),
+        ))
+
+    return datetime(
+        int(year),
+        int(month),
+        int(day or 1),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        microsecond,
+        tzinfo=tz,
+    ).astimezone(timezone.utc)
+
+
+def _ordinal(n: int) -> str:
+    if 11 <= n % 100 <= 13:
+        return f"{n}th"
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def _hour12(d: datetime) -> int:
+    return d.hour % 12 or 12
+
+
+def _fraction(digits: int) -> Callable[[datetime], str]:
+    return lambda d: f"{d.microsecond:06d}000"[:digits]
+
+
+FORMAT_TOKENS: dict[str, Callable[[datetime], str]] = {
+    "YYYY": lambda d: f"{d.year:04d}",
+    "YY": lambda d: f"{d.year % 100:02d}",
+    "Q": lambda d: str((d.month - 1) // 3 + 1),
+    "MMMM": lambda d: MONTH_NAMES[d.month - 1],
+    "MMM": lambda d: MONTH_NAMES[d.month - 1][:3],
+    "MM": lambda d: f"{d.month:02d}",
+    "M": lambda d: str(d.month),
+    "DDDD": lambda d: f"{d.timetuple().tm_yday:03d}",
+    "DDD": lambda d: str(d.timetuple().tm_yday),
+    "DD": lambda d: f"{d.day:02d}",
+    "Do": lambda d: _ordinal(d.day),
+    "D": lambda d: str(d.day),
+    "dddd": lambda d: WEEKDAY_NAMES[d.isoweekday() % 7],
+    "ddd": lambda d: WEEKDAY_NAMES[d.isoweekday() % 7][:3],
+    "dd": lambda d: WEEKDAY_NAMES[d.isoweekday() % 7][:2],
+    "d": lambda d: str(d.isoweekday() % 7),
+    "HH": lambda d: f"{d.hour:02d}",
+    "H": lambda d: str(d.hour),
+    "hh": lambda d: f"{_hour12(d):02d}",
+    "h": lambda d: str(_hour12(d)),
+    "mm": lambda d: f"{d.minute:02d}",
+    "m": lambda d: str(d.minute),
+    "ss": lambda d: f"{d.second:02d}",
+    "s": lambda d: str(d.second),
+    "A": lambda d: "PM" if d.hour >= 12 else "AM",
+    "a": lambda d: "pm" if d.hour >= 12 else "am",
+    "X": lambda d: str(int((d - EPOCH).total_seconds())),
+    "x": lambda d: str((d - EPOCH) // timedelta(milliseconds=1)),
+    "ZZ": lambda d: "+0000",
+    "Z": lambda d: "+00:00",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def compile_format(format: str) -> Callable[[datetime], str]:
+    """Compile a moment.js format string, e.g. 'YYYY/MM/DD', into a function
+    that formats a UTC datetime the way `moment.utc(date).format(format)` does.
+
+    :param format: the moment.js format string
+    :returns: a function that formats a datetime
+    """
+    parts: list[Union[str, Callable[[datetime], str]]] = []
+    for token in FORMAT_TOKEN_PATTERN.findall(format):
+        if token in FORMAT_TOKENS:
+            parts.append(FORMAT_TOKENS[token])
+        elif token.startswith("S"):
+            parts.append(_fraction(len(token)))
+        elif token.startswith("[") and token.endswith("]"):
+            parts.append(token[1:-1])
+        else:
+            parts.append(token)
+
+    def format_date(d: datetime) -> str:
+        return "".join(
+            part if isinstance(part, str) else part(d)
+            for part in parts
+        )
+
+    return format_date
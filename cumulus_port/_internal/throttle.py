@@ -0,0 +1,397 @@
+"""Process wide rate limiting and retrying of throttled HTTP requests.
+
+All CMR and Earthdata Login requests go through the same `Throttle`, so that
+concurrent searches and ingests share one request budget. Requests that are
+throttled anyway (429 or 503) are retried with capped exponential backoff and
+full jitter, or after the delay requested by the server with `Retry-After`.
+
+The default throttle does not limit the request rate. It can be configured
+with `configure_throttle` or the `CMR_RATE_LIMIT`, `CMR_RATE_BURST` and
+`CMR_MAX_RETRIES` environment variables, which are read when the throttle is
+first used. Invalid values are logged and the defaults are used instead.
+"""
+
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping, Optional
+
+from cumulus_port.instrumentation.hooks import current_span
+
+if TYPE_CHECKING:
+    import requests
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RETRY_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """A thread safe token bucket that allows bursts of up to `capacity`
+    requests and `rate` requests per second on average.
+
+    Tokens are reserved in the order that callers arrive, and the waiting is
+    done without holding the lock.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        *,
+        timer: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """
+        :param rate: number of tokens added per second
+        :param capacity: the maximum number of tokens, defaults to `rate`
+        :param timer: the clock used to add tokens
+        :param sleep: the function used to wait for tokens
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self.timer = timer
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Take tokens from the bucket, waiting for them if necessary
+
+        :param tokens: the number of tokens to take
+        :returns: float - the number of seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self.sleep(wait)
+
+        return wait
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens from the bucket without waiting for them, for callers
+        that wait by other means such as `asyncio.sleep`
+
+        :param tokens: the number of tokens to take
+        :returns: float - the number of seconds to wait before the tokens are
+            available
+        """
+        with self._lock:
+            now = self.timer()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header
+
+    :param value: the header value, either seconds or an HTTP date
+    :returns: Optional[float] - the number of seconds to wait, None if the
+        value is missing or invalid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Retry throttled responses with capped exponential backoff and full
+    jitter, honoring Retry-After up to the maximum delay.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        *,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_statuses: tuple[int, ...] = DEFAULT_RETRY_STATUSES,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ):
+        """
+        :param max_retries: the maximum number of retries of one request
+        :param base_delay: the backoff of the first retry in seconds
+        :param max_delay: the largest delay in seconds, which also caps the
+            delays asked for with Retry-After
+        :param retry_statuses: the status codes to retry
+        :param jitter: the function used to pick a delay within a range
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.jitter = jitter
+
+    def should_retry(self, status_code: int, attempt: int) -> bool:
+        """
+        :param status_code: the status of the response to the latest attempt
+        :param attempt: number of the latest attempt, starting at 0
+        :returns: bool - whether the request should be sent again
+        """
+        return status_code in self.retry_statuses and attempt < self.max_retries
+
+    def get_delay(self, headers: Mapping[str, str], attempt: int) -> float:
+        """
+        :param headers: the headers of the response to the latest attempt
+        :param attempt: number of the latest attempt, starting at 0
+        :returns: float - the number of seconds to wait before retrying
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return self.jitter(0, backoff)
+
+
+class Throttle:
+    """Rate limit requests and retry the throttled ones
+
+    Example:
+    >>> throttle = Throttle(TokenBucket(rate=10), RetryPolicy(max_retries=3))
+    >>> response = throttle.call(requests.get, url, params=params)
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        *,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """
+        :param bucket: the rate limit, None for no limit
+        :param retry_policy: the retry policy, None to never retry
+        :param sleep: the function used to wait between retries
+        """
+        self.bucket = bucket
+        self.retry_policy = retry_policy
+        self.sleep = sleep
+        self._counts: Counter = Counter()
+        self._retries_by_status: Counter = Counter()
+        self._wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        func: Callable[..., "requests.Response"],
+        *args: Any,
+        **kwargs: Any,
+    ) -> "requests.Response":
+        """Send a request, waiting for the rate limit and retrying it while
+        it is throttled
+
+        :param func: the function sending the request, e.g. `requests.get`
+        :returns: requests.Response - the last response
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire() if self.bucket is not None else 0.0
+            response = func(*args, **kwargs)
+            delay = self._check_response(
+                response.status_code,
+                response.headers,
+                attempt,
+                waited,
+            )
+            if delay is None:
+                return response
+
+            response.close()
+            self.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Send a request from a coroutine, waiting for the rate limit and
+        retrying it while it is throttled, without blocking the event loop
+
+        :param send: function returning a new `aiohttp` response every time
+            it is awaited
+        :returns: the last response
+        """
+        import asyncio
+
+        attempt = 0
+        while True:
+            waited = self.bucket.reserve() if self.bucket is not None else 0.0
+            if waited > 0:
+                await asyncio.sleep(waited)
+
+            response = await send()
+            delay = self._check_response(
+                response.status,
+                response.headers,
+                attempt,
+                waited,
+            )
+            if delay is None:
+                return response
+
+            response.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _check_response(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        attempt: int,
+        waited: float,
+    ) -> Optional[float]:
+        """Record a response and decide whether to retry it
+
+        :returns: Optional[float] - the seconds to wait before retrying, None
+            if the response should not be retried
+        """
+        policy = self.retry_policy
+        retry = policy is not None and policy.should_retry(status_code, attempt)
+        delay = policy.get_delay(headers, attempt) if retry else 0.0
+        statuses = policy.retry_statuses if policy else DEFAULT_RETRY_STATUSES
+
+        with self._lock:
+            self._counts["requests"] += 1
+            if status_code in statuses:
+                self._counts["throttled"] += 1
+            if retry:
+                self._counts["retries"] += 1
+                self._retries_by_status[status_code] += 1
+            self._wait_seconds += waited + delay
+
+        if not retry:
+            return None
+
+        span = current_span()
+        if span is not None:
+            span.retries += 1
+
+        log.warning(
+            "Request throttled with status %s, retrying in %.2fs",
+            status_code,
+            delay,
+        )
+        return delay
+
+    def stats(self) -> dict:
+        """Get the request counts
+
+        :returns: dict - the number of requests, throttled responses and
+            retries, the retries by status code, and the total number of
+            seconds spent waiting
+        """
+        with self._lock:
+            return {
+                "requests": self._counts["requests"],
+                "throttled": self._counts["throttled"],
+                "retries": self._counts["retries"],
+                "retriesByStatus": dict(self._retries_by_status),
+                "waitSeconds": self._wait_seconds,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._retries_by_status.clear()
+            self._wait_seconds = 0.0
+
+
+def _throttle_from_env() -> Throttle:
+    rate = os.getenv("CMR_RATE_LIMIT")
+    burst = os.getenv("CMR_RATE_BURST")
+    max_retries = os.getenv("CMR_MAX_RETRIES")
+
+    try:
+        return Throttle(
+            TokenBucket(float(rate), float(burst) if burst else None) if rate else None,
+            RetryPolicy(int(max_retries) if max_retries else 5),
+        )
+    except ValueError as e:
+        log.warning("Invalid throttle environment variables, using the defaults: %s", e)
+        return Throttle(None, RetryPolicy())
+
+
+def _load_throttle() -> Throttle:
+    global _throttle
+
+    with _throttle_lock:
+        if _throttle is _UNSET:
+            _throttle = _throttle_from_env()
+        return _throttle
+
+
+_UNSET: Any = object()
+# Read from the environment on first use, so that invalid values can't fail
+# the import
+_throttle: Throttle = _UNSET
+_throttle_lock = threading.Lock()
+
+
+def get_throttle() -> Throttle:
+    """Get the throttle shared by all CMR and Earthdata Login requests"""
+    throttle = _throttle
+    return _load_throttle() if throttle is _UNSET else throttle
+
+
+def configure_throttle(
+    *,
+    rate: Optional[float] = None,
+    burst: Optional[float] = None,
+    max_retries: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+) -> Throttle:
+    """Replace the shared throttle
+
+    :param rate: the average number of requests per second, None for no limit
+    :param burst: the number of requests that may be sent at once, defaults
+        to `rate`
+    :param max_retries: the maximum number of retries of one request
+    :param base_delay: the backoff of the first retry in seconds
+    :param max_delay: the largest backoff in seconds
+    :returns: Throttle - the new throttle
+    """
+    global _throttle
+
+    _throttle = Throttle(
+        TokenBucket(rate, burst) if rate is not None else None,
+        RetryPolicy(max_retries, base_delay=base_delay, max_delay=max_delay),
+    )
+    return _throttle
+
+
+def throttled(
+    func: Callable[..., "requests.Response"],
+    *args: Any,
+    **kwargs: Any,
+) -> "requests.Response":
+    """Send a request through the shared throttle
+
+    :param func: the function sending the request, e.g. `requests.get`
+    :returns: requests.Response - the last response
+    """
+    return get_throttle().call(func, *args, **kwargs)
@@ -2,10 +2,12 @@
 # https://github.com/nasa/cumulus/blob/master/packages/aws-client/src/S3.ts
 
 import re
-from typing import Union
+from typing import TYPE_CHECKING, Optional, Union
 
-import boto3
-import botocore
+from cumulus_port.instrumentation import instrument
+
+if TYPE_CHECKING:
+    import boto3
 
 
 def s3_join(*args: Union[str, list[str]]) -> str:
@@ -39,7 +41,7 @@ def s3_join(*args: Union[str, list[str]]) -> str:
     return key
 
 
-def s3_object_exists(s3: boto3.client, **kwargs) -> bool:
+def s3_object_exists(s3: "boto3.client", **kwargs) -> bool:
     """Test if an object exists in S3
 
     :param kwargs: same params as
@@ -47,11 +49,66 @@ def s3_object_exists(s3: boto3.client, **kwargs) -> bool:
     :returns: bool - a Promise that will resolve to a boolean indicating if the
         object exists
     """
-    try:
-        s3.head_object(**kwargs)
-    except botocore.exceptions.ClientError as e:
-        if e.response["Error"]["Message"] == "Not Found":
-            return False
-        raise
+    import botocore.exceptions
+
+    with instrument(
+        "s3.head_object",
+        bucket=kwargs.get("Bucket"),
+        key=kwargs.get("Key"),
+    ) as span:
+        try:
+            response = s3.head_object(**kwargs)
+        except botocore.exceptions.ClientError as e:
+            span.status = _get_status(e.response)
+            if e.response["Error"]["Message"] == "Not Found":
+                return False
+            raise
+        span.status = _get_status(response)
 
     return True
+
+
+def get_object(s3: "boto3.client", **kwargs) -> dict:
+    """Get an object from S3
+
+    :param kwargs: same params as
+        https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/get_object.html
+    :returns: dict - the get_object response, with the Body not yet read
+    """
+    with instrument(
+        "s3.get_object",
+        bucket=kwargs.get("Bucket"),
+        key=kwargs.get("Key"),
+    ) as span:
+        response = s3.get_object(**kwargs)
+        span.status = _get_status(response)
+        span.bytes = response.get("ContentLength")
+
+    return response
+
+
+def s3_put_object(s3: "boto3.client", **kwargs) -> dict:
+    """Put an object on S3
+
+    :param kwargs: same params as
+        https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/put_object.html
+    :returns: dict - the put_object response
+    """
+    with instrument(
+        "s3.put_object",
+        bucket=kwargs.get("Bucket"),
+        key=kwargs.get("Key"),
+    ) as span:
+        body = kwargs.get("Body")
+        if isinstance(body, str):
+            span.bytes = len(body.encode())
+        elif isinstance(body, (bytes, bytearray)):
+            span.bytes = len(body)
+        response = s3.put_object(**kwargs)
+        span.status = _get_status(response)
+
+    return response
+
+
+def _get_status(response: dict) -> Optional[int]:
+    return response.get("ResponseMetadata", {}).get("HTTPStatusCode")
@@ -4,13 +4,17 @@
 import contextlib
 from typing import Optional
 
-import boto3
+from cumulus_port.instrumentation import instrument
+
+from . import services
 
 
 def get_secret_string(secret_id: str) -> Optional[str]:
-    secrets_manager = boto3.client("secretsmanager")
+    secrets_manager = services.secrets_manager()
     with contextlib.suppress(Exception):
-        response = secrets_manager.get_secret_value(SecretId=secret_id)
+        with instrument("secretsmanager.get_secret_value", secret_id=secret_id) as span:
+            response = secrets_manager.get_secret_value(SecretId=secret_id)
+            span.status = response["ResponseMetadata"]["HTTPStatusCode"]
         return response["SecretString"]
 
     return None
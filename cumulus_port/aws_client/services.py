@@ -0,0 +1,46 @@
+# Ported from:
+# https://github.com/nasa/cumulus/blob/master/packages/aws-client/src/services.ts
+# https://github.com/nasa/cumulus/blob/master/packages/aws-client/src/client.ts
+
+import threading
+from typing import Any
+
+_clients: dict[tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def aws_client(service_name: str, **kwargs: Any) -> Any:
+    """Get a memoized boto3 client
+
+    NOTE: boto3 clients are thread safe, but creating them from the default
+    session is not, so clients are created under a lock.
+
+    :param service_name: the name of the AWS service, e.g. 's3'
+    :param kwargs: same params as `boto3.client`
+    :returns: the client, created on the first call with these arguments
+    """
+    key = (service_name, tuple(sorted(kwargs.items())))
+    client = _clients.get(key)
+    if client is None:
+        import boto3
+
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = boto3.client(service_name, **kwargs)
+
+    return client
+
+
+def clear_clients() -> None:
+    """Forget the memoized clients, e.g. after the credentials changed"""
+    with _clients_lock:
+        _clients.clear()
+
+
+def s3() -> Any:
+    return aws_client("s3")
+
+
+def secrets_manager() -> Any:
+    return aws_client("secretsmanager")
@@ -1,7 +1,23 @@
-from .cmr import CMR
-from .get_url import get_search_url
+from typing import TYPE_CHECKING
+
+from cumulus_port._internal.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from cumulus_port._internal.throttle import configure_throttle, get_throttle
+
+    from .cmr import CMR
+    from .get_url import get_search_url
 
 __all__ = [
     "CMR",
+    "configure_throttle",
     "get_search_url",
+    "get_throttle",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "CMR": ".cmr",
+    "configure_throttle": "cumulus_port._internal.throttle",
+    "get_search_url": ".get_url",
+    "get_throttle": "cumulus_port._internal.throttle",
+})
@@ -0,0 +1,403 @@
+"""An asyncio client for searching CMR.
+
+NOTE: This does not exist in cumulus. Searches run on the event loop instead
+of blocking a thread, so many searches can be in flight at once for the cost
+of a coroutine each. The number of concurrent requests of a client is bounded
+by a semaphore, and requests share the process wide throttle with the
+blocking client.
+"""
+
+import asyncio
+import json
+import math
+import os
+import urllib.parse
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+from cumulus_port._internal.throttle import get_throttle
+from cumulus_port.instrumentation import instrument
+
+from .cmr import CMR
+from .earthdata_login import is_token_expired
+from .echo10 import iter_echo10_results
+from .get_url import get_search_url
+from .search_concept import (
+    MAX_GET_QUERY_LENGTH,
+    _get_body_items,
+    _get_page_size,
+    _get_records_limit,
+)
+
+# Number of concurrent requests made by one `AsyncCMR`
+DEFAULT_ASYNC_CONCURRENCY = 16
+
+
+def _query_items(query: dict) -> list[tuple[str, str]]:
+    items = []
+    for key, value in query.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((key, str(v)) for v in values)
+
+    return items
+
+
+def _parse_items(body: bytes, format: str) -> list:
+    if format == "echo10":
+        return list(iter_echo10_results([body]))
+
+    return _get_body_items(json.loads(body))
+
+
+class AsyncCMR:
+    """An asyncio version of `CMR` for searching
+
+    Example:
+    >>> async with AsyncCMR(
+    ...     provider="my-provider",
+    ...     client_id="my-clientId",
+    ...     token="cmr_or_launchpad_token",
+    ...     oauth_provider="earthdata",
+    ... ) as cmr_client:
+    ...     collections = await cmr_client.search_collections({"short_name": "X"})
+    ...     async for granule in cmr_client.iter_granules({"short_name": "X"}):
+    ...         ...
+    """
+
+    def __init__(
+        self,
+        *,
+        provider: str,
+        client_id: str,
+        username: Optional[str] = None,
+        password_secret_name: Optional[str] = None,
+        password: Optional[str] = None,
+        token: Optional[str] = None,
+        oauth_provider: str,
+        max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+        cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+        cmr_host: Optional[str] = os.getenv("CMR_HOST"),
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        """
+        :param provider: the CMR provider id
+        :param client_id: the CMR clientId
+        :param username: CMR username, not used if token is provided
+        :param password_secret_name: CMR password secret, not used if token
+            is provided
+        :param password: CMR password, not used if token or
+            passwordSecretName is provided
+        :param token: CMR or Launchpad token, if not provided, CMR username
+            and password are used to get a cmr token
+        :param oauth_provider: Oauth provider: 'earthdata' or 'launchpad'
+        :param max_concurrency: the maximum number of concurrent requests
+        :param cmr_environment: the CMR environment to use
+        :param cmr_host: custom host name to use instead of the environment
+        :param session: optional session to send the requests with. A
+            session is created, and closed by `close`, if not provided
+        """
+        # Credentials and headers are handled the same way as the blocking
+        # client
+        self._cmr = CMR(
+            provider=provider,
+            client_id=client_id,
+            username=username,
+            password_secret_name=password_secret_name,
+            password=password,
+            token=token,
+            oauth_provider=oauth_provider,
+        )
+        self.provider = provider
+        self.client_id = client_id
+        self.max_concurrency = max_concurrency
+        self.cmr_environment = cmr_environment
+        self.cmr_host = cmr_host
+        self._session = session
+        self._owns_session = session is None
+        self._token: Optional[str] = None
+        # Created on first use so that they belong to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncCMR":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if it was created by the client"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def get_token(self) -> Optional[str]:
+        """The method for getting the token
+
+        NOTE: Unlike `CMR.get_token`, a token retrieved from Earthdata Login
+        is reused until it expires, and concurrent searches wait for the same
+        token instead of each requesting one.
+
+        :returns: the token
+        """
+        if self._cmr.token:
+            return self._cmr.token
+
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+
+        async with self._token_lock:
+            if self._token is None or is_token_expired({"access_token": self._token}):
+                # Token requests are rare, so the blocking implementation is
+                # run in a thread rather than duplicated
+                self._token = await asyncio.to_thread(self._cmr.get_token)
+
+        return self._token
+
+    async def get_read_headers(self) -> dict:
+        """Return object containing CMR request headers for GETs
+
+        :returns: CMR headers object
+        """
+        return self._cmr.get_read_headers(token=await self.get_token())
+
+    def _get_search_url(self, type: str, format: str) -> str:
+        search_url = get_search_url(host=self.cmr_host, cmr_env=self.cmr_environment)
+        return f"{search_url}{type}.{format.lower()}"
+
+    async def _search_page(
+        self,
+        url: str,
+        query: dict,
+        headers: dict,
+        format: str,
+    ) -> tuple[list, int]:
+        session = self._get_session()
+        query_items = _query_items(query)
+        encoded_query = urllib.parse.urlencode(query_items)
+
+        def send():
+            # Large queries are sent as POST, like `search_concept`
+            if len(encoded_query) > MAX_GET_QUERY_LENGTH:
+                return session.post(
+                    url,
+                    data=encoded_query,
+                    headers={
+                        **headers,
+                        "Content-Type": "application/x-www-form-urlencoded",
+                    },
+                )
+            return session.get(url, params=query_items, headers=headers)
+
+        async with self._get_semaphore():
+            with instrument("cmr.search", url=url) as span:
+                response = await get_throttle().call_async(send)
+                span.record_response(response)
+                async with response:
+                    response.raise_for_status()
+                    cmr_hits = response.headers.get("cmr-hits")
+                    if cmr_hits is None:
+                        raise TypeError("cmr-hits header not found")
+                    body = await response.read()
+
+        return _parse_items(body, format), int(cmr_hits)
+
+    def _prepare_query(
+        self,
+        search_params: dict,
+        cmr_page_size: Optional[int],
+    ) -> tuple[dict, int]:
+        query = dict(search_params)
+        if "page_size" not in query:
+            query["page_size"] = str(_get_page_size(search_params, cmr_page_size))
+
+        query_page_num = query.get("page_num")
+        page_num = 1 if query_page_num is None else int(query_page_num) + 1
+
+        return query, page_num
+
+    async def search_concept(
+        self,
+        type: str,
+        search_params: dict,
+        format: str = "json",
+        recursive: bool = True,
+        cmr_limit: Optional[int] = None,
+        cmr_page_size: Optional[int] = None,
+    ) -> list:
+        """Search for concepts
+
+        The first page is requested on its own to learn the number of hits,
+        then the remaining pages are requested concurrently.
+
+        :param type: the concept type, choices: ['collections', 'granules']
+        :param search_params: the search parameters
+        :param format: format of the response, supports umm_json, json, echo10
+        :param recursive: whether to fetch all pages of the results
+        :param cmr_limit: the CMR limit
+        :param cmr_page_size: the CMR page size
+        :returns: the search results
+        """
+        records_limit = _get_records_limit(cmr_limit)
+        headers = await self.get_read_headers()
+        url = self._get_search_url(type, format)
+        query, page_num = self._prepare_query(search_params, cmr_page_size)
+        page_size = int(query["page_size"])
+
+        results, cmr_hits = await self._search_page(
+            url,
+            {**query, "page_num": page_num},
+            headers,
+            format,
+        )
+        if not recursive or not results:
+            return results[:records_limit]
+
+        num_records = min(cmr_hits, records_limit)
+        num_pages = math.ceil(num_records / page_size) if page_size else 1
+        pages = await asyncio.gather(*(
+            self._search_page(
+                url,
+                {**query, "page_num": page_num + offset},
+                headers,
+                format,
+            )
+            for offset in range(1, num_pages)
+        ))
+        for items, _ in pages:
+            results.extend(items)
+
+        return results[:records_limit]
+
+    async def iter_search_concept(
+        self,
+        type: str,
+        search_params: dict,
+        format: str = "json",
+        cmr_limit: Optional[int] = None,
+        cmr_page_size: Optional[int] = None,
+    ) -> AsyncIterator:
+        """Iterate over the search results one at a time
+
+        The next page is requested while the results of the current page are
+        being consumed.
+
+        :param type: the concept type, choices: ['collections', 'granules']
+        :param search_params: the search parameters
+        :param format: format of the response, supports umm_json, json, echo10
+        :param cmr_limit: the CMR limit
+        :param cmr_page_size: the CMR page size
+        :returns: AsyncIterator - the search results
+        """
+        records_limit = _get_records_limit(cmr_limit)
+        headers = await self.get_read_headers()
+        url = self._get_search_url(type, format)
+        query, page_num = self._prepare_query(search_params, cmr_page_size)
+
+        def fetch(page_num: int) -> asyncio.Task:
+            return asyncio.ensure_future(
+                self._search_page(
+                    url,
+                    {**query, "page_num": page_num},
+                    headers,
+                    format,
+                ),
+            )
+
+        num_records = 0
+        next_page = fetch(page_num)
+        try:
+            while next_page is not None:
+                items, cmr_hits = await next_page
+                next_page = None
+
+                remaining = min(cmr_hits, records_limit) - num_records - len(items)
+                if items and remaining > 0:
+                    page_num += 1
+                    next_page = fetch(page_num)
+
+                for item in items[:records_limit - num_records]:
+                    yield item
+                    num_records += 1
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def search_collections(
+        self,
+        params: dict[str, str] = {},
+        format: str = "json",
+    ) -> list:
+        """Search in collections
+
+        :param params: the search parameters
+        :param format: format of the response
+        :returns: the search results
+        """
+        return await self.search_concept(
+            "collections",
+            {"provider_short_name": self.provider, **params},
+            format,
+        )
+
+    async def search_granules(
+        self,
+        params: dict[str, str] = {},
+        format: str = "json",
+    ) -> list:
+        """Search in granules
+
+        :param params: the search parameters
+        :param format: format of the response
+        :returns: the search results
+        """
+        return await self.search_concept(
+            "granules",
+            {"provider_short_name": self.provider, **params},
+            format,
+        )
+
+    def iter_collections(
+        self,
+        params: dict[str, str] = {},
+        format: str = "json",
+    ) -> AsyncIterator:
+        """Iterate over the collections matching a search
+
+        :param params: the search parameters
+        :param format: format of the response
+        :returns: AsyncIterator - the search results
+        """
+        return self.iter_search_concept(
+            "collections",
+            {"provider_short_name": self.provider, **params},
+            format,
+        )
+
+    def iter_granules(
+        self,
+        params: dict[str, str] = {},
+        format: str = "json",
+    ) -> AsyncIterator:
+        """Iterate over the granules matching a search
+
+        :param params: the search parameters
+        :param format: format of the response
+        :returns: AsyncIterator - the search results
+        """
+        return self.iter_search_concept(
+            "granules",
+            {"provider_short_name": self.provider, **params},
+            format,
+        )
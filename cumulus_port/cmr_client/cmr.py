@@ -1,13 +1,41 @@
 # Ported from:
 # https://github.com/nasa/cumulus/blob/master/packages/cmr-client/src/CMR.ts#L8
 
-from typing import Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
 
+import requests
+
+from cumulus_port._internal.cache import LRUCache
 from cumulus_port.aws_client import secrets_manager as secrets_manager_utils
 from cumulus_port.common.env import get_required_env_var
+from cumulus_port.instrumentation import profiled
 
+from .delete_concept import delete_concept
 from .earthdata_login import get_edl_token
-from .search_concept import search_concept
+from .get_concept_metadata import get_concept_metadata, parse_concept_link
+from .ndjson import NDJSONReader
+from .search_cache import SearchCache
+from .search_concept import (
+    _get_records_limit,
+    get_chunkable_param,
+    search_concept,
+    search_concept_chunked,
+    search_concept_sharded,
+    search_concept_to_file,
+)
+
+log = logging.getLogger(__name__)
+
+# Number of concurrent DELETE requests used by `CMR.delete_granules`
+DEFAULT_DELETE_CONCURRENCY = 8
+# Number of concurrent searches used by `CMR.get_granules_metadata`
+DEFAULT_METADATA_CONCURRENCY = 4
+# Searches for more values of a single parameter than this, e.g. a long list
+# of granule_ur[], are split into chunks that are searched concurrently
+CHUNKED_SEARCH_THRESHOLD = 100
 
 
 def update_token(
@@ -57,6 +85,8 @@ class CMR:
         password: Optional[str] = None,
         token: Optional[str] = None,
         oauth_provider: str,
+        search_cache: Optional[SearchCache] = None,
+        granule_metadata_cache: Optional[LRUCache] = None,
     ):
         """The constructor for the CMR class
 
@@ -69,6 +99,10 @@ class CMR:
         :param token: CMR or Launchpad token, if not provided, CMR username and
             password are used to get a cmr token
          :param oauth_provider: Oauth provider: 'earthdata' or 'launchpad'
+        :param search_cache: optional persistent cache for search results
+        :param granule_metadata_cache: cache for granule metadata keyed by
+            (concept id, revision id, format). Only share it between clients
+            of the same CMR environment and credentials
         """
         self.provider = provider
         self.client_id = client_id
@@ -77,6 +111,10 @@ class CMR:
         self.password_secret_name = password_secret_name
         self.password = password
         self.token = token
+        self.search_cache = search_cache
+        if granule_metadata_cache is None:
+            granule_metadata_cache = LRUCache(maxsize=10_000, ttl=300)
+        self.granule_metadata_cache = granule_metadata_cache
 
     def get_cmr_password(self) -> str:
         """Get the CMR password, from the AWS secret if set, else return the
@@ -124,7 +162,26 @@ class CMR:
         :param cmr_revision_id: CMR Revision ID
         :returns: CMR headers object
         """
-        raise NotImplementedError()
+        if ummg_version:
+            content_type = (
+                f"application/vnd.nasa.cmr.umm+json;version={ummg_version}"
+            )
+        else:
+            content_type = "application/echo10+xml"
+
+        headers = {
+            "Client-Id": self.client_id,
+            "Content-type": content_type,
+        }
+
+        if token:
+            headers["Authorization"] = token
+        if ummg_version:
+            headers["Accept"] = "application/json"
+        if cmr_revision_id:
+            headers["Cmr-Revision-Id"] = cmr_revision_id
+
+        return headers
 
     def get_read_headers(self, *, token: Optional[str] = None) -> dict:
         """Return object containing CMR request headers for GETs
@@ -171,30 +228,129 @@ class CMR:
         """
         raise NotImplementedError()
 
-    def delete_collection(self, dataset_id: str):
+    def delete_collection(self, dataset_id: str) -> requests.Response:
         """Deletes a collection record from the CMR
 
         :param dataset_id: the collection unique id
         :returns: the CMR response
         """
-        raise NotImplementedError()
+        headers = self.get_write_headers(token=self.get_token())
+        return delete_concept(
+            type="collections",
+            identifier=dataset_id,
+            provider=self.provider,
+            headers=headers,
+        )
 
-    def delete_granule(self, granule_ur: str):
+    def delete_granule(self, granule_ur: str) -> requests.Response:
         """Deletes a granule record from the CMR
 
         :param granule_ur: the granule unique id
         :returns: the CMR response
         """
-        raise NotImplementedError()
+        headers = self.get_write_headers(token=self.get_token())
+        return delete_concept(
+            type="granules",
+            identifier=granule_ur,
+            provider=self.provider,
+            headers=headers,
+        )
 
+    def delete_granules(
+        self,
+        granule_urs: list[str],
+        max_workers: int = DEFAULT_DELETE_CONCURRENCY,
+    ) -> list[dict]:
+        """Deletes many granule records from the CMR concurrently
+
+        NOTE: This does not exist in cumulus. The token is fetched once and
+        shared by all of the requests, and a failure to delete one granule
+        does not stop the others from being deleted.
+
+        :param granule_urs: the granule unique ids
+        :param max_workers: the maximum number of concurrent requests
+        :returns: list[dict] - one entry per granule, in the same order as
+            `granule_urs`, with the keys "granuleUr", "status" and "error".
+            "status" is one of "deleted", "not_found" (already deleted) or
+            "failed", and "error" is the exception for failed deletes
+        """
+        headers = self.get_write_headers(token=self.get_token())
+
+        def delete_one(session: requests.Session, granule_ur: str) -> dict:
+            try:
+                response = delete_concept(
+                    type="granules",
+                    identifier=granule_ur,
+                    provider=self.provider,
+                    headers=headers,
+                    session=session,
+                )
+            except Exception as e:
+                log.error("Failed to delete granule %s: %s", granule_ur, e)
+                return {
+                    "granuleUr": granule_ur,
+                    "status": "failed",
+                    "error": e,
+                }
+
+            return {
+                "granuleUr": granule_ur,
+                "status": "not_found" if response.status_code == 404 else "deleted",
+                "error": None,
+            }
+
+        with requests.Session() as session:
+            # Size the connection pool to the number of workers so that
+            # connections are reused instead of being discarded
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(
+                    lambda granule_ur: delete_one(session, granule_ur),
+                    granule_urs,
+                ))
+
+    @profiled
     def search_concept(
         self,
         type: str,
         search_params: dict[str, str],
         format: str = "json",
         recursive: bool = True,
+        fields: Optional[list[str]] = None,
     ) -> list:
+        """Search for concepts
+
+        NOTE: Unlike cumulus, searches for more than CHUNKED_SEARCH_THRESHOLD
+        values of `granule_ur[]` or `concept_id[]` are split into chunks that
+        are searched concurrently, see `search_concept_chunked`. The results
+        are limited to CMR_LIMIT records, like any other search.
+
+        :param type: the concept type, choices: ['collections', 'granules']
+        :param search_params: the search parameters
+        :param format: format of the response
+        :param recursive: whether to fetch all pages of the results
+        :param fields: optional dotted paths of the fields to keep, the
+            results are then compact records instead of dicts
+        :returns: the CMR response
+        """
         headers = self.get_read_headers(token=self.get_token())
+
+        chunkable_param = get_chunkable_param(search_params)
+        num_values = len(chunkable_param[1]) if chunkable_param else 0
+        if recursive and num_values > CHUNKED_SEARCH_THRESHOLD:
+            return search_concept_chunked(
+                type=type,
+                search_params=search_params,
+                headers=headers,
+                format=format,
+                # The same number of records as the unchunked search
+                cmr_limit=_get_records_limit(None),
+                fields=fields,
+            )
+
         return search_concept(
             type=type,
             search_params=search_params,
@@ -202,17 +358,55 @@ class CMR:
             headers=headers,
             format=format,
             recursive=recursive,
+            cache=self.search_cache,
+            fields=fields,
+        )
+
+    def search_concept_to_file(
+        self,
+        type: str,
+        search_params: dict,
+        path: Union[str, Path],
+        format: str = "json",
+        compress: bool = False,
+        cmr_limit: Optional[int] = None,
+    ) -> NDJSONReader:
+        """Search for concepts, streaming the results to a newline delimited
+        JSON file instead of keeping them in memory
+
+        NOTE: This does not exist in cumulus.
+
+        :param type: the concept type, choices: ['collections', 'granules']
+        :param search_params: the search parameters
+        :param path: the file to write the results to
+        :param format: format of the response
+        :param compress: whether to gzip compress the file
+        :param cmr_limit: the maximum number of results to write, None for
+            all of them
+        :returns: NDJSONReader - a lazy reader over the search results
+        """
+        headers = self.get_read_headers(token=self.get_token())
+        return search_concept_to_file(
+            type=type,
+            search_params=search_params,
+            path=path,
+            headers=headers,
+            format=format,
+            compress=compress,
+            cmr_limit=cmr_limit,
         )
 
     def search_collections(
         self,
         params: dict[str, str] = {},
         format: str = "json",
+        fields: Optional[list[str]] = None,
     ) -> list:
         """Search in collections
 
         :param params: the search parameters
         :param format: format of the response
+        :param fields: optional dotted paths of the fields to keep
         :returns: the CMR response
         """
         search_params = {
@@ -223,33 +417,176 @@ class CMR:
             "collections",
             search_params,
             format,
+            fields=fields,
         )
 
     def search_granules(
         self,
         params: dict[str, str] = {},
         format: str = "json",
+        shards: Optional[int] = None,
+        fields: Optional[list[str]] = None,
     ) -> list:
         """Search in granules
 
+        NOTE: Unlike cumulus, the search can be split into temporal shards
+        that are searched concurrently, see `search_concept_sharded`. All of
+        the matching granules are returned for sharded searches.
+
         :param params: the search parameters
         :param format: format of the response
+        :param shards: the maximum number of concurrent temporal shards to
+            split the search into. Requires a `temporal` range in `params`
+        :param fields: optional dotted paths of the fields to keep
         :returns: the CMR response
         """
         search_params = {
             "provider_short_name": self.provider,
             **params,
         }
+        if shards:
+            return search_concept_sharded(
+                type="granules",
+                search_params=search_params,
+                headers=self.get_read_headers(token=self.get_token()),
+                format=format,
+                max_shards=shards,
+                fields=fields,
+            )
+
         return self.search_concept(
             "granules",
             search_params,
             format,
+            fields=fields,
+        )
+
+    def search_granules_columnar(
+        self,
+        params: dict[str, str] = {},
+        format: str = "json",
+        columns: Optional[dict[str, tuple[str, str]]] = None,
+    ) -> dict:
+        """Search in granules, gathering the selected fields into NumPy
+        arrays instead of returning the records
+
+        NOTE: This does not exist in cumulus. It requires numpy to be
+        installed.
+
+        :param params: the search parameters
+        :param format: format of the response, json or umm_json
+        :param columns: the columns to collect, see `ColumnarCollector`. By
+            default the size, temporal range and update time are collected
+        :returns: dict[str, np.ndarray] - one array per column
+        """
+        from .columnar import (
+            GRANULE_COLUMNS,
+            UMM_GRANULE_COLUMNS,
+            search_concept_columnar,
         )
 
-    def get_granule_metadata(self, cmr_link: str):
+        if columns is None:
+            columns = UMM_GRANULE_COLUMNS if format == "umm_json" else GRANULE_COLUMNS
+
+        return search_concept_columnar(
+            type="granules",
+            search_params={
+                "provider_short_name": self.provider,
+                **params,
+            },
+            columns=columns,
+            headers=self.get_read_headers(token=self.get_token()),
+            format=format,
+        )
+
+    def get_granule_metadata(self, cmr_link: str) -> Optional[dict]:
         """Get the granule metadata from CMR using the cmr_link
 
+        NOTE: Unlike cumulus, results are cached in
+        `granule_metadata_cache` by concept id and revision id.
+
         :param cmr_link: URL to concept
-        :returns: metadata as a JS object, null if not found
+        :returns: metadata as a dict, None if not found
         """
-        raise NotImplementedError()
+        key = parse_concept_link(cmr_link)
+        if key.concept_id is not None:
+            metadata = self.granule_metadata_cache.get(key)
+            if metadata is not None:
+                return metadata
+
+        headers = self.get_read_headers(token=self.get_token())
+        metadata = get_concept_metadata(cmr_link, headers)
+
+        if metadata is not None and key.concept_id is not None:
+            self.granule_metadata_cache.set(key, metadata)
+
+        return metadata
+
+    def get_granules_metadata(
+        self,
+        cmr_links: list[str],
+        chunk_size: Optional[int] = None,
+        max_workers: int = DEFAULT_METADATA_CONCURRENCY,
+    ) -> list[Optional[dict]]:
+        """Get the UMM-G metadata for many granules at once
+
+        NOTE: This does not exist in cumulus. Instead of requesting each
+        umm_json link separately, the concept ids are extracted from the links
+        and looked up with chunked `concept_id[]` searches in the umm_json
+        format, see `search_concept_chunked`. Links in other formats, links
+        that do not identify a concept and links that ask for a specific
+        revision fall back to `get_granule_metadata`.
+
+        :param cmr_links: URLs to concepts
+        :param chunk_size: the number of concept ids to look up per search,
+            by default they are spread evenly over the workers
+        :param max_workers: the maximum number of concurrent searches
+        :returns: list[Optional[dict]] - the metadata in the same order as
+            `cmr_links`, in the format of each link. None for granules that
+            were not found
+        """
+        results: list[Optional[dict]] = [None] * len(cmr_links)
+        missing: dict[str, list[int]] = {}
+        fallback: list[int] = []
+
+        for i, cmr_link in enumerate(cmr_links):
+            concept_id, revision_id, format = parse_concept_link(cmr_link)
+            if concept_id is None or revision_id is not None or format != "umm_json":
+                fallback.append(i)
+                continue
+
+            key = (concept_id, None, "umm_json")
+            metadata = self.granule_metadata_cache.get(key)
+            if metadata is not None:
+                results[i] = metadata
+            else:
+                missing.setdefault(concept_id, []).append(i)
+
+        if missing:
+            headers = self.get_read_headers(token=self.get_token())
+            items = search_concept_chunked(
+                type="granules",
+                search_params={"concept_id[]": list(missing)},
+                headers=headers,
+                format="umm_json",
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+            )
+            for item in items:
+                meta = item["meta"]
+                concept_id = meta["concept-id"]
+                self.granule_metadata_cache.set(
+                    (concept_id, None, "umm_json"),
+                    item,
+                )
+                self.granule_metadata_cache.set(
+                    (concept_id, str(meta["revision-id"]), "umm_json"),
+                    item,
+                )
+                for i in missing.get(concept_id, []):
+                    results[i] = item
+
+        for i in fallback:
+            results[i] = self.get_granule_metadata(cmr_links[i])
+
+        return results
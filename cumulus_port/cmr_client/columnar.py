@@ -0,0 +1,216 @@
+"""Gather numeric and timestamp fields of search results into NumPy arrays
+for vectorized analysis.
+
+NOTE: This does not exist in cumulus.
+"""
+
+import os
+from collections.abc import Mapping
+from typing import Optional
+
+import numpy as np
+
+from cumulus_port._internal.moment import parse_date
+
+from .search_concept import search_concept_pages
+
+# Column name -> (dotted path, kind). The kind is one of "float", "int" or
+# "datetime".
+ColumnSpec = Mapping[str, tuple[str, str]]
+
+# Columns of granules in the json format. Sizes are in MB.
+GRANULE_COLUMNS: ColumnSpec = {
+    "size": ("granule_size", "float"),
+    "time_start": ("time_start", "datetime"),
+    "time_end": ("time_end", "datetime"),
+    "updated": ("updated", "datetime"),
+}
+# Columns of granules in the umm_json format. Sizes are in the units given by
+# the record, which is usually MB.
+UMM_GRANULE_COLUMNS: ColumnSpec = {
+    "size": ("umm.DataGranule.ArchiveAndDistributionInformation.0.Size", "float"),
+    "time_start": ("umm.TemporalExtent.RangeDateTime.BeginningDateTime", "datetime"),
+    "time_end": ("umm.TemporalExtent.RangeDateTime.EndingDateTime", "datetime"),
+    "updated": ("meta.revision-date", "datetime"),
+}
+
+DTYPES = {
+    "float": np.float64,
+    "int": np.int64,
+    "datetime": "datetime64[ms]",
+}
+
+
+def _get_path(item, parts: list):
+    for part in parts:
+        try:
+            item = item[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return item
+
+
+def _to_naive_utc(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str) and value.endswith("Z"):
+        return value[:-1]
+    try:
+        return parse_date(value).replace(tzinfo=None).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_array(values: list, kind: str) -> np.ndarray:
+    dtype = DTYPES[kind]
+    if kind == "datetime":
+        values = [_to_naive_utc(value) for value in values]
+
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        # Fall back to converting values one at a time, treating values that
+        # can't be converted as missing
+        missing = np.datetime64("NaT") if kind == "datetime" else np.nan
+        converted = []
+        for value in values:
+            try:
+                converted.append(np.array(value, dtype=dtype))
+            except (TypeError, ValueError):
+                converted.append(missing)
+        return np.array(converted, dtype=dtype if kind != "int" else np.float64)
+
+
+class ColumnarCollector:
+    """Collect columns of values from pages of search results.
+
+    Example:
+    >>> collector = ColumnarCollector(GRANULE_COLUMNS)
+    >>> for page in pages:
+    ...     collector.add_page(page.items)
+    >>> columns = collector.to_arrays()
+    >>> columns["size"].sum()
+    """
+
+    def __init__(self, columns: ColumnSpec):
+        """
+        :param columns: the columns to collect, a mapping of column name to
+            the dotted path of the value and its kind, one of "float", "int"
+            or "datetime". Missing values are NaN or NaT
+        """
+        self.columns = dict(columns)
+        for name, (_, kind) in self.columns.items():
+            if kind not in DTYPES:
+                raise ValueError(f"Invalid kind {repr(kind)} for column {repr(name)}")
+
+        self._paths = {
+            name: [
+                int(part) if part.isdigit() else part
+                for part in path.split(".")
+            ]
+            for name, (path, _) in self.columns.items()
+        }
+        self._chunks: dict[str, list[np.ndarray]] = {
+            name: [] for name in self.columns
+        }
+
+    def add_page(self, items: list) -> None:
+        """Convert a page of results into arrays
+
+        :param items: the search results
+        """
+        for name, (_, kind) in self.columns.items():
+            parts = self._paths[name]
+            values = [_get_path(item, parts) for item in items]
+            self._chunks[name].append(_to_array(values, kind))
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Get the collected columns
+
+        :returns: dict[str, np.ndarray] - one array per column
+        """
+        return {
+            name: (
+                np.concatenate(chunks)
+                if chunks
+                else np.array([], dtype=DTYPES[self.columns[name][1]])
+            )
+            for name, chunks in self._chunks.items()
+        }
+
+
+def search_concept_columnar(
+    *,
+    type: str,
+    search_params: dict,
+    columns: ColumnSpec,
+    headers: dict = {},
+    format: str = "json",
+    cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+    cmr_limit: Optional[int] = None,
+    cmr_page_size: Optional[int] = None,
+) -> dict[str, np.ndarray]:
+    """Search and gather the selected fields of the results into arrays, one
+    page at a time
+
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param search_params: CMR search parameters
+    :param columns: the columns to collect, see `ColumnarCollector`
+    :param headers: the CMR headers
+    :param format: format of the response, supports umm_json, json
+    :param cmr_environment: the CMR environment to use
+    :param cmr_limit: the maximum number of results, None for all of them
+    :param cmr_page_size: the CMR page size
+    :returns: dict[str, np.ndarray] - one array per column
+    """
+    collector = ColumnarCollector(columns)
+    num_records = 0
+    pages = search_concept_pages(
+        type=type,
+        search_params=search_params,
+        headers=headers,
+        format=format,
+        cmr_environment=cmr_environment,
+        cmr_page_size=cmr_page_size,
+    )
+
+    for page in pages:
+        items = page.items
+        if cmr_limit is not None:
+            items = items[:cmr_limit - num_records]
+        collector.add_page(items)
+        num_records += len(items)
+        if cmr_limit is not None and num_records >= cmr_limit:
+            break
+
+    return collector.to_arrays()
+
+
+def sum_by_period(
+    times: np.ndarray,
+    values: np.ndarray,
+    unit: str = "D",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sum values into time buckets
+
+    Example:
+    >>> days, sizes = sum_by_period(columns["time_start"], columns["size"])
+
+    :param times: datetime64 array of the time of each value
+    :param values: the values to sum
+    :param unit: the numpy datetime unit of the buckets, e.g. 'D', 'M', 'Y'
+    :returns: tuple[np.ndarray, np.ndarray] - the buckets that have values and
+        the sum of the values in each bucket. Missing times and values are
+        ignored
+    """
+    valid = ~np.isnat(times) & ~np.isnan(values)
+    periods, inverse = np.unique(
+        times[valid].astype(f"datetime64[{unit}]"),
+        return_inverse=True,
+    )
+    sums = np.bincount(
+        inverse.ravel(),
+        weights=values[valid],
+        minlength=len(periods),
+    )
+    return periods, sums
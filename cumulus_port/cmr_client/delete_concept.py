@@ -0,0 +1,67 @@
+# Ported from:
+# https://github.com/nasa/cumulus/blob/master/packages/cmr-client/src/deleteConcept.ts
+
+import logging
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+import requests
+
+from cumulus_port._internal.throttle import throttled
+from cumulus_port.errors import CMRInternalError
+from cumulus_port.instrumentation import instrument
+
+from .get_url import get_ingest_url
+
+log = logging.getLogger(__name__)
+
+
+def _parse_error_messages(body: str) -> list[str]:
+    try:
+        root = ET.fromstring(body)
+    except ET.ParseError:
+        return []
+
+    return [error.text or "" for error in root.iter("error")]
+
+
+def delete_concept(
+    *,
+    type: str,
+    identifier: str,
+    provider: str,
+    headers: dict,
+    session: Optional[requests.Session] = None,
+) -> requests.Response:
+    """Deletes a concept from CMR
+
+    :param type: the concept type. Choices are: collections, granules
+    :param identifier: the concept identifier
+    :param provider: the CMR provider id
+    :param headers: the CMR headers
+    :param session: optional requests session to reuse connections with
+    :returns: requests.Response - the CMR response. A 404 response is
+        returned as is, since the concept is already gone
+    :raises: CMRInternalError - if the delete failed for any other reason
+    """
+    url = f"{get_ingest_url(provider=provider)}{type}/{identifier}"
+    log.info("deleteConcept %s", url)
+
+    with instrument("cmr.delete", url=url) as span:
+        response = throttled((session or requests).delete, url, headers=headers)
+        span.record_response(response)
+
+    if response.status_code != 200:
+        error_message = (
+            f"Failed to delete, statusCode: {response.status_code}, "
+            f"statusMessage: {response.reason}"
+        )
+        errors = _parse_error_messages(response.text)
+        if errors:
+            error_message = f"{error_message}, CMR error message: {errors}"
+        log.info(error_message)
+
+        if response.status_code != 404:
+            raise CMRInternalError(error_message)
+
+    return response
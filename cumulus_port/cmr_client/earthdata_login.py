@@ -3,10 +3,11 @@
 
 from typing import Optional
 
-import jwt
 import requests
 
+from cumulus_port._internal.throttle import throttled
 from cumulus_port.common import parse_caught_error
+from cumulus_port.instrumentation import instrument
 
 
 def get_edl_url(env: str) -> str:
@@ -50,6 +51,8 @@ def parse_http_error(
 
 
 def is_token_expired(token: dict) -> bool:
+    import jwt
+
     try:
         payload = jwt.decode(
             token["access_token"],
@@ -77,12 +80,16 @@ def retrieve_edl_token(
     """
     try:
         url = f"{get_edl_url(edl_env)}/api/users/tokens"
-        raw_response = requests.get(url, auth=(username, password))
+        with instrument("edl.retrieve_token", url=url) as span:
+            raw_response = throttled(requests.get, url, auth=(username, password))
+            span.record_response(raw_response)
     except requests.exceptions.HTTPError as e:
         raise parse_http_error(e, "retrieve")
     except Exception as e:
         raise parse_caught_error(e)
 
+    import jwt
+
     tokens = raw_response.json()
     unexpired_tokens = [
         token
@@ -116,7 +123,9 @@ def create_edl_token(
     """
     try:
         url = f"{get_edl_url(edl_env)}/api/users/token"
-        raw_response = requests.post(url, auth=(username, password))
+        with instrument("edl.create_token", url=url) as span:
+            raw_response = throttled(requests.post, url, auth=(username, password))
+            span.record_response(raw_response)
         raw_response.raise_for_status()
     except requests.exceptions.HTTPError as e:
         raise parse_http_error(e, "create")
@@ -146,11 +155,14 @@ def revoke_edl_token(
     """
     try:
         url = f"{get_edl_url(edl_env)}/api/users/revoke_token"
-        response = requests.post(
-            url,
-            params={"token": token},
-            auth=(username, password),
-        )
+        with instrument("edl.revoke_token", url=url) as span:
+            response = throttled(
+                requests.post,
+                url,
+                params={"token": token},
+                auth=(username, password),
+            )
+            span.record_response(response)
         response.raise_for_status()
     except requests.exceptions.HTTPError as e:
         raise parse_http_error(e, "revoke")
@@ -0,0 +1,75 @@
+"""Incremental parsing of echo10 search responses.
+
+NOTE: This does not exist in cumulus, which parses the whole response with
+xml2js. The records produced here have the same shape as the ones xml2js
+produces with the options used by cumulus: attributes are ignored, elements
+without children become their text, and repeated elements become lists.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Any, Iterable, Iterator
+
+
+def element_to_dict(element: ET.Element) -> Any:
+    """Convert an XML element the way xml2js does with
+    `{ ignoreAttrs: true, mergeAttrs: true, explicitArray: false }`
+
+    :param element: the element to convert
+    :returns: the text of elements without children, otherwise a dict of the
+        children by tag
+    """
+    if len(element) == 0:
+        return element.text or ""
+
+    result: dict[str, Any] = {}
+    for child in element:
+        value = element_to_dict(child)
+        if child.tag in result:
+            existing = result[child.tag]
+            if isinstance(existing, list):
+                existing.append(value)
+            else:
+                result[child.tag] = [existing, value]
+        else:
+            result[child.tag] = value
+
+    return result
+
+
+def iter_echo10_results(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Parse the `result` records of an echo10 search response while it is
+    being received, without building the whole document
+
+    Example:
+    >>> response = requests.get(url, stream=True)
+    >>> for record in iter_echo10_results(response.iter_content(65536)):
+    ...     print(record["Granule"]["GranuleUR"])
+
+    :param chunks: the response body
+    :returns: Iterator - the converted `result` records, one at a time
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    depth = 0
+
+    def parse_events() -> Iterator[Any]:
+        nonlocal root, depth
+        for event, element in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 1 and element.tag == "result":
+                yield element_to_dict(element)
+                # Release the parsed record
+                root.remove(element)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parse_events()
+
+    parser.close()
+    yield from parse_events()
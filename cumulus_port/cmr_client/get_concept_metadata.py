@@ -0,0 +1,99 @@
+# Ported from:
+# https://github.com/nasa/cumulus/blob/master/packages/cmr-client/src/getConceptMetadata.ts
+
+import logging
+import urllib.parse
+from typing import NamedTuple, Optional
+
+import requests
+
+from cumulus_port._internal.throttle import throttled
+from cumulus_port.instrumentation import instrument
+
+log = logging.getLogger(__name__)
+
+
+class ConceptLink(NamedTuple):
+    """The parts of a CMR concept link that identify the record it refers to
+
+    NOTE: This does not exist in cumulus.
+    """
+    concept_id: Optional[str]
+    revision_id: Optional[str]
+    format: str
+
+
+def parse_concept_link(concept_link: str) -> ConceptLink:
+    """Extract the concept id, revision id and format from a CMR link.
+
+    NOTE: This does not exist in cumulus. Both search links such as
+    `.../search/granules.json?concept_id=G123-PROV` and concept links such as
+    `.../search/concepts/G123-PROV/2.umm_json` are supported.
+
+    :param concept_link: URL to the concept
+    :returns: ConceptLink - the parsed link, concept_id is None if the link
+        does not identify a single concept
+    """
+    url = urllib.parse.urlsplit(concept_link)
+    query = urllib.parse.parse_qs(url.query)
+    path = url.path.rstrip("/")
+
+    name, _, extension = path.rpartition("/")[2].partition(".")
+    format = extension or "json"
+
+    concept_ids = query.get("concept_id") or query.get("concept_id[]") or []
+    revision_ids = query.get("revision_id") or []
+    if len(concept_ids) == 1:
+        return ConceptLink(
+            concept_ids[0],
+            revision_ids[0] if len(revision_ids) == 1 else None,
+            format,
+        )
+
+    parts = path.split("/")
+    if "concepts" in parts:
+        concept_parts = parts[parts.index("concepts") + 1:]
+        if len(concept_parts) == 1:
+            return ConceptLink(name, None, format)
+        if len(concept_parts) == 2:
+            return ConceptLink(concept_parts[0], name, format)
+
+    return ConceptLink(None, None, format)
+
+
+def get_concept_metadata(
+    concept_link: str,
+    headers: dict,
+) -> Optional[dict]:
+    """Get the CMR JSON metadata from the cmrLink
+
+    :param concept_link: URL to concept
+    :param headers: the CMR headers
+    :returns: Optional[dict] - the metadata, None if it could not be retrieved
+    """
+    try:
+        with instrument("cmr.get_concept_metadata", url=concept_link) as span:
+            response = throttled(requests.get, concept_link, headers=headers)
+            span.record_response(response)
+    except Exception:
+        log.exception("Error getting concept metadata from %s", concept_link)
+        return None
+
+    if response.status_code != 200:
+        log.error(
+            "Received statusCode %s getting concept metadata from %s",
+            response.status_code,
+            concept_link,
+        )
+        return None
+
+    body = response.json()
+    if "feed" in body:
+        entries = body["feed"].get("entry") or []
+    elif "items" in body:
+        entries = body["items"] or []
+    else:
+        # Concept links return the record itself
+        return body
+
+    return entries[0] if entries else None
@@ -0,0 +1,215 @@
+"""Incremental harvesting of CMR records that changed since the last run.
+
+NOTE: This does not exist in cumulus.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
+
+import requests
+
+from .cmr import CMR
+from .search_concept import SearchPage, search_concept_pages
+
+log = logging.getLogger(__name__)
+
+WATERMARK_PARAMS = ("revision_date", "updated_since")
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def load_harvest_state(state_file: Union[str, Path]) -> dict:
+    """Load the harvest state from a file
+
+    :param state_file: path to the state file
+    :returns: dict - the state, empty if the file does not exist
+    """
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_harvest_state(state_file: Union[str, Path], state: dict) -> None:
+    """Atomically write the harvest state to a file
+
+    :param state_file: path to the state file
+    :param state: the state to save
+    """
+    directory = os.path.dirname(os.path.abspath(state_file))
+    with tempfile.NamedTemporaryFile(
+        "w",
+        dir=directory,
+        prefix=".harvest-",
+        suffix=".tmp",
+        delete=False,
+    ) as f:
+        json.dump(state, f)
+    os.replace(f.name, state_file)
+
+
+def _is_search_after_rejected(error: requests.exceptions.HTTPError) -> bool:
+    # CMR answers an expired or unknown CMR-Search-After value with a 400
+    return error.response is not None and error.response.status_code == 400
+
+
+def _harvest_pages(
+    search_pages: Callable[[Optional[str]], Iterator[SearchPage]],
+    in_progress: dict,
+) -> Iterator[SearchPage]:
+    pages = search_pages(in_progress["search_after"])
+    while True:
+        try:
+            page = next(pages, None)
+        except requests.exceptions.HTTPError as e:
+            if in_progress["search_after"] is None or not _is_search_after_rejected(e):
+                raise
+
+            # The records since the watermark are harvested again, which
+            # keeps the at least once delivery
+            log.warning(
+                "CMR rejected the saved Search-After value, restarting the "
+                "harvest from %s: %s",
+                in_progress["since"],
+                e,
+            )
+            in_progress["search_after"] = None
+            in_progress["harvested"] = 0
+            pages = search_pages(None)
+            continue
+
+        if page is None:
+            return
+        yield page
+
+
+def harvest_concept(
+    cmr: CMR,
+    *,
+    type: str,
+    state_file: Union[str, Path],
+    search_params: dict = {},
+    format: str = "umm_json",
+    watermark_param: str = "revision_date",
+    initial_watermark: Optional[datetime] = None,
+    cmr_page_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """Iterate over the records that changed since the previous harvest.
+
+    The state file stores the watermark, i.e. the time the last completed
+    harvest started. While a harvest is in progress it also stores the
+    CMR-Search-After value of the next page, which is updated once all of the
+    records of a page have been consumed. An interrupted harvest therefore
+    picks up from the page it stopped on, and records are delivered at least
+    once. When the harvest completes the watermark is moved forward.
+
+    CMR expires Search-After values after some minutes of inactivity. If the
+    saved value is rejected, the harvest in progress is restarted from its
+    watermark. A harvest in progress is also restarted from the watermark if
+    it was started with a different `watermark_param` or `search_params`.
+
+    Example:
+    >>> for granule in harvest_concept(
+    ...     cmr_client,
+    ...     type="granules",
+    ...     state_file="granules-harvest.json",
+    ...     search_params={"short_name": "SENTINEL-1A_SLC"},
+    ... ):
+    ...     process(granule)
+
+    :param cmr: the CMR client to search with
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param state_file: path to the file storing the harvest state
+    :param search_params: additional CMR search parameters
+    :param format: format of the response, supports umm_json, json
+    :param watermark_param: the search parameter to filter by, choices:
+        ['revision_date', 'updated_since']
+    :param initial_watermark: where to start if there is no previous harvest,
+        None to harvest all records
+    :param cmr_page_size: the CMR page size
+    :returns: Iterator[dict] - the changed records
+    """
+    if watermark_param not in WATERMARK_PARAMS:
+        raise ValueError(
+            f"Invalid watermark_param {repr(watermark_param)}, must be one "
+            f"of {WATERMARK_PARAMS}",
+        )
+
+    state = load_harvest_state(state_file)
+    in_progress = state.get("in_progress")
+    # Compared in their JSON form, as they are stored in the state file
+    saved_search_params = json.loads(json.dumps(search_params))
+
+    if in_progress and (
+        in_progress.get("watermark_param") != watermark_param
+        or in_progress.get("search_params") != saved_search_params
+    ):
+        log.warning(
+            "Discarding the harvest started at %s, it was started with "
+            "different search parameters",
+            in_progress["started_at"],
+        )
+        in_progress = None
+
+    if in_progress:
+        log.info(
+            "Resuming harvest started at %s after %s records",
+            in_progress["started_at"],
+            in_progress["harvested"],
+        )
+    else:
+        watermark = state.get("watermark")
+        if watermark is None and initial_watermark is not None:
+            watermark = _format_datetime(initial_watermark)
+
+        in_progress = {
+            "since": watermark,
+            "started_at": _format_datetime(datetime.now(timezone.utc)),
+            "watermark_param": watermark_param,
+            "search_params": saved_search_params,
+            "search_after": None,
+            "harvested": 0,
+        }
+
+    params = {
+        "provider_short_name": cmr.provider,
+        **search_params,
+    }
+    since = in_progress["since"]
+    if since is not None:
+        if watermark_param == "revision_date":
+            # Bounding the range keeps the results of a resumed harvest
+            # consistent with the pages that were already harvested
+            params["revision_date"] = f"{since},{in_progress['started_at']}"
+        else:
+            params["updated_since"] = since
+
+    headers = cmr.get_read_headers(token=cmr.get_token())
+
+    def search_pages(search_after: Optional[str]) -> Iterator[SearchPage]:
+        return search_concept_pages(
+            type=type,
+            search_params=params,
+            headers=headers,
+            format=format,
+            cmr_page_size=cmr_page_size,
+            search_after=search_after,
+        )
+
+    for page in _harvest_pages(search_pages, in_progress):
+        yield from page.items
+
+        in_progress["search_after"] = page.search_after
+        in_progress["harvested"] += len(page.items)
+        save_harvest_state(state_file, {**state, "in_progress": in_progress})
+
+    log.info("Harvest completed with %s records", in_progress["harvested"])
+    save_harvest_state(state_file, {"watermark": in_progress["started_at"]})
@@ -0,0 +1,213 @@
+"""Incremental decoding of JSON search responses.
+
+NOTE: This does not exist in cumulus, which always decodes the whole response
+body. The decoder here locates the `items` / `feed.entry` array in the
+response as it is received and decodes each element of the array as soon as
+it is complete, so only one element needs to be held in memory at a time.
+"""
+
+import codecs
+import json
+import re
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Strings are matched as a whole so that brackets inside of them are skipped.
+# A lone quote means the string has not been fully received yet.
+TOKEN_PATTERN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|"|[{}\[\]:]')
+BRACKET_PATTERN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|"|[{}\[\]]')
+SCALAR_END_PATTERN = re.compile(r"[\s,\]}]")
+SEPARATOR_PATTERN = re.compile(r"[\s,]*")
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+def decode_chunks(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode a UTF-8 response body, decompressing it first if it starts
+    with the gzip magic number
+
+    :param chunks: the raw response body
+    :returns: Iterator - the decoded text
+    """
+    decompressor = None
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # Start of the body, until it is long enough to check for the magic number
+    head: Optional[bytes] = b""
+
+    for chunk in chunks:
+        if head is not None:
+            head += chunk
+            if len(head) < len(GZIP_MAGIC):
+                continue
+            if head.startswith(GZIP_MAGIC):
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            chunk, head = head, None
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        yield decoder.decode(chunk)
+
+    if head:
+        yield decoder.decode(head)
+    if decompressor is not None:
+        yield decoder.decode(decompressor.flush())
+    yield decoder.decode(b"", final=True)
+
+
+class _Scanner:
+    def __init__(self, text_chunks: Iterator[str]):
+        self.text_chunks = text_chunks
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> None:
+        """Append the next chunk to the buffer, discarding what has already
+        been consumed. Positions relative to `self.pos` remain valid.
+        """
+        for text in self.text_chunks:
+            if text:
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return
+
+        raise _NeedMoreData()
+
+    def find_array(self, path: tuple[str, ...]) -> bool:
+        # Keys of the enclosing containers, None for arrays
+        stack: list[Optional[str]] = []
+        last_string = None
+
+        while True:
+            match = TOKEN_PATTERN.search(self.buffer, self.pos)
+            if match is None or match.group() == '"':
+                if match is not None:
+                    self.pos = match.start()
+                else:
+                    self.pos = len(self.buffer)
+                try:
+                    self.fill()
+                except _NeedMoreData:
+                    return False
+                continue
+
+            token = match.group()
+            self.pos = match.end()
+            if token == "{":
+                stack.append("")
+            elif token == "[":
+                if tuple(stack) == path:
+                    return True
+                stack.append(None)
+            elif token in "}]":
+                if not stack:
+                    return False
+                stack.pop()
+            elif token == ":":
+                if stack and stack[-1] is not None:
+                    stack[-1] = last_string
+            else:
+                last_string = json.loads(token)
+
+    def find_element_end(self) -> int:
+        first = self.buffer[self.pos]
+        if first in "{[":
+            return self._find_container_end()
+
+        offset = 0
+        while True:
+            if first == '"':
+                match = BRACKET_PATTERN.match(self.buffer, self.pos)
+                if match.group() != '"':
+                    return match.end()
+            else:
+                match = SCALAR_END_PATTERN.search(self.buffer, self.pos + offset)
+                if match is not None:
+                    return match.start()
+                offset = len(self.buffer) - self.pos
+
+            try:
+                self.fill()
+            except _NeedMoreData:
+                # A number or literal may end the document
+                if first == '"':
+                    raise
+                return len(self.buffer)
+
+    def _find_container_end(self) -> int:
+        depth = 0
+        offset = 0
+        while True:
+            index = self.pos + offset
+            match = BRACKET_PATTERN.search(self.buffer, index)
+            if match is None or match.group() == '"':
+                offset = (match.start() if match else len(self.buffer)) - self.pos
+                self.fill()
+                continue
+
+            token = match.group()
+            offset = match.end() - self.pos
+            if token in "{[":
+                depth += 1
+            elif token in "}]":
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+
+    def iter_elements(self) -> Iterator[Any]:
+        while True:
+            self.pos = SEPARATOR_PATTERN.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer):
+                self.fill()
+                continue
+
+            if self.buffer[self.pos] == "]":
+                return
+
+            element, self.pos = self.decode_element()
+            yield element
+
+    def decode_element(self) -> tuple[Any, int]:
+        if self.buffer[self.pos] in '{["':
+            # Most elements are fully contained in the buffer, in which case
+            # decoding them directly is much faster than scanning them first.
+            # A closed container or string can not be cut short.
+            try:
+                return self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                pass
+
+        # Only decode the element once all of it has been received
+        self.find_element_end()
+        return self.decoder.raw_decode(self.buffer, self.pos)
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    path: tuple[str, ...],
+) -> Iterator[Any]:
+    """Decode the elements of an array within a JSON document while it is
+    being received
+
+    Example:
+    >>> response = requests.get(url, stream=True)
+    >>> for item in iter_json_array(response.iter_content(65536), ("items",)):
+    ...     print(item["meta"]["concept-id"])
+
+    :param chunks: the response body, optionally gzip compressed
+    :param path: the keys of the array within the document, for example
+        `("feed", "entry")`
+    :returns: Iterator - the elements of the array, or nothing if the
+        document does not contain the array
+    """
+    scanner = _Scanner(decode_chunks(chunks))
+
+    try:
+        if not scanner.find_array(path):
+            return
+        yield from scanner.iter_elements()
+    except _NeedMoreData:
+        raise ValueError("Incomplete JSON document") from None
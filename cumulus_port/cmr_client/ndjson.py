@@ -0,0 +1,194 @@
+"""Newline delimited JSON files for search results that are too large to keep
+in memory.
+
+NOTE: This does not exist in cumulus.
+"""
+
+import gzip
+import json
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+
+class NDJSONWriter:
+    """Append pages of records to a newline delimited JSON file while
+    building an index of where each record is stored.
+
+    When compressing, every page is written as a separate gzip member. The
+    file is still a valid gzip file, and a single record can be read by only
+    decompressing the member that contains it.
+    """
+
+    def __init__(self, path: Union[str, Path], *, compress: bool = False):
+        """
+        :param path: the file to write, it is overwritten if it exists
+        :param compress: whether to gzip compress the file
+        """
+        self.path = Path(path)
+        self.compress = compress
+        self._file: BinaryIO = open(self.path, "wb")
+        # Start offset of each record, in the file when not compressing, or
+        # in the decompressed member when compressing
+        self._record_offsets = array("Q")
+        # Start offset of each gzip member, and the member of each record
+        self._member_offsets = array("Q")
+        self._record_members = array("L")
+        self._position = 0
+
+    def write_page(self, items: list) -> None:
+        """Write a page of records to the file
+
+        :param items: the JSON serializable records
+        """
+        if not items:
+            return
+
+        lines = [
+            json.dumps(item, separators=(",", ":")).encode() + b"\n"
+            for item in items
+        ]
+
+        if self.compress:
+            member = len(self._member_offsets)
+            self._member_offsets.append(self._position)
+            offset = 0
+            for line in lines:
+                self._record_offsets.append(offset)
+                self._record_members.append(member)
+                offset += len(line)
+            data = gzip.compress(b"".join(lines), mtime=0)
+        else:
+            offset = self._position
+            for line in lines:
+                self._record_offsets.append(offset)
+                offset += len(line)
+            data = b"".join(lines)
+
+        self._file.write(data)
+        self._position += len(data)
+
+    def close(self) -> "NDJSONReader":
+        """Finish writing the file
+
+        :returns: NDJSONReader - a reader for the written records
+        """
+        self._file.close()
+        self._member_offsets.append(self._position)
+        return NDJSONReader(
+            self.path,
+            compress=self.compress,
+            record_offsets=self._record_offsets,
+            member_offsets=self._member_offsets,
+            record_members=self._record_members,
+        )
+
+    def __enter__(self) -> "NDJSONWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class NDJSONReader:
+    """A lazy, read only sequence of the records in a newline delimited JSON
+    file written by `NDJSONWriter`.
+
+    Records are only decoded when they are accessed. Iterating streams through
+    the file, and indexing reads a single record using the record index.
+
+    Example:
+    >>> results = cmr_client.search_concept_to_file(
+    ...     "granules",
+    ...     {"short_name": "SENTINEL-1A_SLC"},
+    ...     "granules.ndjson.gz",
+    ...     compress=True,
+    ... )
+    >>> len(results)
+    512034
+    >>> results[-1]["id"]
+    'G1234567890-ASF'
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        compress: bool,
+        record_offsets: array,
+        member_offsets: array,
+        record_members: array,
+    ):
+        self.path = Path(path)
+        self.compress = compress
+        self._record_offsets = record_offsets
+        self._member_offsets = member_offsets
+        self._record_members = record_members
+        self._file: Optional[BinaryIO] = None
+        self._cached_member: Optional[tuple[int, bytes]] = None
+
+    def __len__(self) -> int:
+        return len(self._record_offsets)
+
+    def __iter__(self) -> Iterator[Any]:
+        opener = gzip.open if self.compress else open
+        with opener(self.path, "rb") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _read(self, start: int, end: int) -> bytes:
+        if self._file is None:
+            self._file = open(self.path, "rb")
+
+        self._file.seek(start)
+        return self._file.read(end - start)
+
+    def _read_member(self, member: int) -> bytes:
+        if self._cached_member is None or self._cached_member[0] != member:
+            data = self._read(
+                self._member_offsets[member],
+                self._member_offsets[member + 1],
+            )
+            self._cached_member = (
+                member,
+                zlib.decompress(data, wbits=zlib.MAX_WBITS | 16),
+            )
+
+        return self._cached_member[1]
+
+    def __getitem__(self, index: int) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+
+        if self.compress:
+            member = self._record_members[index]
+            data = self._read_member(member)
+            start = self._record_offsets[index]
+            end = data.index(b"\n", start)
+            return json.loads(data[start:end])
+
+        start = self._record_offsets[index]
+        if index + 1 < len(self):
+            end = self._record_offsets[index + 1]
+        else:
+            end = self._member_offsets[-1]
+        return json.loads(self._read(start, end))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._cached_member = None
+
+    def __enter__(self) -> "NDJSONReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,120 @@
+"""Adaptive page sizing for CMR searches.
+
+NOTE: This does not exist in cumulus, which uses a fixed page size.
+"""
+
+import math
+import threading
+from typing import Optional
+
+# The largest page_size that CMR accepts
+MAX_PAGE_SIZE = 2000
+
+
+class PageSizeController:
+    """Choose the page size of the next request of a search from the
+    response time and body size of the previous ones.
+
+    The cost of a record is estimated from every response as a moving
+    average, and the next page size is the number of records that is expected
+    to meet both targets. Page sizes grow by at most `max_growth` between
+    pages but shrink immediately, and stay within `min_size` and `max_size`.
+
+    A controller may be shared between searches, for instance one controller
+    per collection, so that later searches start from a page size that is
+    already tuned.
+
+    Example:
+    >>> controller = PageSizeController(target_duration=2.0)
+    >>> search_concept_pages(..., page_size_controller=controller)
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 50,
+        *,
+        target_duration: float = 2.0,
+        target_bytes: int = 8 * 1024 * 1024,
+        min_size: int = 1,
+        max_size: int = MAX_PAGE_SIZE,
+        max_growth: float = 2.0,
+        smoothing: float = 0.5,
+    ):
+        """
+        :param initial_size: the page size of the first request
+        :param target_duration: the desired response time in seconds
+        :param target_bytes: the desired size of a response body
+        :param min_size: the smallest page size to use
+        :param max_size: the largest page size to use, at most the CMR limit
+        :param max_growth: the largest factor to grow the page size by
+            between two requests
+        :param smoothing: weight of the latest response in the moving
+            averages, between 0 and 1
+        """
+        if not 1 <= min_size <= max_size <= MAX_PAGE_SIZE:
+            raise ValueError(
+                f"Page size limits must be within 1 and {MAX_PAGE_SIZE}",
+            )
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be within 0 and 1")
+
+        self.target_duration = target_duration
+        self.target_bytes = target_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_growth = max_growth
+        self.smoothing = smoothing
+
+        self._page_size = self._clamp(initial_size)
+        # Moving averages of the cost of one record
+        self._seconds_per_record: Optional[float] = None
+        self._bytes_per_record: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def page_size(self) -> int:
+        """The page size to use for the next request"""
+        return self._page_size
+
+    def _clamp(self, page_size: int) -> int:
+        return max(self.min_size, min(self.max_size, page_size))
+
+    def _average(self, average: Optional[float], value: float) -> float:
+        if average is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * average
+
+    def update(self, num_records: int, duration: float, num_bytes: int) -> int:
+        """Record the measurements of a response and compute the next page
+        size
+
+        :param num_records: number of records in the response
+        :param duration: seconds taken to receive and decode the response
+        :param num_bytes: size of the response body
+        :returns: int - the page size to use for the next request
+        """
+        if num_records <= 0:
+            return self._page_size
+
+        with self._lock:
+            self._seconds_per_record = self._average(
+                self._seconds_per_record,
+                duration / num_records,
+            )
+            self._bytes_per_record = self._average(
+                self._bytes_per_record,
+                num_bytes / num_records,
+            )
+
+            limits = [math.floor(self._page_size * self.max_growth)]
+            if self._seconds_per_record > 0:
+                limits.append(
+                    math.floor(self.target_duration / self._seconds_per_record),
+                )
+            if self._bytes_per_record > 0:
+                limits.append(
+                    math.floor(self.target_bytes / self._bytes_per_record),
+                )
+
+            self._page_size = self._clamp(min(limits))
+            return self._page_size
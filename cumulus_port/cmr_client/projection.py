@@ -0,0 +1,149 @@
+"""Compact records holding only selected fields of search results.
+
+NOTE: This does not exist in cumulus.
+"""
+
+import functools
+import keyword
+import re
+from collections.abc import Sequence
+from typing import Any, Callable, Iterable
+
+NON_IDENTIFIER_PATTERN = re.compile(r"\W+")
+
+
+class ProjectedRecord:
+    """Base class for the records created by `Projection`. Values are stored
+    in slots named after the fields, and can also be accessed by field name
+    or position.
+    """
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+
+    def __init__(self, *values: Any):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, self.__slots__[self._fields.index(key)])
+        return tuple(self)[key]
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={repr(getattr(self, name))}"
+            for name in self.__slots__
+        )
+        return f"{type(self).__name__}({values})"
+
+    def get(self, field: str, default: Any = None) -> Any:
+        if field not in self._fields:
+            return default
+        return self[field]
+
+    def to_dict(self) -> dict:
+        """Convert the record to a dict keyed by field"""
+        return dict(zip(self._fields, self))
+
+
+def _attribute_names(fields: Sequence[str]) -> list[str]:
+    names: list[str] = []
+    for field in fields:
+        name = NON_IDENTIFIER_PATTERN.sub("_", field).strip("_") or "field"
+        if name[0].isdigit() or keyword.iskeyword(name):
+            name = f"_{name}"
+        candidate = name
+        i = 1
+        while candidate in names:
+            candidate = f"{name}_{i}"
+            i += 1
+        names.append(candidate)
+
+    return names
+
+
+def _make_getter(field: str) -> Callable[[Any], Any]:
+    parts = [
+        int(part) if part.isdigit() else part
+        for part in field.split(".")
+    ]
+
+    def getter(item: Any) -> Any:
+        for part in parts:
+            try:
+                item = item[part]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return item
+
+    return getter
+
+
+class Projection:
+    """Keep only selected fields of search results.
+
+    Fields are dotted paths into the record, numbers select list elements.
+    Missing fields are None.
+
+    Example:
+    >>> projection = Projection(["meta.concept-id", "umm.GranuleUR"])
+    >>> record = projection({
+    ...     "meta": {"concept-id": "G123-PROV", "revision-id": 3},
+    ...     "umm": {"GranuleUR": "granule_1", "DataGranule": {}},
+    ... })
+    >>> record
+    Record(meta_concept_id='G123-PROV', umm_GranuleUR='granule_1')
+    >>> record["umm.GranuleUR"], record.umm_GranuleUR
+    ('granule_1', 'granule_1')
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        """
+        :param fields: the paths of the fields to keep
+        """
+        self.fields = tuple(fields)
+        self.record_type = type(
+            "Record",
+            (ProjectedRecord,),
+            {
+                "__slots__": tuple(_attribute_names(self.fields)),
+                "_fields": self.fields,
+            },
+        )
+        self._getters = [_make_getter(field) for field in self.fields]
+
+    def __call__(self, item: Any) -> ProjectedRecord:
+        return self.record_type(*(getter(item) for getter in self._getters))
+
+    def project(self, items: Iterable) -> list[ProjectedRecord]:
+        """Project a page of results
+
+        :param items: the search results
+        :returns: list[ProjectedRecord] - the projected records
+        """
+        return [self(item) for item in items]
+
+
+@functools.lru_cache(maxsize=128)
+def get_projection(fields: tuple[str, ...]) -> Projection:
+    """Get a projection, reusing the projection for the same fields so the
+    records of every page share one record type
+
+    :param fields: the paths of the fields to keep
+    :returns: Projection - the projection
+    """
+    return Projection(fields)
@@ -0,0 +1,221 @@
+"""A persistent cache for CMR search results.
+
+NOTE: This does not exist in cumulus.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+log = logging.getLogger(__name__)
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return str(value)
+
+
+class SearchCache:
+    """A size bounded, least recently used cache of search result pages that
+    is stored as compressed files in a local directory, so that it can be
+    shared by processes running on the same host.
+
+    Example:
+    >>> cmr_client = CMR(
+    ...     provider="my-provider",
+    ...     client_id="my-clientId",
+    ...     token="cmr_or_launchpad_token",
+    ...     search_cache=SearchCache("/tmp/cmr-search-cache", ttl=300),
+    ... )
+    ...
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        ttl: float = 3600,
+        max_size: int = 256 * 1024 * 1024,
+    ):
+        """
+        :param directory: the directory to store the cached pages in
+        :param ttl: number of seconds after which a cached page expires
+        :param max_size: the maximum total size in bytes of the cached pages.
+            The least recently used pages are removed when it is exceeded
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        *,
+        url: str,
+        search_params: dict,
+        provider: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> str:
+        """Create the cache key for a search
+
+        :param url: the search url, which contains the concept type and
+            format
+        :param search_params: the search parameters, including paging
+        :param provider: the CMR provider id
+        :param token: the Authorization token of the search. Searches with
+            different tokens can see different records, so they never share
+            cache entries
+        :returns: str - the cache key
+        """
+        token_hash = None if token is None else hashlib.sha256(token.encode()).hexdigest()
+        normalized = json.dumps(
+            [
+                url,
+                provider,
+                token_hash,
+                sorted(
+                    (key, _normalize_value(value))
+                    for key, value in search_params.items()
+                ),
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, marking it as recently used
+
+        :param key: the cache key
+        :returns: the cached value, None if it is missing or expired
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if entry["created"] + self.ttl <= time.time():
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # The modification time tracks when the entry was last used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        """Add a value to the cache, evicting the least recently used values
+        if the cache is too large
+
+        :param key: the cache key
+        :param value: the JSON serializable value to store
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(
+            json.dumps({"created": time.time(), "value": value}).encode(),
+        )
+
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent,
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            f.write(data)
+        os.replace(f.name, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - old_size
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        # Evict down to 90% of the limit so that eviction doesn't run on
+        # every write once the cache is full
+        target = self.max_size * 0.9
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            self._remove(path)
+            size -= entry_size
+            self.evictions += 1
+
+        log.debug("Evicted CMR search cache entries down to %s bytes", size)
+        self._size = size
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._entries():
+                self._remove(path)
+            self._size = 0
+
+    def stats(self) -> dict:
+        """Get the cache statistics
+
+        :returns: dict - the number of hits, misses and evictions, and the
+            hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRatio": self.hits / lookups if lookups else 0.0,
+            }
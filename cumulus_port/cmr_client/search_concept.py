@@ -2,15 +2,157 @@
 # https://github.com/nasa/cumulus/blob/master/packages/cmr-client/src/searchConcept.ts
 
 import logging
+import math
 import os
-from typing import Optional
+import sys
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Union
 
 import requests
 
+from cumulus_port._internal.moment import parse_date
+from cumulus_port._internal.throttle import throttled
+from cumulus_port.instrumentation import instrument
+
+from .echo10 import iter_echo10_results
 from .get_url import get_search_url
+from .json_stream import iter_json_array
+from .ndjson import NDJSONReader, NDJSONWriter
+from .page_size import MAX_PAGE_SIZE, PageSizeController
+from .projection import get_projection
+from .search_cache import SearchCache
 
 log = logging.getLogger(__name__)
 
+# Queries whose encoded parameters are longer than this are sent as a form
+# encoded POST instead of a GET, to stay clear of URL length limits.
+MAX_GET_QUERY_LENGTH = 4000
+# Size of the chunks that streamed response bodies are read in
+STREAM_CHUNK_SIZE = 64 * 1024
+# Number of concurrent searches used by `search_concept_chunked`
+DEFAULT_CHUNK_CONCURRENCY = 4
+# List parameters whose values CMR combines with OR by default, so that
+# searching for chunks of their values separately finds the same records
+CHUNKABLE_PARAMS = frozenset({"concept_id", "concept_id[]", "granule_ur", "granule_ur[]"})
+# Shards of a sharded search with more hits than this are split further
+DEFAULT_RECORDS_PER_SHARD = 10 * MAX_PAGE_SIZE
+
+
+class SearchPage(NamedTuple):
+    """One page of search results
+
+    NOTE: This does not exist in cumulus.
+    """
+    items: list
+    hits: int
+    # Value of the CMR-Search-After header to request the next page with
+    search_after: Optional[str]
+
+
+def _get_records_limit(cmr_limit: Optional[int]) -> int:
+    if cmr_limit is not None:
+        return cmr_limit
+    if (env_cmr_limit := os.getenv("CMR_LIMIT")):
+        return int(env_cmr_limit)
+
+    return 100
+
+
+def _get_page_size(
+    search_params: dict,
+    cmr_page_size: Optional[int],
+) -> int:
+    search_params_page_size = search_params.get("pageSize")
+
+    if search_params_page_size:
+        return int(search_params_page_size)
+    if cmr_page_size is not None:
+        return cmr_page_size
+    if (env_cmr_page_size := os.getenv("CMR_PAGE_SIZE")):
+        return int(env_cmr_page_size)
+
+    return 50
+
+
+def _execute_search(
+    url: str,
+    query: dict,
+    headers: dict,
+    stream: bool = False,
+) -> requests.Response:
+    try:
+        with instrument("cmr.search", url=url) as span:
+            # NOTE: Cumulus always uses GET. Large queries, for instance long
+            # lists of granule_ur[], are sent as POST which CMR also accepts.
+            if len(urllib.parse.urlencode(query, doseq=True)) > MAX_GET_QUERY_LENGTH:
+                response = throttled(
+                    requests.post,
+                    url,
+                    data=query,
+                    headers=headers,
+                    stream=stream,
+                )
+            else:
+                response = throttled(
+                    requests.get,
+                    url,
+                    params=query,
+                    headers=headers,
+                    stream=stream,
+                )
+            span.record_response(response)
+            response.raise_for_status()
+    except Exception:
+        log.error(
+            "Error executing CMR search concept.\nSearching %s\n"
+            "with search parameters %s\nand headers %s",
+            url,
+            query,
+            headers,
+        )
+        raise
+
+    return response
+
+
+def _iter_response_items(response: requests.Response, format: str) -> Iterator:
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    if format == "echo10":
+        return iter_echo10_results(chunks)
+
+    if format.lower().startswith("umm_json"):
+        return iter_json_array(chunks, ("items",))
+
+    return iter_json_array(chunks, ("feed", "entry"))
+
+
+def _get_response_items(response: requests.Response, format: str) -> list:
+    if format == "echo10":
+        return list(_iter_response_items(response, format))
+
+    return _get_body_items(response.json())
+
+
+def _get_body_items(body: dict) -> list:
+    if "items" in body:
+        response_items = body["items"]
+    else:
+        response_items = body.get("feed", {}).get("entry", [])
+
+    return response_items or []
+
+
+def _get_cmr_hits(response: requests.Response) -> int:
+    cmr_hits = response.headers.get("cmr-hits")
+    if cmr_hits is None:
+        raise TypeError("cmr-hits header not found")
+
+    return int(cmr_hits)
+
 
 def search_concept(
     *,
@@ -23,6 +165,10 @@ def search_concept(
     cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
     cmr_limit: Optional[int] = None,
     cmr_page_size: Optional[int] = None,
+    cache: Optional[SearchCache] = None,
+    fields: Optional[Sequence[str]] = None,
+    stream: bool = False,
+    page_size_controller: Optional[PageSizeController] = None,
 ) -> list:
     """
     :param type: Concept type to search, choices: ['collections', 'granules']
@@ -37,25 +183,35 @@ def search_concept(
     :param recursive: indicate whether search recursively to get all the result
     :param cmr_limit: the CMR limit
     :param cmr_page_size: the CMR page size
+    :param cache: optional cache to look up pages in before searching CMR
+    :param fields: optional dotted paths of the fields to keep. Results are
+        then returned as compact records, see `Projection`, and the full
+        records of each page are released as soon as the page is processed
+    :param stream: decode the items of each page while the response is
+        being received instead of decoding the whole response at once. When
+        combined with `fields`, only one full record is held at a time
+    :param page_size_controller: optional controller that adjusts the page
+        size between pages to meet its response time and size targets. The
+        search then pages with CMR-Search-After, see `search_concept_pages`,
+        and `cache` and `stream` are not used
     :returns: array of search results.
     """
-    if cmr_limit is not None:
-        records_limit = cmr_limit
-    elif (env_cmr_limit := os.getenv("CMR_LIMIT")):
-        records_limit = int(env_cmr_limit)
-    else:
-        records_limit = 100
-
-    search_params_page_size = search_params.get("pageSize")
+    if page_size_controller is not None:
+        return _search_concept_adaptive(
+            type=type,
+            search_params=search_params,
+            previous_results=previous_results,
+            headers=headers,
+            format=format,
+            recursive=recursive,
+            cmr_environment=cmr_environment,
+            cmr_limit=cmr_limit,
+            fields=fields,
+            page_size_controller=page_size_controller,
+        )
 
-    if search_params_page_size:
-        page_size = int(search_params_page_size)
-    elif cmr_page_size is not None:
-        page_size = cmr_page_size
-    elif (env_cmr_page_size := os.getenv("CMR_PAGE_SIZE")):
-        page_size = int(env_cmr_page_size)
-    else:
-        page_size = 50
+    records_limit = _get_records_limit(cmr_limit)
+    page_size = _get_page_size(search_params, cmr_page_size)
 
     query = dict(search_params)
 
@@ -68,37 +224,53 @@ def search_concept(
         query["page_size"] = str(page_size)
 
     url = f"{get_search_url(cmr_env=cmr_environment)}{type}.{format.lower()}"
-    try:
-        response = requests.get(url, params=query, headers=headers)
-        response.raise_for_status()
-    except Exception:
-        log.error(
-            "Error executing CMR search concept.\nSearching %s\n"
-            "with search parameters %s\nand headers %s",
+    projection = get_projection(tuple(fields)) if fields is not None else None
+
+    cached_page = None
+    if cache is not None:
+        cache_key = cache.make_key(
+            url=url,
+            search_params=query,
+            provider=query.get("provider_short_name") or query.get("provider"),
+            token=headers.get("Authorization"),
+        )
+        cached_page = cache.get(cache_key)
+
+    if cached_page is not None:
+        response_items = cached_page["items"]
+        cmr_hits = cached_page["hits"]
+    else:
+        response = _execute_search(
             url,
             query,
             headers,
+            stream=stream or format == "echo10",
         )
-        raise
-
-    if format == "echo10":
-        raise NotImplementedError()
-    else:
-        body = response.json()
-        if "items" in body:
-            response_items = body["items"]
+        cmr_hits = _get_cmr_hits(response)
+        if stream:
+            with response:
+                items = _iter_response_items(response, format)
+                if projection is not None and cache is None:
+                    # Project the items as they are decoded so that only one
+                    # full record is held at a time
+                    response_items = projection.project(items)
+                    projection = None
+                else:
+                    response_items = list(items)
         else:
-            response_items = body.get("feed", {}).get("entry", [])
+            response_items = _get_response_items(response, format)
 
-    fetched_results = previous_results + (response_items or [])
+        if cache is not None:
+            cache.set(cache_key, {"items": response_items, "hits": cmr_hits})
 
-    num_records_collected = len(fetched_results)
+    if projection is not None:
+        response_items = projection.project(response_items)
 
-    cmr_hits = response.headers.get("cmr-hits")
-    if cmr_hits is None:
-        raise TypeError("cmr-hits header not found")
+    fetched_results = previous_results + response_items
+
+    num_records_collected = len(fetched_results)
 
-    cmr_has_more_results = int(cmr_hits) > num_records_collected
+    cmr_has_more_results = cmr_hits > num_records_collected
     records_limit_reached = num_records_collected >= records_limit
     if recursive and cmr_has_more_results and not records_limit_reached:
         return search_concept(
@@ -108,6 +280,545 @@ def search_concept(
             headers=headers,
             format=format,
             recursive=recursive,
+            cmr_environment=cmr_environment,
+            cmr_limit=records_limit,
+            cmr_page_size=page_size,
+            cache=cache,
+            fields=fields,
+            stream=stream,
         )
 
     return fetched_results[:records_limit]
+
+
+def _search_concept_adaptive(
+    *,
+    type: str,
+    search_params: dict,
+    previous_results: list,
+    headers: dict,
+    format: str,
+    recursive: bool,
+    cmr_environment: Optional[str],
+    cmr_limit: Optional[int],
+    fields: Optional[Sequence[str]],
+    page_size_controller: PageSizeController,
+) -> list:
+    records_limit = _get_records_limit(cmr_limit)
+    projection = get_projection(tuple(fields)) if fields is not None else None
+    fetched_results = list(previous_results)
+
+    pages = search_concept_pages(
+        type=type,
+        search_params=search_params,
+        headers=headers,
+        format=format,
+        cmr_environment=cmr_environment,
+        page_size_controller=page_size_controller,
+    )
+    for page in pages:
+        items = page.items
+        if projection is not None:
+            items = projection.project(items)
+        fetched_results.extend(items)
+
+        if not recursive or len(fetched_results) >= records_limit:
+            break
+
+    return fetched_results[:records_limit]
+
+
+def iter_search_concept(
+    *,
+    type: str,
+    search_params: dict,
+    headers: dict = {},
+    format: str = "json",
+    cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+    cmr_limit: Optional[int] = None,
+    cmr_page_size: Optional[int] = None,
+) -> Iterator:
+    """Iterate over the search results one at a time, following the same
+    paging rules as `search_concept`
+
+    NOTE: This does not exist in cumulus. Response bodies are streamed and
+    records are decoded incrementally, so that only one record needs to be
+    held at a time.
+
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param search_params: CMR search parameters
+    :param headers: the CMR headers
+    :param format: format of the response, supports umm_json, json, echo10
+    :param cmr_environment: the CMR environment to use
+    :param cmr_limit: the CMR limit
+    :param cmr_page_size: the CMR page size
+    :returns: Iterator - the search results
+    """
+    records_limit = _get_records_limit(cmr_limit)
+    query = dict(search_params)
+    if "page_size" not in query:
+        query["page_size"] = str(_get_page_size(search_params, cmr_page_size))
+
+    query_page_num = query.get("page_num")
+    page_num = 1 if query_page_num is None else int(query_page_num) + 1
+
+    url = f"{get_search_url(cmr_env=cmr_environment)}{type}.{format.lower()}"
+    num_records_collected = 0
+
+    while True:
+        query["page_num"] = page_num
+        response = _execute_search(url, query, headers, stream=True)
+        with response:
+            cmr_hits = _get_cmr_hits(response)
+            num_page_records = 0
+            for item in _iter_response_items(response, format):
+                yield item
+                num_page_records += 1
+                num_records_collected += 1
+                if num_records_collected >= records_limit:
+                    return
+
+        cmr_has_more_results = cmr_hits > num_records_collected
+        if not cmr_has_more_results or num_page_records == 0:
+            return
+
+        page_num += 1
+
+
+def search_concept_pages(
+    *,
+    type: str,
+    search_params: dict,
+    headers: dict = {},
+    format: str = "json",
+    cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+    cmr_page_size: Optional[int] = None,
+    search_after: Optional[str] = None,
+    page_size_controller: Optional[PageSizeController] = None,
+) -> Iterator[SearchPage]:
+    """Iterate over the pages of a search using CMR-Search-After paging
+
+    NOTE: This does not exist in cumulus. Search-After paging is not affected
+    by records being added or removed while paging, and a search can be
+    resumed from any page by passing the `search_after` value of the previous
+    page.
+
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param search_params: CMR search parameters, must not contain page_num
+    :param headers: the CMR headers
+    :param format: format of the response, supports umm_json, json
+    :param cmr_environment: the CMR environment to use
+    :param cmr_page_size: the CMR page size
+    :param search_after: the CMR-Search-After value to resume the search from
+    :param page_size_controller: optional controller that adjusts the page
+        size between pages, overrides cmr_page_size
+    :returns: Iterator[SearchPage] - the pages of the results
+    """
+    query = dict(search_params)
+    if "page_size" not in query:
+        query["page_size"] = str(_get_page_size(search_params, cmr_page_size))
+
+    url = f"{get_search_url(cmr_env=cmr_environment)}{type}.{format.lower()}"
+
+    while True:
+        page_headers = dict(headers)
+        if search_after is not None:
+            page_headers["CMR-Search-After"] = search_after
+        if page_size_controller is not None:
+            # Unlike page_num offsets, Search-After paging allows the page
+            # size to change between pages
+            query["page_size"] = str(page_size_controller.page_size)
+
+        start = time.perf_counter()
+        response = _execute_search(url, query, page_headers)
+        items = _get_response_items(response, format)
+        search_after = response.headers.get("CMR-Search-After")
+
+        if page_size_controller is not None:
+            page_size_controller.update(
+                len(items),
+                time.perf_counter() - start,
+                len(response.content),
+            )
+
+        if not items:
+            return
+
+        yield SearchPage(items, _get_cmr_hits(response), search_after)
+
+        if search_after is None:
+            return
+
+
+def search_concept_to_file(
+    *,
+    type: str,
+    search_params: dict,
+    path: Union[str, Path],
+    headers: dict = {},
+    format: str = "json",
+    cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+    cmr_limit: Optional[int] = None,
+    cmr_page_size: Optional[int] = None,
+    compress: bool = False,
+) -> NDJSONReader:
+    """Search and write the results to a newline delimited JSON file as each
+    page arrives, instead of keeping them in memory.
+
+    NOTE: This does not exist in cumulus. Pages are fetched with
+    CMR-Search-After paging and released as soon as they are written. Unlike
+    `search_concept`, all of the results are written unless `cmr_limit` is
+    given, CMR_LIMIT is not used.
+
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param search_params: CMR search parameters
+    :param path: the file to write the results to
+    :param headers: the CMR headers
+    :param format: format of the response, supports umm_json, json
+    :param cmr_environment: the CMR environment to use
+    :param cmr_limit: the maximum number of results to write, None for all of
+        them
+    :param cmr_page_size: the CMR page size
+    :param compress: whether to gzip compress the file
+    :returns: NDJSONReader - a lazy reader over the search results
+    """
+    records_limit = sys.maxsize if cmr_limit is None else cmr_limit
+    num_records = 0
+
+    with NDJSONWriter(path, compress=compress) as writer:
+        pages = search_concept_pages(
+            type=type,
+            search_params=search_params,
+            headers=headers,
+            format=format,
+            cmr_environment=cmr_environment,
+            cmr_page_size=cmr_page_size,
+        )
+        for page in pages:
+            items = page.items[:records_limit - num_records]
+            writer.write_page(items)
+            num_records += len(items)
+            if num_records >= records_limit:
+                break
+
+        return writer.close()
+
+
+def get_concept_id(record: dict) -> Optional[str]:
+    """Get the concept id of a search result
+
+    NOTE: This does not exist in cumulus.
+
+    :param record: a search result in the json or umm_json format
+    :returns: Optional[str] - the concept id, None if it can't be determined
+    """
+    meta = record.get("meta")
+    if isinstance(meta, dict) and "concept-id" in meta:
+        return meta["concept-id"]
+
+    return record.get("id")
+
+
+def deduplicate_results(results: list) -> list:
+    """Remove search results with duplicate concept ids, keeping the first
+
+    NOTE: This does not exist in cumulus.
+
+    :param results: search results in the json or umm_json format
+    :returns: list - the results without duplicates
+    """
+    return _merge_keyed_results([_key_results(results)])
+
+
+def _key_results(
+    items: list,
+    fields: Optional[Sequence[str]] = None,
+) -> list[tuple[Optional[str], object]]:
+    """Pair results with their concept ids, projecting them if fields are
+    given, so that they can be deduplicated after the full records are gone
+    """
+    concept_ids = [
+        get_concept_id(item) if isinstance(item, dict) else None
+        for item in items
+    ]
+    if fields is not None:
+        items = get_projection(tuple(fields)).project(items)
+
+    return list(zip(concept_ids, items))
+
+
+def _merge_keyed_results(
+    keyed_results: Iterable[list[tuple[Optional[str], object]]],
+) -> list:
+    seen = set()
+    merged = []
+    for results in keyed_results:
+        for concept_id, record in results:
+            if concept_id is not None:
+                if concept_id in seen:
+                    continue
+                seen.add(concept_id)
+            merged.append(record)
+
+    return merged
+
+
+def get_chunk_size(num_values: int, max_workers: int) -> int:
+    """Get the number of values to search for in each chunk so that the work
+    is spread over all of the workers, while keeping the results of a chunk
+    within one page.
+
+    :param num_values: the total number of values
+    :param max_workers: the number of concurrent searches
+    :returns: int - the chunk size
+    """
+    return max(1, min(MAX_PAGE_SIZE, math.ceil(num_values / max_workers)))
+
+
+def get_chunkable_param(search_params: dict) -> Optional[tuple[str, list]]:
+    """Get the longest list parameter that can be split into chunks that are
+    searched separately
+
+    NOTE: This does not exist in cumulus. Only parameters in CHUNKABLE_PARAMS
+    qualify, and not when their values are combined with AND through
+    `options[<param>][and]`.
+
+    :param search_params: CMR search parameters
+    :returns: tuple[str, list] - the parameter name and its values, None if
+        no parameter can be chunked
+    """
+    chunkable = [
+        (key, value)
+        for key, value in search_params.items()
+        if key in CHUNKABLE_PARAMS
+        and isinstance(value, (list, tuple))
+        and str(search_params.get(f"options[{key.removesuffix('[]')}][and]")).lower() != "true"
+    ]
+    return max(chunkable, key=lambda item: len(item[1]), default=None)
+
+
+def search_concept_chunked(
+    *,
+    type: str,
+    search_params: dict,
+    headers: dict = {},
+    format: str = "json",
+    cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+    cmr_limit: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    max_workers: int = DEFAULT_CHUNK_CONCURRENCY,
+    fields: Optional[Sequence[str]] = None,
+) -> list:
+    """Search for a long list of values by splitting it into chunks that are
+    searched concurrently.
+
+    NOTE: This does not exist in cumulus. The longest list valued parameter
+    whose values are combined with OR, `granule_ur[]` or `concept_id[]`, is
+    split, see `get_chunkable_param`. Every chunk is fetched up to `cmr_limit`
+    records, then the results are merged in chunk order with duplicate concept
+    ids removed and cut to `cmr_limit`. Searches without such a parameter are
+    sent as a single search.
+
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param search_params: CMR search parameters
+    :param headers: the CMR headers
+    :param format: format of the response, supports umm_json, json
+    :param cmr_environment: the CMR environment to use
+    :param cmr_limit: the maximum number of results to return, None for all of
+        them
+    :param chunk_size: the number of values to search for per request. By
+        default the values are spread across the workers, up to the maximum
+        CMR page size per chunk
+    :param max_workers: the maximum number of concurrent searches
+    :param fields: optional dotted paths of the fields to keep, see
+        `Projection`
+    :returns: array of search results.
+    """
+    chunk_key, values = get_chunkable_param(search_params) or (None, [None])
+
+    if chunk_size is None:
+        chunk_size = get_chunk_size(len(values), max_workers)
+
+    chunks = [
+        values[i:i + chunk_size]
+        for i in range(0, len(values), chunk_size)
+    ]
+
+    def search_chunk(chunk: list) -> list:
+        params = dict(search_params)
+        if chunk_key is not None:
+            params[chunk_key] = list(chunk)
+
+        results = search_concept(
+            type=type,
+            search_params=params,
+            previous_results=[],
+            headers=headers,
+            format=format,
+            cmr_environment=cmr_environment,
+            cmr_limit=sys.maxsize if cmr_limit is None else cmr_limit,
+            cmr_page_size=min(len(chunk), MAX_PAGE_SIZE),
+        )
+        return _key_results(results, fields)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = _merge_keyed_results(executor.map(search_chunk, chunks))
+
+    if cmr_limit is not None:
+        return results[:cmr_limit]
+
+    return results
+
+
+class _Shard(NamedTuple):
+    start: datetime
+    end: datetime
+    hits: int
+
+
+def _format_date(value: datetime) -> str:
+    # Fractions of a second are kept so that the bounds of the range given by
+    # the caller are not widened or narrowed
+    if value.microsecond:
+        return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _format_temporal(start: datetime, end: datetime, periodic: Sequence[str] = ()) -> str:
+    return ",".join([_format_date(start), _format_date(end), *periodic])
+
+
+def _split_range(
+    start: datetime,
+    end: datetime,
+    n: int,
+) -> list[tuple[datetime, datetime]]:
+    step = (end - start) / n
+    boundaries = sorted({
+        start,
+        *((start + step * i).replace(microsecond=0) for i in range(1, n)),
+        end,
+    })
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def search_concept_sharded(
+    *,
+    type: str,
+    search_params: dict,
+    headers: dict = {},
+    format: str = "json",
+    cmr_environment: Optional[str] = os.getenv("CMR_ENVIRONMENT"),
+    cmr_limit: Optional[int] = None,
+    cmr_page_size: int = MAX_PAGE_SIZE,
+    max_shards: int = DEFAULT_CHUNK_CONCURRENCY,
+    records_per_shard: int = DEFAULT_RECORDS_PER_SHARD,
+    fields: Optional[Sequence[str]] = None,
+) -> list:
+    """Search by splitting the `temporal` range of the query into shards that
+    are searched concurrently.
+
+    NOTE: This does not exist in cumulus. The number of records in the range
+    is probed with a `page_size=0` search and the range is split into enough
+    equal shards to hold about `records_per_shard` records each. Shards that
+    still hold more than that are then split in half, until there are
+    `max_shards` shards. Each shard is paged through with CMR-Search-After and
+    the results are merged with duplicate concept ids removed, since records
+    that span a shard boundary match more than one shard.
+
+    :param type: Concept type to search, choices: ['collections', 'granules']
+    :param search_params: CMR search parameters, must contain a `temporal`
+        range in the form "start,end". An empty end means now. The day of
+        year bounds of a periodic range, "start,end,start_day,end_day", are
+        kept on every shard
+    :param headers: the CMR headers
+    :param format: format of the response, supports umm_json, json
+    :param cmr_environment: the CMR environment to use
+    :param cmr_limit: the maximum number of results to return, None for all of
+        them
+    :param cmr_page_size: the CMR page size
+    :param max_shards: the maximum number of shards, which are all searched
+        concurrently
+    :param records_per_shard: the target number of records per shard
+    :param fields: optional dotted paths of the fields to keep, see
+        `Projection`
+    :returns: array of search results.
+    """
+    temporal = search_params.get("temporal")
+    if not isinstance(temporal, str) or "," not in temporal:
+        raise ValueError(
+            "Sharded searches require a single temporal range, got "
+            f"{repr(temporal)}",
+        )
+
+    start_str, end_str, *periodic = (value.strip() for value in temporal.split(","))
+    if not start_str:
+        raise ValueError(
+            f"Sharded searches require a temporal start date, got {repr(temporal)}",
+        )
+    start = parse_date(start_str)
+    end = parse_date(end_str) if end_str else datetime.now(timezone.utc)
+
+    url = f"{get_search_url(cmr_env=cmr_environment)}{type}.{format.lower()}"
+
+    def probe(shard_range: tuple[datetime, datetime]) -> _Shard:
+        query = {
+            **search_params,
+            "temporal": _format_temporal(*shard_range, periodic),
+            "page_size": "0",
+        }
+        response = _execute_search(url, query, headers)
+        return _Shard(*shard_range, _get_cmr_hits(response))
+
+    def search_shard(shard: _Shard) -> list:
+        results = []
+        pages = search_concept_pages(
+            type=type,
+            search_params={
+                **search_params,
+                "temporal": _format_temporal(shard.start, shard.end, periodic),
+            },
+            headers=headers,
+            format=format,
+            cmr_environment=cmr_environment,
+            cmr_page_size=cmr_page_size,
+        )
+        for page in pages:
+            results.extend(_key_results(page.items, fields))
+            if cmr_limit is not None and len(results) >= cmr_limit:
+                break
+
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_shards) as executor:
+        total_hits = probe((start, end)).hits
+        num_shards = min(
+            max_shards,
+            max(1, math.ceil(total_hits / records_per_shard)),
+        )
+        shards = list(executor.map(probe, _split_range(start, end, num_shards)))
+
+        while len(shards) < max_shards:
+            largest = max(shards, key=lambda shard: shard.hits)
+            halves = _split_range(largest.start, largest.end, 2)
+            if largest.hits <= records_per_shard or len(halves) < 2:
+                break
+
+            shards.remove(largest)
+            shards.extend(executor.map(probe, halves))
+
+        shards = sorted(
+            (shard for shard in shards if shard.hits),
+            key=lambda shard: shard.start,
+        )
+        log.debug(
+            "Searching %s hits in %s temporal shards",
+            total_hits,
+            len(shards),
+        )
+        results = _merge_keyed_results(executor.map(search_shard, shards))
+
+    if cmr_limit is not None:
+        return results[:cmr_limit]
+
+    return results
@@ -6,10 +6,12 @@ import os
 
 from cumulus_port import launchpad_auth as launchpad
 from cumulus_port.aws_client.secrets_manager import get_secret_string
+from cumulus_port.instrumentation import profiled
 
 log = logging.getLogger(__name__)
 
 
+@profiled
 def get_cmr_settings(cmr_config: dict = {}) -> dict:
     """Helper to build an CMR settings object, used to initialize CMR.
 
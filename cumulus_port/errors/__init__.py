@@ -1,5 +1,9 @@
 # Ported from:
 # https://github.com/nasa/cumulus/blob/master/packages/errors/src/index.ts
 
+class CMRInternalError(Exception):
+    pass
+
+
 class MissingRequiredEnvVarError(Exception):
     pass
@@ -0,0 +1,200 @@
+"""Collection configuration compiled for repeated use.
+
+NOTE: This does not exist in cumulus. The regexes and url_path templates of a
+collection are compiled once and kept in a process wide LRU cache keyed by the
+collection name and version. An entry is rebuilt when the `updatedAt` of the
+collection changes, or when the regexes or url_paths of the collection
+were edited in place, so changes to a collection are picked up as
+soon as the updated configuration is passed in.
+
+Only the file regexes are compiled up front. Templates and the granule id
+regexes are compiled when they are first used, so an invalid entry only fails
+the files that use it.
+
+Collections without a name, version or updatedAt are not cached.
+"""
+
+import functools
+import re
+from collections.abc import Mapping
+from typing import Iterable, Optional
+
+from cumulus_port._internal.cache import LRUCache
+from cumulus_port.ingest.granule import (
+    UnversionedFilenames,
+    extract_granule_id,
+    unversion_filename,
+    unversion_filenames,
+)
+from cumulus_port.ingest.url_path_template import (
+    CompiledTemplate,
+    compile_template,
+    render_template,
+    url_path_template,
+)
+
+# Compiled collections keyed by (name, version). Shared by the whole process
+# so that warm Lambda containers reuse them.
+collection_cache = LRUCache(maxsize=512)
+
+
+class CompiledFileSpec:
+    """A file specification of a collection with its regex compiled"""
+    __slots__ = ("index", "regex", "url_path", "_template")
+
+    def __init__(self, index: int, regex: re.Pattern, url_path: str):
+        """
+        :param index: the position of the spec in the collection files
+        :param regex: the compiled file regex
+        :param url_path: the file url_path, or the collection url_path if
+            the file has none
+        """
+        self.index = index
+        self.regex = regex
+        self.url_path = url_path
+        self._template: Optional[CompiledTemplate] = None
+
+    @property
+    def template(self) -> CompiledTemplate:
+        if self._template is None:
+            self._template = compile_template(self.url_path)
+        return self._template
+
+    def render(self, context: Mapping) -> str:
+        """Render the url_path template of the spec
+
+        :param context: the metadata used in the template
+        :returns: str - the url path for the file
+        """
+        if self._template is None:
+            # Compile errors are reported like any other template error
+            url_path = url_path_template(self.url_path, context)
+            self._template = compile_template(self.url_path)
+            return url_path
+
+        return render_template(self._template, context)
+
+
+def _fingerprint(collection: dict) -> tuple:
+    """The parts of a collection that the compiled collection is built from,
+    used to detect collections that were edited in place
+    """
+    return (
+        collection.get("url_path"),
+        collection.get("granuleId"),
+        collection.get("granuleIdExtraction"),
+        *(
+            (spec["regex"], spec.get("url_path"))
+            for spec in collection["files"]
+        ),
+    )
+
+
+class CompiledCollection:
+    """The regexes and url_path templates of a collection, compiled"""
+
+    def __init__(self, collection: dict):
+        """
+        :param collection: configuration object defining a collection of
+            granules and their files
+        """
+        self.name: Optional[str] = collection.get("name")
+        self.version: Optional[str] = collection.get("version")
+        self.updated_at = collection.get("updatedAt")
+        self.fingerprint = _fingerprint(collection)
+
+        self._url_path: Optional[str] = collection.get("url_path")
+        self._granule_id: Optional[str] = collection.get("granuleId")
+        self._granule_id_extraction: Optional[str] = collection.get("granuleIdExtraction")
+
+        self.file_specs = [
+            CompiledFileSpec(
+                index,
+                # NOTE: We ignore any differences in regex syntax between
+                # javascript and python. This could cause certain regexes to
+                # break or match incorrectly.
+                re.compile(spec["regex"]),
+                spec.get("url_path") or self._url_path or "",
+            )
+            for index, spec in enumerate(collection["files"])
+        ]
+
+    @functools.cached_property
+    def granule_id(self) -> Optional[re.Pattern]:
+        return _compile_optional(self._granule_id)
+
+    @functools.cached_property
+    def granule_id_extraction(self) -> Optional[re.Pattern]:
+        return _compile_optional(self._granule_id_extraction)
+
+    def match_file(self, file_name: str) -> list[CompiledFileSpec]:
+        """Get the file specs whose regex matches a file name, ignoring any
+        versioned timestamp suffix
+
+        :param file_name: the name of the file
+        :returns: list[CompiledFileSpec] - the matching file specs
+        """
+        name = unversion_filename(file_name)
+        return [
+            file_spec
+            for file_spec in self.file_specs
+            if file_spec.regex.search(name)
+        ]
+
+    def extract_granule_id(self, file_name: str) -> Optional[str]:
+        """Extract the granule id from a file name with the
+        granuleIdExtraction regex of the collection
+
+        :param file_name: the name of the file
+        :returns: str - the first group of the match, or None if the
+            collection has no granuleIdExtraction or the name does not match
+        """
+        if self.granule_id_extraction is None:
+            return None
+
+        return extract_granule_id(file_name, self.granule_id_extraction)
+
+    def unversion_filenames(self, filenames: Iterable[str]) -> UnversionedFilenames:
+        """Unversion a batch of file names and extract their granule ids with
+        the granuleIdExtraction regex of the collection
+
+        :param filenames: names of the files, e.g. a list or a NumPy array of
+            strings
+        :returns: UnversionedFilenames - see `unversion_filenames`
+        """
+        return unversion_filenames(
+            filenames,
+            granule_id_extraction=self.granule_id_extraction,
+        )
+
+
+def _compile_optional(regex: Optional[str]) -> Optional[re.Pattern]:
+    return None if regex is None else re.compile(regex)
+
+
+def get_compiled_collection(collection: dict) -> Optional[CompiledCollection]:
+    """Get the cached compiled form of a collection, compiling it if it is
+    not cached, its updatedAt changed or it was edited in place
+
+    :param collection: configuration object defining a collection of granules
+        and their files
+    :returns: Optional[CompiledCollection] - the compiled collection, None
+        if the collection has no name, version or updatedAt to cache it by
+    """
+    name = collection.get("name")
+    version = collection.get("version")
+    updated_at = collection.get("updatedAt")
+    if name is None or version is None or updated_at is None:
+        return None
+
+    key = (name, version)
+    compiled = collection_cache.get(key)
+    if (
+        compiled is None
+        or compiled.updated_at != updated_at
+        or compiled.fingerprint != _fingerprint(collection)
+    ):
+        compiled = CompiledCollection(collection)
+        collection_cache.set(key, compiled)
+
+    return compiled
@@ -1,7 +1,9 @@
 # Ported from:
 # https://github.com/nasa/cumulus/blob/master/packages/ingest/src/granule.ts
 
+import operator
 import re
+from typing import Iterable, NamedTuple, Optional, Union
 
 SUFFIX_PATTERN = re.compile(
     r"\.v[0-9]{4}(0[1-9]|1[0-2])(0[1-9]|[1-2][0-9]|3[0-1])T(2[0-3]|[01][0-9])"
@@ -29,3 +31,116 @@ def unversion_filename(filename: str) -> str:
         return ".".join(filename.split(".")[0:-1])
 
     return filename
+
+
+# Like SUFFIX_PATTERN, but matching at the end of every line
+_LINE_SUFFIX_PATTERN = re.compile(SUFFIX_PATTERN.pattern, re.MULTILINE)
+
+
+class UnversionedFilenames(NamedTuple):
+    # The filenames with any versioned timestamp stripped off
+    names: list[str]
+    # Whether each filename had a versioned timestamp
+    renamed: list[bool]
+    # The granule id of each filename, None if no granuleIdExtraction was
+    # given or the filename does not match it
+    granule_ids: list[Optional[str]]
+
+
+def extract_granule_id(
+    filename: str,
+    granule_id_extraction: Union[str, re.Pattern],
+) -> Optional[str]:
+    """Extract the granule id from a filename with the granuleIdExtraction
+    regex of a collection
+
+    NOTE: This does not exist in cumulus.
+
+    :param filename: name of the file
+    :param granule_id_extraction: the granuleIdExtraction regex
+    :returns: str - the first group of the match, or the whole match if the
+        regex has no groups. None if the filename does not match
+    """
+    return _match_granule_id(re.search(granule_id_extraction, filename))
+
+
+def _match_granule_id(m: Optional[re.Match]) -> Optional[str]:
+    if m is None:
+        return None
+
+    return m.group(1) if m.re.groups else m.group(0)
+
+
+def _unversion_unique(filenames: list[str]) -> list[str]:
+    # Strip the suffixes of all of the filenames with a single substitution
+    # over the joined names. Names containing newlines would be split apart,
+    # so those fall back to one substitution per name.
+    joined = "\n".join(filenames)
+    if joined.count("\n") != len(filenames) - 1:
+        return [unversion_filename(filename) for filename in filenames]
+
+    return _LINE_SUFFIX_PATTERN.sub("", joined).split("\n")
+
+
+def unversion_filenames(
+    filenames: Iterable[str],
+    *,
+    granule_id_extraction: Union[str, re.Pattern, None] = None,
+) -> UnversionedFilenames:
+    """Unversion a batch of filenames, optionally extracting their granule
+    ids as well
+
+    NOTE: This does not exist in cumulus. It gives the same results as
+    calling `unversion_filename`, `is_file_renamed` and `extract_granule_id`
+    for each filename, with less per name overhead. Each distinct filename is
+    only processed once, so repeated names are cheap. The granule id is
+    extracted from the unversioned name, so that a renamed file belongs to
+    the same granule as the original.
+
+    Example:
+    >>> result = unversion_filenames(
+    ...     ["SAMPLE_1.nc", "SAMPLE_1.nc.v20240101T000000000"],
+    ...     granule_id_extraction="(SAMPLE_[0-9]+)",
+    ... )
+    >>> result.names
+    ['SAMPLE_1.nc', 'SAMPLE_1.nc']
+    >>> result.renamed
+    [False, True]
+    >>> result.granule_ids
+    ['SAMPLE_1', 'SAMPLE_1']
+
+    :param filenames: names of the files, e.g. a list or a NumPy array of
+        strings. Arrays are converted to a list, they are not processed with
+        vectorized operations
+    :param granule_id_extraction: the granuleIdExtraction regex of the
+        collection
+    :returns: UnversionedFilenames - lists in the same order as `filenames`
+    """
+    # NumPy arrays convert to a list of str much faster than they iterate
+    tolist = getattr(filenames, "tolist", None)
+    filenames = tolist() if tolist is not None else list(filenames)
+    if not filenames:
+        return UnversionedFilenames([], [], [])
+
+    unique = list(dict.fromkeys(filenames))
+    names = _unversion_unique(unique)
+    # Only renamed files lose their suffix
+    renamed = list(map(operator.ne, map(len, unique), map(len, names)))
+    if granule_id_extraction is None:
+        granule_ids = [None] * len(unique)
+    else:
+        regex = re.compile(granule_id_extraction)
+        group = 1 if regex.groups else 0
+        granule_ids = [
+            m[group] if m is not None else None
+            for m in map(regex.search, names)
+        ]
+
+    if len(unique) != len(filenames):
+        index = dict(zip(unique, range(len(unique))))
+        indices = list(map(index.__getitem__, filenames))
+        names = list(map(names.__getitem__, indices))
+        renamed = list(map(renamed.__getitem__, indices))
+        granule_ids = list(map(granule_ids.__getitem__, indices))
+
+    return UnversionedFilenames(names, renamed, granule_ids)
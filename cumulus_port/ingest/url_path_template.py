@@ -1,24 +1,135 @@
 # Ported from:
 # https://github.com/nasa/cumulus/blob/master/packages/ingest/src/url-path-template.js
 
+import functools
 import re
+from collections.abc import Mapping
+from typing import Any, Callable, NamedTuple, Union
 
-from cumulus_port._internal.jsonpath import get
+from cumulus_port._internal import jsonpath
+from cumulus_port._internal.moment import compile_format, parse_date
 
 TEMPLATE_PATTERN = re.compile("{([^{}]+)}")
 EXPRESSION_PATTERN = re.compile(r"([^(]+)\(([^)]+)\)")
+ARGS_SEPARATOR_PATTERN = re.compile(r"\s*,\s*")
+ROOT_FIELD_PATTERN = re.compile(
+    r"""^\s*(?:\$\.?)?(?:\[\s*['"]([^'"]+)['"]\s*\]|([^.\[\s]+))""",
+)
 
 
-def _get_single_value(data: dict, path: str):
-    values = get(data, path)
+class Operation(NamedTuple):
+    """A template operation such as `extractYear`
 
-    if not values:
-        raise Exception(f"Could not resolve path {repr(path)}")
+    `compile` is called once per template with the literal arguments of the
+    operation (every argument except the first, which is a path) and returns
+    the function to apply to the value found at the path.
+    """
+    compile: Callable[[list[str]], Callable[[Any], Any]]
+    allow_missing: bool = False
+
+
+OPERATIONS: dict[str, Operation] = {}
+
+
+def register_operation(name: str, *, allow_missing: bool = False):
+    """Register a template operation under `name`
+
+    :param name: the name of the operation used in templates
+    :param allow_missing: whether the operation accepts a path that does not
+        resolve to a value, in which case the value is None
+    """
+    def decorator(compile: Callable[[list[str]], Callable[[Any], Any]]):
+        OPERATIONS[name] = Operation(compile, allow_missing)
+        return compile
+
+    return decorator
+
+
+def _to_integer(arg: str) -> int:
+    try:
+        return int(float(arg))
+    except (TypeError, ValueError):
+        return 0
+
+
+@register_operation("extractYear")
+def _extract_year(args: list[str]) -> Callable[[Any], str]:
+    return lambda value: str(parse_date(value).year)
+
+
+@register_operation("extractMonth")
+def _extract_month(args: list[str]) -> Callable[[Any], str]:
+    return lambda value: str(parse_date(value).month)
+
+
+@register_operation("extractDate")
+def _extract_date(args: list[str]) -> Callable[[Any], str]:
+    return lambda value: str(parse_date(value).day)
+
+
+@register_operation("extractHour")
+def _extract_hour(args: list[str]) -> Callable[[Any], str]:
+    return lambda value: str(parse_date(value).hour)
+
+
+@register_operation("dateFormat")
+def _date_format(args: list[str]) -> Callable[[Any], str]:
+    # Dates are in UTC, for which moment's default format ends in a literal Z
+    format_date = compile_format(args[0] if args else "YYYY-MM-DDTHH:mm:ss[Z]")
+    return lambda value: format_date(parse_date(value))
 
-    if len(values) != 1:
-        raise ValueError(f"Path returned multiple values {repr(path)}")
 
-    return values[0]
+@register_operation("substring")
+def _substring(args: list[str]) -> Callable[[Any], str]:
+    start = _to_integer(args[0]) if args else 0
+    end = _to_integer(args[1]) if len(args) > 1 else None
+
+    # Follows the semantics of javascript's String.prototype.substring
+    def substring(value: Any) -> str:
+        value = str(value)
+        length = len(value)
+        begin = min(max(start, 0), length)
+        finish = length if end is None else min(max(end, 0), length)
+        if begin > finish:
+            begin, finish = finish, begin
+        return value[begin:finish]
+
+    return substring
+
+
+def _dirname(path: str) -> str:
+    # Follows the semantics of node's path.dirname, which differs from
+    # posixpath.dirname for trailing slashes and paths without a directory
+    if not path:
+        return "."
+
+    has_root = path[0] == "/"
+    end = -1
+    matched_slash = True
+    for i in range(len(path) - 1, 0, -1):
+        if path[i] == "/":
+            if not matched_slash:
+                end = i
+                break
+        else:
+            matched_slash = False
+
+    if end == -1:
+        return "/" if has_root else "."
+    if has_root and end == 1:
+        return "//"
+    return path[:end]
+
+
+@register_operation("extractPath")
+def _extract_path(args: list[str]) -> Callable[[Any], str]:
+    return lambda value: _dirname(str(value))
+
+
+@register_operation("defaultTo", allow_missing=True)
+def _default_to(args: list[str]) -> Callable[[Any], Any]:
+    default = args[0] if args else None
+    return lambda value: default if value is None else value
 
 
 def evaluate_operation(name: str, args: list) -> str:
@@ -28,43 +139,197 @@ def evaluate_operation(name: str, args: list) -> str:
     :param args: the args (in array) of the operation
     :returns: str - the return value of the operation
     """
-    raise NotImplementedError("evaluate_operation is not implemented yet")
+    operation = OPERATIONS.get(name)
+    if operation is None:
+        raise Exception(f"Could not support operation {name}")
+
+    return operation.compile(args[1:])(args[0])
+
+
+class _Expression:
+    """A single `{...}` expression of a template, with its jsonpath and
+    operation already parsed
+    """
+    __slots__ = ("path", "expr", "apply", "allow_missing")
+
+    def __init__(self, submatch: str):
+        m = EXPRESSION_PATTERN.search(submatch)
+        if m:
+            name = m.group(1)
+            operation = OPERATIONS.get(name)
+            if operation is None:
+                raise Exception(f"Could not support operation {name}")
+
+            path, *args = ARGS_SEPARATOR_PATTERN.split(m.group(2))
+            self.apply = operation.compile(args)
+            self.allow_missing = operation.allow_missing
+        else:
+            path = submatch
+            self.apply = None
+            self.allow_missing = False
+
+        self.path = path
+        self.expr = jsonpath.parse(path)
+
+    def evaluate(self, context: Mapping) -> str:
+        values = [match.value for match in self.expr.find(context)]
+
+        if len(values) > 1:
+            raise ValueError(f"Path returned multiple values {repr(self.path)}")
+        if not values and not self.allow_missing:
+            raise Exception(f"Could not resolve path {repr(self.path)}")
+
+        value = values[0] if values else None
+        if self.apply is not None:
+            value = self.apply(value)
 
+        return str(value)
 
-def template_replacer(context: dict, match: re.Match) -> str:
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expression(submatch: str) -> _Expression:
+    return _Expression(submatch)
+
+
+class CompiledTemplate:
+    """A url_path template that has been split into literal text and parsed
+    expressions so that it can be rendered many times without being parsed
+    again.
+
+    NOTE: This does not exist in cumulus.
+    """
+
+    def __init__(self, path_template: str):
+        """
+        :param path_template: the template that defines the path, using `{}`
+            for string interpolation
+        """
+        self.path_template = path_template
+        self.parts: list[Union[str, _Expression]] = []
+
+        pos = 0
+        for m in TEMPLATE_PATTERN.finditer(path_template):
+            if m.start() > pos:
+                self.parts.append(path_template[pos:m.start()])
+            self.parts.append(_compile_expression(m.group(1)))
+            pos = m.end()
+        if pos < len(path_template):
+            self.parts.append(path_template[pos:])
+
+    def render(self, context: Mapping) -> str:
+        """Replace the template expressions with values from the context
+
+        :param context: the metadata used in the template
+        :returns: str - the rendered template
+        """
+        return "".join(
+            part if isinstance(part, str) else part.evaluate(context)
+            for part in self.parts
+        )
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(path_template: str) -> CompiledTemplate:
+    """Compile a url_path template, reusing previously compiled templates
+
+    NOTE: This does not exist in cumulus.
+
+    :param path_template: the template that defines the path
+    :returns: CompiledTemplate - the compiled template
+    """
+    return CompiledTemplate(path_template)
+
+
+def template_replacer(context: Mapping, match: re.Match) -> str:
     """retrieve the actual value of the matched string and return it
 
     :param context: the metadata used in the template
     :param match: the match object from re.sub
     :returns: str - the value of the matched string
     """
-    submatch = match.group(1)
-    m = EXPRESSION_PATTERN.search(submatch)
+    return _compile_expression(match.group(1)).evaluate(context)
+
+
+def get_template_paths(path_template: str) -> list[str]:
+    """Get the paths into the context that a template references.
+
+    NOTE: This does not exist in cumulus. Only the first argument of an
+    operation is a path, the rest are literals. Values that themselves contain
+    templates can only be discovered when the template is evaluated.
+
+    :param path_template: the template that defines the path
+    :returns: list[str] - the jsonpath expressions used by the template
+    """
+    paths = []
+    for submatch in TEMPLATE_PATTERN.findall(path_template):
+        m = EXPRESSION_PATTERN.search(submatch)
+        if m:
+            paths.append(ARGS_SEPARATOR_PATTERN.split(m.group(2))[0])
+        else:
+            paths.append(submatch)
+
+    return paths
+
+
+def get_template_root_fields(path_template: str) -> set[str]:
+    """Get the top level context fields that a template references.
 
-    if m:
-        raise NotImplementedError("operations are not implemented yet")
+    NOTE: This does not exist in cumulus.
 
-    return _get_single_value(context, submatch)
+    Example:
+    >>> get_template_root_fields("{granule.granuleId}/{cmrMetadata.Foo}/")
+    {'granule', 'cmrMetadata'}
+
+    :param path_template: the template that defines the path
+    :returns: set[str] - the names of the referenced top level fields
+    """
+    fields = set()
+    for path in get_template_paths(path_template):
+        m = ROOT_FIELD_PATTERN.match(path)
+        if m:
+            fields.add(m.group(1) or m.group(2))
+
+    return fields
 
 
-def url_path_template(path_template: str, context: dict) -> str:
+def url_path_template(path_template: str, context: Mapping) -> str:
     """define the path of a file based on the metadata of a granule
 
     :param path_template: the template that defines the path, using `{}` for
         string interpolation
+    :param context: the metadata used in the template. Any mapping may be
+        used, so values can be computed lazily when a path first needs them
+    :returns: str - the url path for the file
+    """
+    try:
+        template = compile_template(path_template)
+    except Exception as e:
+        raise _resolve_error(path_template, e) from e
+
+    return render_template(template, context)
+
+
+def render_template(template: CompiledTemplate, context: Mapping) -> str:
+    """Render a compiled url_path template the way `url_path_template` does,
+    rendering values that themselves contain templates again
+
+    NOTE: This does not exist in cumulus.
+
+    :param template: the compiled template
     :param context: the metadata used in the template
     :returns: str - the url path for the file
     """
     try:
-        replaced_path = TEMPLATE_PATTERN.sub(
-            lambda m: template_replacer(context, m),
-            path_template,
-        )
+        replaced_path = template.render(context)
         if TEMPLATE_PATTERN.search(replaced_path):
             return url_path_template(replaced_path, context)
         return replaced_path
     except Exception as e:
-        raise Exception(
-            f"Could not resolve path template {repr(path_template)} with error "
-            f"{repr(str(e))}",
-        ) from e
+        raise _resolve_error(template.path_template, e) from e
+
+
+def _resolve_error(path_template: str, error: Exception) -> Exception:
+    return Exception(
+        f"Could not resolve path template {repr(path_template)} with error "
+        f"{repr(str(error))}",
+    )
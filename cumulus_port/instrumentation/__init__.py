@@ -0,0 +1,50 @@
+from typing import TYPE_CHECKING
+
+from cumulus_port._internal.lazy_import import lazy_exports
+
+from .hooks import (
+    Event,
+    Span,
+    add_hook,
+    clear_hooks,
+    current_span,
+    instrument,
+    remove_hook,
+)
+
+if TYPE_CHECKING:
+    from .metrics import (
+        Histogram,
+        Metrics,
+        disable_metrics,
+        enable_metrics,
+        get_metrics,
+    )
+    from .profiling import configure_profiling, profiled
+
+__all__ = [
+    "Event",
+    "Histogram",
+    "Metrics",
+    "Span",
+    "add_hook",
+    "clear_hooks",
+    "configure_profiling",
+    "current_span",
+    "disable_metrics",
+    "enable_metrics",
+    "get_metrics",
+    "instrument",
+    "profiled",
+    "remove_hook",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "Histogram": ".metrics",
+    "Metrics": ".metrics",
+    "configure_profiling": ".profiling",
+    "disable_metrics": ".metrics",
+    "enable_metrics": ".metrics",
+    "get_metrics": ".metrics",
+    "profiled": ".profiling",
+})
@@ -0,0 +1,209 @@
+"""Hooks for observing the requests made to CMR, Earthdata Login, Launchpad
+and AWS.
+
+NOTE: This does not exist in cumulus. Every instrumented operation emits a
+"start" event before the request is sent and an "end" event once the response
+is received or the request failed. Hooks are called synchronously in the
+thread of the request, so they should be quick and must not block.
+
+When no hook is registered, `instrument` returns a shared no-op span and the
+instrumented code pays for one check of an empty tuple.
+
+Example:
+>>> def log_event(event: Event) -> None:
+...     if event.phase == "end":
+...         print(event.operation, event.duration, event.status)
+>>> add_hook(log_event)
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    # "start" or "end"
+    phase: str
+    # Name of the operation, e.g. "cmr.search" or "s3.get_object"
+    operation: str
+    # Details of the operation, e.g. the url or the S3 bucket and key
+    attributes: dict
+    # `time.perf_counter` at the start of the operation
+    start: float
+    # The following are only set on "end" events
+    duration: Optional[float] = None
+    # Number of bytes received or sent, if known
+    bytes: Optional[int] = None
+    # HTTP status code of the last response, if any
+    status: Optional[int] = None
+    # Number of times the request was retried after being throttled
+    retries: int = 0
+    error: Optional[BaseException] = None
+
+
+Hook = Callable[[Event], Any]
+
+_hooks: tuple[Hook, ...] = ()
+_hooks_lock = threading.Lock()
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span",
+    default=None,
+)
+
+
+def add_hook(hook: Hook) -> Hook:
+    """Subscribe to the events of all instrumented operations
+
+    :param hook: function called with every `Event`
+    :returns: Hook - the hook, so that `add_hook` can be used as a decorator
+    """
+    global _hooks
+
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+    return hook
+
+
+def remove_hook(hook: Hook) -> None:
+    """Unsubscribe a hook added with `add_hook`
+
+    :param hook: the hook to remove
+    """
+    global _hooks
+
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h != hook)
+
+
+def clear_hooks() -> None:
+    global _hooks
+
+    with _hooks_lock:
+        _hooks = ()
+
+
+def _emit(event: Event) -> None:
+    for hook in _hooks:
+        try:
+            hook(event)
+        except Exception:
+            # A broken hook must not fail the request it observes
+            log.exception("Instrumentation hook %r failed", hook)
+
+
+class Span:
+    """One instrumented operation, used as a context manager around it.
+
+    The instrumented code records what it learns about the operation on the
+    span, which is reported by the "end" event.
+    """
+
+    __slots__ = (
+        "operation",
+        "attributes",
+        "start",
+        "bytes",
+        "status",
+        "retries",
+        "_token",
+    )
+
+    enabled = True
+
+    def __init__(self, operation: str, attributes: dict):
+        self.operation = operation
+        self.attributes = attributes
+        self.start = 0.0
+        self.bytes: Optional[int] = None
+        self.status: Optional[int] = None
+        self.retries = 0
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        _emit(Event("start", self.operation, self.attributes, self.start))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        _emit(Event(
+            "end",
+            self.operation,
+            self.attributes,
+            self.start,
+            duration,
+            self.bytes,
+            self.status,
+            self.retries,
+            exc,
+        ))
+
+    def record_response(self, response) -> None:
+        """Record the status and size of an HTTP response
+
+        :param response: a `requests` or `aiohttp` response
+        """
+        status = getattr(response, "status_code", None)
+        self.status = status if status is not None else getattr(response, "status", None)
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None:
+            self.bytes = int(content_length)
+
+
+class _NoopSpan:
+    """Stands in for `Span` when no hook is registered"""
+
+    __slots__ = ()
+
+    enabled = False
+    bytes = None
+    status = None
+    retries = 0
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+    def record_response(self, response) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def instrument(operation: str, **attributes: Any) -> Span:
+    """Create a span for an operation
+
+    Example:
+    >>> with instrument("cmr.search", url=url) as span:
+    ...     response = requests.get(url)
+    ...     span.record_response(response)
+
+    :param operation: name of the operation
+    :param attributes: details of the operation passed on to the hooks
+    :returns: Span - the span to use as a context manager, a no-op span if
+        no hook is registered
+    """
+    if not _hooks:
+        return _NOOP_SPAN
+    return Span(operation, attributes)
+
+
+def current_span() -> Optional[Span]:
+    """Get the span of the operation in progress in this context
+
+    :returns: Optional[Span] - the innermost span, None if there is none or
+        no hook is registered
+    """
+    return _current_span.get()
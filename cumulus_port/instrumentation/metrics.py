@@ -0,0 +1,337 @@
+"""In process latency histograms and counters of the instrumented operations.
+
+NOTE: This does not exist in cumulus. `Metrics` subscribes to the
+instrumentation hooks and aggregates the "end" events per operation into a
+fixed bucket latency histogram and counters of calls, errors, retries and
+bytes. A snapshot of the aggregates can be exported as JSON or in the
+Prometheus text format, so that a Lambda can log one metrics blob per
+invocation without an external agent.
+
+Example:
+>>> metrics = enable_metrics()
+>>> ...
+>>> print(metrics.to_json(reset=True))
+"""
+
+import bisect
+import json
+import math
+import threading
+from collections import Counter
+from typing import Optional, Sequence
+
+from .hooks import Event, add_hook, remove_hook
+
+# Upper bounds of the latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Histogram:
+    """A histogram with fixed buckets, which estimates quantiles by
+    interpolating within the bucket that contains them.
+
+    NOTE: Not thread safe on its own, `Metrics` serializes the updates.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param bounds: the increasing upper bounds of the buckets. Values
+            above the last bound are counted in an overflow bucket
+        """
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("Bucket bounds must be strictly increasing")
+
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile of the observed values
+
+        :param q: the quantile, between 0 and 1
+        :returns: Optional[float] - the estimate, None if nothing was observed
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else self.min
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+
+        return self.max
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """
+        :returns: list[tuple[float, int]] - the number of values less than
+            or equal to each bound, ending with infinity
+        """
+        result = []
+        cumulative = 0
+        for bound, count in zip((*self.bounds, math.inf), self.counts):
+            cumulative += count
+            result.append((bound, cumulative))
+
+        return result
+
+
+class _OperationMetrics:
+    __slots__ = ("latency", "counters", "statuses")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.latency = Histogram(bounds)
+        self.counters: Counter = Counter()
+        self.statuses: Counter = Counter()
+
+
+class Metrics:
+    """Aggregate the events of the instrumented operations
+
+    An instance is an instrumentation hook, it can be registered with
+    `add_hook` or through `enable_metrics`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param buckets: the upper bounds of the latency buckets in seconds
+        """
+        # Validates the bounds early
+        self.buckets = Histogram(buckets).bounds
+        self._operations: dict[str, _OperationMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        if event.phase != "end":
+            return
+
+        self.observe(
+            event.operation,
+            event.duration,
+            bytes=event.bytes,
+            status=event.status,
+            retries=event.retries,
+            error=event.error is not None,
+        )
+
+    def observe(
+        self,
+        operation: str,
+        duration: float,
+        *,
+        bytes: Optional[int] = None,
+        status: Optional[int] = None,
+        retries: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record one call of an operation
+
+        :param operation: name of the operation
+        :param duration: seconds taken by the call
+        :param bytes: number of bytes received or sent, if known
+        :param status: HTTP status code of the response, if any
+        :param retries: number of times the call was retried
+        :param error: whether the call failed
+        """
+        with self._lock:
+            metrics = self._operations.get(operation)
+            if metrics is None:
+                metrics = self._operations[operation] = _OperationMetrics(self.buckets)
+
+            metrics.latency.observe(duration)
+            counters = metrics.counters
+            counters["calls"] += 1
+            if error:
+                counters["errors"] += 1
+            if retries:
+                counters["retries"] += retries
+            if bytes is not None:
+                counters["bytes"] += bytes
+            if status is not None:
+                metrics.statuses[status] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """Get the aggregates of every operation
+
+        :param reset: whether to start new aggregates, e.g. once per Lambda
+            invocation
+        :returns: dict - the counters, latency quantiles in seconds and
+            cumulative bucket counts by operation name
+        """
+        with self._lock:
+            operations = self._operations
+            if reset:
+                self._operations = {}
+            else:
+                # Copied so that the export is not racing with updates
+                operations = {
+                    name: self._copy(metrics)
+                    for name, metrics in operations.items()
+                }
+
+        snapshot = {}
+        for name, metrics in sorted(operations.items()):
+            latency = metrics.latency
+            snapshot[name] = {
+                "calls": metrics.counters["calls"],
+                "errors": metrics.counters["errors"],
+                "retries": metrics.counters["retries"],
+                "bytes": metrics.counters["bytes"],
+                "statuses": {str(k): v for k, v in sorted(metrics.statuses.items())},
+                "latency": {
+                    "count": latency.count,
+                    "sum": latency.sum,
+                    "min": latency.min,
+                    "max": latency.max,
+                    **{
+                        f"p{round(q * 100)}": latency.quantile(q)
+                        for q in QUANTILES
+                    },
+                    "buckets": latency.cumulative_counts(),
+                },
+            }
+
+        return snapshot
+
+    def _copy(self, metrics: _OperationMetrics) -> _OperationMetrics:
+        copy = _OperationMetrics(self.buckets)
+        latency = metrics.latency
+        copy.latency.counts = list(latency.counts)
+        copy.latency.count = latency.count
+        copy.latency.sum = latency.sum
+        copy.latency.min = latency.min
+        copy.latency.max = latency.max
+        copy.counters = metrics.counters.copy()
+        copy.statuses = metrics.statuses.copy()
+        return copy
+
+    def to_json(self, reset: bool = False) -> str:
+        """Export a snapshot as JSON, without the bucket counts
+
+        :param reset: whether to start new aggregates
+        :returns: str - the JSON document
+        """
+        snapshot = self.snapshot(reset)
+        for metrics in snapshot.values():
+            del metrics["latency"]["buckets"]
+
+        return json.dumps(snapshot, sort_keys=True)
+
+    def to_prometheus(self, reset: bool = False, *, namespace: str = "cumulus") -> str:
+        """Export a snapshot in the Prometheus text exposition format
+
+        :param reset: whether to start new aggregates
+        :param namespace: prefix of the metric names
+        :returns: str - the metrics, one sample per line
+        """
+        snapshot = self.snapshot(reset)
+        duration = f"{namespace}_operation_duration_seconds"
+        lines = [
+            f"# HELP {duration} Duration of the instrumented operations.",
+            f"# TYPE {duration} histogram",
+        ]
+        for name, metrics in snapshot.items():
+            label = f'operation="{_escape_label(name)}"'
+            latency = metrics["latency"]
+            for bound, count in latency["buckets"]:
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                lines.append(f'{duration}_bucket{{{label},le="{le}"}} {count}')
+            lines.append(f"{duration}_sum{{{label}}} {latency['sum']!r}")
+            lines.append(f"{duration}_count{{{label}}} {latency['count']}")
+
+        for counter, help in (
+            ("errors", "Number of failed operations."),
+            ("retries", "Number of retried requests."),
+            ("bytes", "Number of bytes received or sent."),
+        ):
+            metric = f"{namespace}_operation_{counter}_total"
+            lines.append(f"# HELP {metric} {help}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, metrics in snapshot.items():
+                label = f'operation="{_escape_label(name)}"'
+                lines.append(f"{metric}{{{label}}} {metrics[counter]}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def enable_metrics(buckets: Sequence[float] = DEFAULT_BUCKETS) -> Metrics:
+    """Start aggregating the instrumented operations of the process
+
+    :param buckets: the upper bounds of the latency buckets in seconds, only
+        used if metrics are not enabled yet
+    :returns: Metrics - the process wide metrics
+    """
+    global _metrics
+
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics(buckets)
+            add_hook(_metrics)
+        return _metrics
+
+
+def disable_metrics() -> None:
+    """Stop aggregating and discard the process wide metrics"""
+    global _metrics
+
+    with _metrics_lock:
+        if _metrics is not None:
+            remove_hook(_metrics)
+            _metrics = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    """
+    :returns: Optional[Metrics] - the process wide metrics, None if they are
+        not enabled
+    """
+    return _metrics
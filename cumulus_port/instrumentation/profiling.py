@@ -0,0 +1,255 @@
+"""Opt in profiling of the public entry points.
+
+NOTE: This does not exist in cumulus. Functions decorated with `profiled` run
+under `cProfile` and/or `tracemalloc` when profiling is enabled, and write
+the results to a directory:
+
+- `<name>-<time>-<pid>-<n>.prof`: cProfile stats, readable with `pstats` or
+  tools such as snakeviz
+- `<name>-<time>-<pid>-<n>.tracemalloc.txt`: the source lines that allocated
+  the most memory during the call
+
+Profiling is configured with `configure_profiling` or the environment
+variables, which are read when a profiled function is first called. Invalid
+values are logged and disable profiling:
+
+- `CUMULUS_PROFILE`: comma separated profilers to run, "cprofile" and/or
+  "tracemalloc". Profiling is disabled if empty or unset
+- `CUMULUS_PROFILE_DIR`: the output directory, defaults to a
+  `cumulus-profiles` directory in the temporary directory
+- `CUMULUS_PROFILE_SAMPLE_RATE`: profile 1 in N calls of each function,
+  defaults to 1
+- `CUMULUS_PROFILE_TOP`: number of allocation sites to report, defaults to 25
+
+Profilers are process wide, so only one call is profiled at a time. Calls
+made while another call is being profiled, including nested calls, run
+without profiling.
+"""
+
+import functools
+import itertools
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+log = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "tracemalloc")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ProfilingConfig(NamedTuple):
+    profilers: frozenset
+    directory: Path
+    sample_rate: int
+    top: int
+
+
+def _make_config(
+    profilers: Iterable[str],
+    directory: Union[str, Path, None],
+    sample_rate: int,
+    top: int,
+) -> Optional[ProfilingConfig]:
+    profilers = frozenset(p.strip().lower() for p in profilers if p.strip())
+    unknown = profilers - set(PROFILERS)
+    if unknown:
+        raise ValueError(
+            f"Unknown profilers {sorted(unknown)}, choices are {list(PROFILERS)}",
+        )
+    if sample_rate < 1:
+        raise ValueError("sample_rate must be at least 1")
+
+    if not profilers:
+        return None
+
+    import tempfile
+
+    return ProfilingConfig(
+        profilers,
+        Path(directory or Path(tempfile.gettempdir()) / "cumulus-profiles"),
+        sample_rate,
+        top,
+    )
+
+
+def _config_from_env() -> Optional[ProfilingConfig]:
+    try:
+        return _make_config(
+            os.getenv("CUMULUS_PROFILE", "").split(","),
+            os.getenv("CUMULUS_PROFILE_DIR"),
+            int(os.getenv("CUMULUS_PROFILE_SAMPLE_RATE") or 1),
+            int(os.getenv("CUMULUS_PROFILE_TOP") or 25),
+        )
+    except ValueError as e:
+        # Profiling is a diagnostic aid and must never stop the code it
+        # observes from running
+        log.warning("Invalid profiling environment variables, profiling is disabled: %s", e)
+        return None
+
+
+def _load_config() -> Optional[ProfilingConfig]:
+    global _config
+
+    with _config_lock:
+        if _config is _UNSET:
+            _config = _config_from_env()
+        return _config
+
+
+_UNSET: Any = object()
+# Read from the environment on first use, so that invalid values can't fail
+# the import
+_config: Optional[ProfilingConfig] = _UNSET
+_config_lock = threading.Lock()
+# Held while a call is being profiled
+_profiling_lock = threading.Lock()
+_file_counter = itertools.count()
+
+
+def configure_profiling(
+    profilers: Iterable[str] = ("cprofile",),
+    *,
+    directory: Union[str, Path, None] = None,
+    sample_rate: int = 1,
+    top: int = 25,
+) -> Optional[ProfilingConfig]:
+    """Replace the profiling configuration read from the environment
+
+    :param profilers: the profilers to run, "cprofile" and/or "tracemalloc".
+        Profiling is disabled if empty
+    :param directory: the output directory
+    :param sample_rate: profile 1 in `sample_rate` calls of each function
+    :param top: number of allocation sites to report
+    :returns: Optional[ProfilingConfig] - the new configuration, None if
+        profiling is disabled
+    """
+    global _config
+
+    _config = _make_config(profilers, directory, sample_rate, top)
+    return _config
+
+
+def get_profiling_config() -> Optional[ProfilingConfig]:
+    config = _config
+    return _load_config() if config is _UNSET else config
+
+
+def profiled(func: F) -> F:
+    """Profile calls of a function when profiling is enabled
+
+    :param func: the function to profile
+    :returns: the wrapped function
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        config = _config
+        if config is _UNSET:
+            config = _load_config()
+        if config is None or next(calls) % config.sample_rate:
+            return func(*args, **kwargs)
+        if not _profiling_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+
+        try:
+            return _profile_call(config, name, func, args, kwargs)
+        finally:
+            _profiling_lock.release()
+
+    return wrapper
+
+
+def _profile_call(
+    config: ProfilingConfig,
+    name: str,
+    func: Callable,
+    args: tuple,
+    kwargs: dict,
+) -> Any:
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile() if "cprofile" in config.profilers else None
+    trace_memory = "tracemalloc" in config.profilers
+    # Leave tracemalloc running if it was started by someone else
+    stop_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+
+    before = None
+    if trace_memory:
+        if stop_tracemalloc:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+
+    start = time.perf_counter()
+    try:
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        duration = time.perf_counter() - start
+        after = tracemalloc.take_snapshot() if trace_memory else None
+        if stop_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            _write_results(config, name, duration, profiler, before, after)
+        except Exception:
+            # Profiling must not fail the call it observes
+            log.exception("Failed to write the profile of %s", name)
+
+
+def _write_results(
+    config: ProfilingConfig,
+    name: str,
+    duration: float,
+    profiler: Optional["cProfile.Profile"],
+    before: Optional["tracemalloc.Snapshot"],
+    after: Optional["tracemalloc.Snapshot"],
+) -> None:
+    import tracemalloc
+
+    config.directory.mkdir(parents=True, exist_ok=True)
+    timestamp = time.strftime("%Y%m%dT%H%M%S")
+    prefix = config.directory / f"{name}-{timestamp}-{os.getpid()}-{next(_file_counter)}"
+
+    if profiler is not None:
+        path = prefix.with_name(f"{prefix.name}.prof")
+        profiler.dump_stats(path)
+        log.info("Wrote cProfile stats of %s (%.3fs) to %s", name, duration, path)
+
+    if before is not None and after is not None:
+        path = prefix.with_name(f"{prefix.name}.tracemalloc.txt")
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        stats = after.filter_traces(filters).compare_to(
+            before.filter_traces(filters),
+            "lineno",
+        )
+        lines = [
+            f"# Top {config.top} allocation sites of {name} ({duration:.3f}s)",
+            *(str(stat) for stat in stats[:config.top]),
+        ]
+        path.write_text("\n".join(lines) + "\n")
+        log.info("Wrote allocation sites of %s to %s", name, path)
@@ -0,0 +1,182 @@
+"""Preparation of the work that can be done during the Lambda init phase.
+
+NOTE: This does not exist in cumulus. Creating boto3 clients, reading secrets,
+getting a Launchpad or Earthdata Login token and compiling the regexes and
+url_path templates of a collection otherwise happen during the first
+invocation. Calling `warmup` at module level of a Lambda handler moves that
+work into the init phase, where it runs in parallel.
+
+Launchpad tokens expire, so the CMR settings are not kept for later
+invocations. Handlers should get them with `get_cmr_settings` on every
+invocation. The token fetched during the warmup is stored in S3, so the
+first invocation reuses it without requesting a new one, and later
+invocations still check it against its `session_maxtimeout`.
+
+Example:
+>>> from cumulus_port import warmup
+>>> warmup(collection=collection, cmr_config=cmr_config)
+>>> def handler(event, context):
+...     cmr_client = CMR(**get_cmr_settings(cmr_config))
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+DEFAULT_AWS_SERVICES = ("s3", "secretsmanager")
+
+
+class WarmupStep(NamedTuple):
+    name: str
+    # Seconds taken by the step
+    duration: float
+    # Descriptions of what the step prepared
+    loaded: list[str]
+    error: Optional[BaseException] = None
+
+
+class WarmupReport(NamedTuple):
+    steps: list[WarmupStep]
+    # Seconds taken by all of the steps together
+    duration: float
+    # The CMR settings with a token, if a CMR config was given. The token is
+    # only valid at the time of the warmup
+    cmr_settings: Optional[dict] = None
+
+    @property
+    def ok(self) -> bool:
+        return all(step.error is None for step in self.steps)
+
+    def to_dict(self) -> dict:
+        return {
+            "duration": self.duration,
+            "steps": [
+                {
+                    "name": step.name,
+                    "duration": step.duration,
+                    "loaded": step.loaded,
+                    "error": None if step.error is None else repr(step.error),
+                }
+                for step in self.steps
+            ],
+        }
+
+
+def _warm_aws_clients(services: Sequence[str]) -> tuple[list[str], None]:
+    from cumulus_port.aws_client.services import aws_client
+
+    for service_name in services:
+        aws_client(service_name)
+
+    return [f"{service_name} client" for service_name in services], None
+
+
+def _warm_collection(collection: dict) -> tuple[list[str], None]:
+    from cumulus_port.ingest.compiled_collection import (
+        CompiledCollection,
+        get_compiled_collection,
+    )
+
+    compiled = get_compiled_collection(collection) or CompiledCollection(collection)
+    regexes = {file_spec.regex.pattern for file_spec in compiled.file_specs}
+    templates = set()
+    for file_spec in compiled.file_specs:
+        if not file_spec.url_path:
+            continue
+        try:
+            file_spec.template
+        except Exception:
+            # Left to fail when a file that uses it is moved
+            log.warning("Could not compile url_path template %r", file_spec.url_path, exc_info=True)
+            continue
+        templates.add(file_spec.url_path)
+
+    return [f"{len(regexes)} file regexes", f"{len(templates)} url_path templates"], None
+
+
+def _warm_cmr(cmr_config: dict) -> tuple[list[str], dict]:
+    from cumulus_port.cmr_client.cmr import CMR
+    from cumulus_port.cmrjs.cmr_utils import get_cmr_settings
+
+    # Launchpad tokens are stored in S3, where later calls of
+    # get_cmr_settings find them until they expire
+    settings = get_cmr_settings(cmr_config)
+    if settings.get("token"):
+        return [f"{settings['oauth_provider']} token"], settings
+
+    token = CMR(**settings).get_token()
+    return ["earthdata token"], {**settings, "token": token}
+
+
+def _run_step(name: str, func: Callable[[], tuple[list[str], Any]]) -> tuple[WarmupStep, Any]:
+    start = time.perf_counter()
+    try:
+        loaded, value = func()
+    except Exception as e:
+        log.warning("Warmup step %s failed", name, exc_info=True)
+        return WarmupStep(name, time.perf_counter() - start, [], e), None
+
+    return WarmupStep(name, time.perf_counter() - start, loaded), value
+
+
+def warmup(
+    *,
+    collection: Optional[dict] = None,
+    cmr_config: Optional[dict] = None,
+    aws_services: Sequence[str] = DEFAULT_AWS_SERVICES,
+    raise_errors: bool = False,
+) -> WarmupReport:
+    """Prepare the clients, secrets, tokens and compiled collection
+    configuration used by the first invocation, in parallel
+
+    Failed steps are logged and reported, their work is done again when it
+    is first needed.
+
+    :param collection: the collection whose file regexes and url_path
+        templates are compiled
+    :param cmr_config: the CMR configuration passed to `get_cmr_settings`.
+        The CMR settings and a token are prepared if provided
+    :param aws_services: the services to create memoized boto3 clients for
+    :param raise_errors: whether to raise the error of the first failed step
+    :returns: WarmupReport - the duration and outcome of every step
+    """
+    steps: dict[str, Callable[[], tuple[list[str], Any]]] = {}
+    if aws_services:
+        steps["aws_clients"] = lambda: _warm_aws_clients(aws_services)
+    if collection is not None:
+        steps["collection"] = lambda: _warm_collection(collection)
+    if cmr_config is not None:
+        steps["cmr"] = lambda: _warm_cmr(cmr_config)
+
+    start = time.perf_counter()
+    if steps:
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            results = dict(zip(
+                steps,
+                executor.map(lambda item: _run_step(*item), steps.items()),
+            ))
+    else:
+        results = {}
+
+    report = WarmupReport(
+        [step for step, _ in results.values()],
+        time.perf_counter() - start,
+        results["cmr"][1] if "cmr" in results else None,
+    )
+    for step in report.steps:
+        log.info(
+            "Warmup step %s took %.3fs%s",
+            step.name,
+            step.duration,
+            f": {', '.join(step.loaded)}" if step.error is None else " and failed",
+        )
+
+    if raise_errors:
+        for step in report.steps:
+            if step.error is not None:
+                raise step.error
+
+    return report
@@ -6,9 +6,14 @@ import logging
 import time
 from typing import Optional
 
-import boto3
-
-from cumulus_port.aws_client.s3 import s3_join, s3_object_exists
+from cumulus_port.aws_client import services
+from cumulus_port.aws_client.s3 import (
+    get_object,
+    s3_join,
+    s3_object_exists,
+    s3_put_object,
+)
+from cumulus_port.instrumentation import profiled
 
 from .launchpad_token import LaunchpadToken
 from .utils import get_env_var
@@ -35,13 +40,13 @@ def get_valid_launchpad_token_from_s3() -> Optional[str]:
     :returns: Optional[str] - the Launchpad token, None if token doesn't exist
         or invalid
     """
-    s3 = boto3.client("s3")
+    s3 = services.s3()
     s3location = launchpad_token_bucket_key()
     key_exists = s3_object_exists(s3, **s3location)
 
     token = None
     if key_exists:
-        s3object = s3.get_object(**s3location)
+        s3object = get_object(s3, **s3location)
         launchpad_token = json.load(s3object["Body"])
         now = time.time()
         token_expiration_in_sec = (
@@ -56,6 +61,7 @@ def get_valid_launchpad_token_from_s3() -> Optional[str]:
     return token
 
 
+@profiled
 def get_launchpad_token(*, api: str, passphrase: str, certificate: str) -> str:
     """Get a Launchpad token
 
@@ -81,8 +87,9 @@ def get_launchpad_token(*, api: str, passphrase: str, certificate: str) -> str:
         }
 
         s3location = launchpad_token_bucket_key()
-        s3 = boto3.client("s3")
-        s3.put_object(
+        s3 = services.s3()
+        s3_put_object(
+            s3,
             Bucket=s3location["Bucket"],
             Key=s3location["Key"],
             Body=json.dumps(token_object),
@@ -4,11 +4,9 @@
 import logging
 import urllib.parse
 
-import boto3
-import requests
-
-from cumulus_port._internal.pfx_to_pem import pfx_to_pem
-from cumulus_port.aws_client.s3 import s3_object_exists
+from cumulus_port.aws_client import services
+from cumulus_port.aws_client.s3 import get_object, s3_object_exists
+from cumulus_port.instrumentation import instrument
 
 from .utils import get_env_var
 
@@ -49,7 +47,7 @@ class LaunchpadToken:
         # crypto directory
         crypt_key = f"{stack_name}/crypto/{self.certificate}"
 
-        s3 = boto3.client("s3")
+        s3 = services.s3()
         key_exists = s3_object_exists(
             s3,
             Bucket=bucket,
@@ -69,7 +67,8 @@ class LaunchpadToken:
             stack_name,
         )
 
-        pfx_object = s3.get_object(
+        pfx_object = get_object(
+            s3,
             Bucket=bucket,
             Key=crypt_key,
         )
@@ -80,12 +79,18 @@ class LaunchpadToken:
 
         :returns: dict - the Launchpad gettoken response object
         """
+        import requests
+
+        from cumulus_port._internal.pfx_to_pem import pfx_to_pem
+
         log.debug("LaunchpadToken.requestToken")
         pfx = self.retrieve_certificate()
 
         with pfx_to_pem(pfx, self.passphrase) as cert:
             url = urllib.parse.urljoin(f"{self.api}/", "gettoken")
-            response = requests.get(url, cert=cert)
+            with instrument("launchpad.gettoken", url=url) as span:
+                response = requests.get(url, cert=cert)
+                span.record_response(response)
             response.raise_for_status()
             return response.json()
 
@@ -95,15 +100,21 @@ class LaunchpadToken:
         :param token: the Launchpad token for validation
         :returns: dict - the Launchpad validate token response object
         """
+        import requests
+
+        from cumulus_port._internal.pfx_to_pem import pfx_to_pem
+
         log.debug("LaunchpadToken.validateToken")
         pfx = self.retrieve_certificate()
 
         with pfx_to_pem(pfx, self.passphrase) as cert:
             url = urllib.parse.urljoin(f"{self.api}/", "validate")
-            response = requests.post(
-                url,
-                json={"token": token},
-                cert=cert,
-            )
+            with instrument("launchpad.validate", url=url) as span:
+                response = requests.post(
+                    url,
+                    json={"token": token},
+                    cert=cert,
+                )
+                span.record_response(response)
             response.raise_for_status()
             return response.json()
@@ -3,9 +3,16 @@
 
 import re
 from pathlib import Path
+from typing import Callable, Optional, Union
 
+from cumulus_port._internal.lazy_mapping import LazyMapping
+from cumulus_port.ingest.compiled_collection import get_compiled_collection
 from cumulus_port.ingest.granule import unversion_filename
-from cumulus_port.ingest.url_path_template import url_path_template
+from cumulus_port.ingest.url_path_template import (
+    get_template_root_fields,
+    url_path_template,
+)
+from cumulus_port.instrumentation import instrument, profiled
 
 
 def validate_match(
@@ -43,11 +50,34 @@ def validate_match(
         )
 
 
+def collection_uses_cmr_metadata(collection: dict) -> bool:
+    """Check whether any of the collection url_path templates reference the
+    granule's cmrMetadata.
+
+    NOTE: This does not exist in cumulus move-granules. It can be used to skip
+    fetching the UMM-G record for collections that will never use it.
+
+    :param collection: configuration object defining a collection of granules
+        and their files
+    :returns: bool - whether cmrMetadata is needed to move the files
+    """
+    templates = [
+        collection.get("url_path"),
+        *(file_spec.get("url_path") for file_spec in collection["files"]),
+    ]
+    return any(
+        "cmrMetadata" in get_template_root_fields(template)
+        for template in templates
+        if template
+    )
+
+
+@profiled
 def get_bucket_and_key_for_file(
     file: dict,
     granule: dict,
     collection: dict,
-    cmr_metadata: dict,
+    cmr_metadata: Union[dict, Callable[[], Optional[dict]]],
     buckets_config: dict,
 ) -> tuple[str, str]:
     """Get the bucket and key that MoveGranules will move a file to.
@@ -59,22 +89,32 @@ def get_bucket_and_key_for_file(
     :param file: a file entry from the granule object to match
     :param granule: a single entry from a cumulus granules list
     :param collection: configuration object defining a collection of granules
-        and their files
-    :param cmr_metadata: the UMM-G record associated with this granule
+        and their files. Collections with a name, version and updatedAt are
+        compiled once and cached, see `get_compiled_collection`
+    :param cmr_metadata: the UMM-G record associated with this granule, or a
+        function returning it. The function is only called if the url_path
+        template references cmrMetadata
     :param buckets_config: BucketsConfig instance associated with the stack
     :returns: str, str - bucket name and key where the file will be moved
     """
+    compiled = get_compiled_collection(collection)
     file_specs = collection["files"]
     file_name = Path(file["key"]).name
 
-    match = [
-        file
-        for file in file_specs
-        # NOTE: We ignore any differences in regex syntax between javascript
-        # and python. This could cause certain regexes to break or match
-        # incorrectly.
-        if re.search(file["regex"], unversion_filename(file_name))
-    ]
+    with instrument("granule.file_match", file_name=file_name):
+        if compiled is None:
+            compiled_match = None
+            match = [
+                file
+                for file in file_specs
+                # NOTE: We ignore any differences in regex syntax between
+                # javascript and python. This could cause certain regexes to
+                # break or match incorrectly.
+                if re.search(file["regex"], unversion_filename(file_name))
+            ]
+        else:
+            compiled_match = compiled.match_file(file_name)
+            match = [file_specs[file_spec.index] for file_spec in compiled_match]
     validate_match(match, buckets_config, file_name, file_specs)
     file_spec = match[0]
 
@@ -83,14 +123,20 @@ def get_bucket_and_key_for_file(
         or collection.get("url_path")
         or ""
     )
-    url_path = url_path_template(
-        url_path_template_string,
-        {
-            "file": file,
-            "granule": granule,
-            "cmrMetadata": cmr_metadata,
-        },
-    )
+    context = {
+        "file": file,
+        "granule": granule,
+    }
+    if callable(cmr_metadata):
+        context = LazyMapping(context, loaders={"cmrMetadata": cmr_metadata})
+    else:
+        context["cmrMetadata"] = cmr_metadata
+
+    with instrument("template.render", template=url_path_template_string):
+        if compiled_match is None:
+            url_path = url_path_template(url_path_template_string, context)
+        else:
+            url_path = compiled_match[0].render(context)
     bucket_name = buckets_config[file_spec["bucket"]]["name"]
     updated_key = url_path + file_name
 
@@ -15,6 +15,26 @@ def aws_credentials():
     os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
 
+@pytest.fixture(autouse=True)
+def aws_clients():
+    """Create new AWS clients in every test, inside of its moto mock"""
+    from cumulus_port.aws_client import services
+
+    services.clear_clients()
+    yield
+    services.clear_clients()
+
+
+@pytest.fixture(autouse=True)
+def compiled_collections():
+    """Start every test with an empty compiled collection cache"""
+    from cumulus_port.ingest import compiled_collection
+
+    compiled_collection.collection_cache.clear()
+    yield
+    compiled_collection.collection_cache.clear()
+
+
 @pytest.fixture
 def s3_client():
     with mock_aws():
@@ -83,3 +103,42 @@ def collection() -> dict:
         ],
         "sampleFileName": "SAMPLE_000000.nc",
     }
+
+
+@pytest.fixture
+def stub_server():
+    """A local CMR and Earthdata Login server with 250 granules and 5
+    collections of provider TEST
+    """
+    from .stub_server import StubServer, make_collections, make_granules
+
+    with StubServer(
+        granules=make_granules(250),
+        collections=make_collections(5),
+    ) as server:
+        yield server
+
+
+@pytest.fixture
+def stub_cmr(stub_server, monkeypatch):
+    """Send the CMR search and Earthdata Login requests to the stub server,
+    with a fresh throttle that retries quickly
+    """
+    from cumulus_port._internal import throttle
+
+    monkeypatch.setattr(
+        "cumulus_port.cmr_client.search_concept.get_search_url",
+        lambda **kwargs: f"{stub_server.url}/search/",
+    )
+    monkeypatch.setattr(
+        "cumulus_port.cmr_client.earthdata_login.get_edl_url",
+        lambda env: stub_server.url,
+    )
+    monkeypatch.setenv("CMR_ENVIRONMENT", "UAT")
+    monkeypatch.setattr(
+        throttle,
+        "_throttle",
+        throttle.Throttle(None, throttle.RetryPolicy(base_delay=0.01)),
+    )
+
+    return stub_server
@@ -0,0 +1,360 @@
+"""A local, threaded stand-in for the CMR search and Earthdata Login APIs.
+
+The server implements just enough of the real APIs to exercise paging
+(`cmr-hits`, `page_num`, `CMR-Search-After`), connection reuse and concurrency
+without network access. Latency and throttled responses can be injected.
+"""
+
+import base64
+import json
+import threading
+import time
+import urllib.parse
+import uuid
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple, Optional
+
+import jwt
+
+SEARCH_FORMATS = ("json", "umm_json", "echo10")
+
+
+class StubRequest(NamedTuple):
+    method: str
+    path: str
+    params: dict
+    headers: dict
+    # Client address and port, identifies the connection
+    client: tuple
+
+
+def make_granules(
+    count: int,
+    *,
+    provider: str = "TEST",
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc),
+    interval: timedelta = timedelta(hours=1),
+) -> list[dict]:
+    return [
+        {
+            "concept_id": f"G{i + 1:010d}-{provider}",
+            "revision_id": 1,
+            "provider": provider,
+            "granule_ur": f"granule-{i:06d}",
+            "short_name": "SAMPLE",
+            "time_start": start + interval * i,
+        }
+        for i in range(count)
+    ]
+
+
+def make_collections(count: int, *, provider: str = "TEST") -> list[dict]:
+    return [
+        {
+            "concept_id": f"C{i + 1:010d}-{provider}",
+            "revision_id": 1,
+            "provider": provider,
+            "short_name": f"COLLECTION-{i}",
+            "version": "1",
+        }
+        for i in range(count)
+    ]
+
+
+def _format_date(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class StubServer:
+    """Serve CMR searches over in memory records and EDL tokens for one user
+
+    Example:
+    >>> with StubServer(granules=make_granules(100)) as server:
+    ...     requests.get(f"{server.url}/search/granules.json")
+    """
+
+    def __init__(
+        self,
+        *,
+        granules: list[dict] = [],
+        collections: list[dict] = [],
+        username: str = "user",
+        password: str = "password",
+        latency: float = 0.0,
+    ):
+        self.granules = list(granules)
+        self.collections = list(collections)
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.requests: list[StubRequest] = []
+        self.tokens: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._throttled: list[tuple[int, Optional[str]]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def throttle(
+        self,
+        count: int = 1,
+        *,
+        status: int = 429,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        """Respond to the next `count` requests with `status`"""
+        with self._lock:
+            self._throttled.extend([(status, retry_after)] * count)
+
+    def issue_token(self, expires_in: timedelta = timedelta(days=60)) -> str:
+        expiration = datetime.now(timezone.utc) + expires_in
+        token = jwt.encode(
+            {
+                "uid": self.username,
+                "exp": int(expiration.timestamp()),
+                "jti": str(uuid.uuid4()),
+            },
+            "stub-server-secret-key-for-signing-tokens",
+            algorithm="HS256",
+        )
+        with self._lock:
+            self.tokens.append({
+                "access_token": token,
+                "token_type": "Bearer",
+                "expiration_date": expiration.strftime("%m/%d/%Y"),
+            })
+        return token
+
+    @property
+    def connections(self) -> set:
+        """The distinct client connections that requests were received on"""
+        return {request.client for request in self.requests}
+
+    def search_requests(self) -> list[StubRequest]:
+        return [r for r in self.requests if r.path.startswith("/search/")]
+
+    # Request handling
+
+    def _make_handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive so that connection reuse is observable
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._handle(self)
+
+            def do_POST(self):
+                stub._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        url = urllib.parse.urlsplit(handler.path)
+        params = urllib.parse.parse_qs(url.query)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        if handler.headers.get("Content-Type", "").startswith(
+            "application/x-www-form-urlencoded",
+        ):
+            for key, values in urllib.parse.parse_qs(body.decode()).items():
+                params.setdefault(key, []).extend(values)
+
+        with self._lock:
+            self.requests.append(StubRequest(
+                handler.command,
+                url.path,
+                params,
+                dict(handler.headers),
+                handler.client_address,
+            ))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            throttled = self._throttled.pop(0) if self._throttled else None
+
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+
+            if throttled is not None:
+                status, retry_after = throttled
+                headers = {"Retry-After": retry_after} if retry_after else {}
+                response = (status, headers, b"")
+            else:
+                response = self._route(handler, url.path, params)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        status, headers, data = response
+        handler.send_response(status)
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _route(self, handler, path: str, params: dict) -> tuple[int, dict, bytes]:
+        if path.startswith("/search/"):
+            type, _, format = path[len("/search/"):].partition(".")
+            if type in ("granules", "collections") and format in SEARCH_FORMATS:
+                return self._search(type, format, params, handler.headers)
+
+        if path.startswith("/api/users/"):
+            if not self._is_authorized(handler.headers.get("Authorization")):
+                return 401, {}, b'{"error": "invalid_credentials"}'
+            if path == "/api/users/tokens" and handler.command == "GET":
+                return self._json(200, self.tokens)
+            if path == "/api/users/token" and handler.command == "POST":
+                self.issue_token()
+                return self._json(200, self.tokens[-1])
+            if path == "/api/users/revoke_token" and handler.command == "POST":
+                token = params.get("token", [None])[0]
+                with self._lock:
+                    self.tokens = [t for t in self.tokens if t["access_token"] != token]
+                return self._json(200, {})
+
+        return 404, {}, b"Not Found"
+
+    def _is_authorized(self, authorization: Optional[str]) -> bool:
+        expected = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        return authorization == f"Basic {expected}"
+
+    def _json(self, status: int, body, headers: dict = {}) -> tuple[int, dict, bytes]:
+        return status, {"Content-Type": "application/json", **headers}, json.dumps(body).encode()
+
+    def _search(self, type: str, format: str, params: dict, headers) -> tuple[int, dict, bytes]:
+        records = self._filter(self.granules if type == "granules" else self.collections, params)
+        page_size = int(params.get("page_size", ["10"])[0])
+
+        search_after = headers.get("CMR-Search-After")
+        if search_after is not None:
+            offset = int(search_after)
+        else:
+            offset = (int(params.get("page_num", ["1"])[0]) - 1) * page_size
+
+        page = records[offset:offset + page_size] if page_size else []
+        response_headers = {"cmr-hits": str(len(records)), "CMR-Took": "1"}
+        if page and offset + len(page) < len(records):
+            response_headers["CMR-Search-After"] = str(offset + len(page))
+
+        if format == "echo10":
+            return (
+                200,
+                {**response_headers, "Content-Type": "application/echo10+xml"},
+                self._echo10(page, len(records)),
+            )
+        if format == "umm_json":
+            return self._json(200, {
+                "hits": len(records),
+                "took": 1,
+                "items": [self._umm(record) for record in page],
+            }, response_headers)
+        return self._json(200, {
+            "feed": {"entry": [self._json_entry(record) for record in page]},
+        }, response_headers)
+
+    def _filter(self, records: list[dict], params: dict) -> list[dict]:
+        provider = (params.get("provider_short_name") or params.get("provider") or [None])[0]
+        if provider is not None:
+            records = [r for r in records if r["provider"] == provider]
+        if "short_name" in params:
+            records = [r for r in records if r["short_name"] in params["short_name"]]
+        if "granule_ur[]" in params:
+            granule_urs = set(params["granule_ur[]"])
+            records = [r for r in records if r.get("granule_ur") in granule_urs]
+        if "concept_id[]" in params:
+            concept_ids = set(params["concept_id[]"])
+            records = [r for r in records if r["concept_id"] in concept_ids]
+        if "temporal" in params:
+            start, _, end = params["temporal"][0].partition(",")
+            records = [
+                r for r in records
+                if (not start or r["time_start"] >= _parse_date(start))
+                and (not end or r["time_start"] <= _parse_date(end))
+            ]
+        return records
+
+    def _json_entry(self, record: dict) -> dict:
+        entry = {
+            "id": record["concept_id"],
+            "data_center": record["provider"],
+            "short_name": record["short_name"],
+        }
+        if "granule_ur" in record:
+            entry["title"] = record["granule_ur"]
+            entry["time_start"] = _format_date(record["time_start"])
+        return entry
+
+    def _umm(self, record: dict) -> dict:
+        meta = {
+            "concept-id": record["concept_id"],
+            "revision-id": record["revision_id"],
+            "provider-id": record["provider"],
+        }
+        if "granule_ur" in record:
+            umm = {
+                "GranuleUR": record["granule_ur"],
+                "CollectionReference": {"ShortName": record["short_name"], "Version": "1"},
+                "TemporalExtent": {
+                    "SingleDateTime": _format_date(record["time_start"]),
+                },
+            }
+        else:
+            umm = {"ShortName": record["short_name"], "Version": record["version"]}
+        return {"meta": meta, "umm": umm}
+
+    def _echo10(self, records: list[dict], hits: int) -> bytes:
+        results = ET.Element("results")
+        ET.SubElement(results, "hits").text = str(hits)
+        ET.SubElement(results, "took").text = "1"
+        for record in records:
+            result = ET.SubElement(results, "result", {
+                "concept-id": record["concept_id"],
+                "revision-id": str(record["revision_id"]),
+            })
+            if "granule_ur" in record:
+                granule = ET.SubElement(result, "Granule")
+                ET.SubElement(granule, "GranuleUR").text = record["granule_ur"]
+            else:
+                collection = ET.SubElement(result, "Collection")
+                ET.SubElement(collection, "ShortName").text = record["short_name"]
+        return ET.tostring(results, xml_declaration=True, encoding="UTF-8")
@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pytest
+
+try:
+    from cumulus_port._internal.throttle import get_throttle
+    from cumulus_port.cmr_client.async_cmr import AsyncCMR
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+aiohttp = pytest.importorskip("aiohttp")
+
+
+def granule_urs(start, stop, step=1):
+    return [f"granule-{i:06d}" for i in range(start, stop, step)]
+
+
+@pytest.fixture
+def run(stub_cmr):
+    """Run a coroutine function with an AsyncCMR client of the stub server"""
+    def run(test, **kwargs):
+        async def main():
+            cmr_client = AsyncCMR(
+                provider="TEST",
+                client_id="unit-tests",
+                token="token",
+                oauth_provider="earthdata",
+                cmr_host=stub_cmr.url,
+                **kwargs,
+            )
+            async with cmr_client:
+                return await test(cmr_client)
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_search_granules(run, stub_cmr):
+    async def test(cmr_client):
+        return await cmr_client.search_granules({"page_size": "30"})
+
+    results = run(test)
+
+    assert [granule["title"] for granule in results] == granule_urs(0, 100)
+    requests = stub_cmr.search_requests()
+    assert sorted(request.params["page_num"][0] for request in requests) == ["1", "2", "3", "4"]
+    assert requests[0].params["provider_short_name"] == ["TEST"]
+    assert requests[0].headers["Client-Id"] == "unit-tests"
+    assert requests[0].headers["Authorization"] == "token"
+    # Connections are reused by the session
+    assert len(stub_cmr.connections) < len(stub_cmr.requests)
+
+
+def test_search_concept_limit(run):
+    async def test(cmr_client):
+        return await cmr_client.search_concept(
+            "granules",
+            {},
+            format="umm_json",
+            cmr_limit=6,
+            cmr_page_size=4,
+        )
+
+    results = run(test)
+
+    assert [granule["umm"]["GranuleUR"] for granule in results] == granule_urs(0, 6)
+
+
+def test_search_collections_echo10(run):
+    async def test(cmr_client):
+        return await cmr_client.search_collections(format="echo10")
+
+    assert run(test) == [
+        {"Collection": {"ShortName": f"COLLECTION-{i}"}} for i in range(5)
+    ]
+
+
+def test_search_granules_post(run, stub_cmr):
+    missing = [f"missing-granule-{i:05d}" for i in range(300)]
+
+    async def test(cmr_client):
+        return await cmr_client.search_granules({
+            "granule_ur[]": ["granule-000003", "granule-000007"] + missing,
+        })
+
+    results = run(test)
+
+    assert [granule["title"] for granule in results] == ["granule-000003", "granule-000007"]
+    assert stub_cmr.requests[0].method == "POST"
+
+
+def test_iter_search_concept(run, stub_cmr):
+    async def test(cmr_client):
+        return [
+            granule["title"]
+            async for granule in cmr_client.iter_search_concept(
+                "granules",
+                {},
+                cmr_limit=12,
+                cmr_page_size=5,
+            )
+        ]
+
+    assert run(test) == granule_urs(0, 12)
+    assert len(stub_cmr.search_requests()) == 3
+
+
+def test_iter_granules_break(run, stub_cmr):
+    async def test(cmr_client):
+        async for granule in cmr_client.iter_granules({"page_size": "5"}):
+            return granule["title"]
+
+    assert run(test) == "granule-000000"
+    assert len(stub_cmr.search_requests()) <= 2
+
+
+def test_concurrency(run, stub_cmr):
+    stub_cmr.latency = 0.05
+
+    async def test(cmr_client):
+        return await asyncio.gather(*(
+            cmr_client.search_concept("granules", {}, recursive=False, cmr_page_size=5)
+            for _ in range(9)
+        ))
+
+    start = time.monotonic()
+    results = run(test, max_concurrency=3)
+    elapsed = time.monotonic() - start
+
+    assert [[granule["title"] for granule in page] for page in results] == [granule_urs(0, 5)] * 9
+    # Limited by the semaphore, but overlapping
+    assert stub_cmr.max_in_flight == 3
+    assert elapsed < 9 * 0.05
+
+
+def test_retries_throttled(run, stub_cmr):
+    stub_cmr.throttle(2, retry_after="0")
+
+    async def test(cmr_client):
+        return await cmr_client.search_concept("granules", {}, recursive=False)
+
+    # Default page size of 50
+    assert len(run(test)) == 50
+    assert len(stub_cmr.requests) == 3
+    assert get_throttle().stats()["retriesByStatus"] == {429: 2}
+
+
+def test_get_token(stub_cmr):
+    cmr_client = AsyncCMR(
+        provider="TEST",
+        client_id="unit-tests",
+        username="user",
+        password="password",
+        oauth_provider="earthdata",
+    )
+
+    async def test():
+        return await asyncio.gather(*(cmr_client.get_token() for _ in range(5)))
+
+    assert asyncio.run(test()) == [stub_cmr.tokens[0]["access_token"]] * 5
+    # One lookup of existing tokens and one token creation
+    assert len(stub_cmr.requests) == 2
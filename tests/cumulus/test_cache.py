@@ -0,0 +1,26 @@
+from cumulus_port._internal.cache import LRUCache
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_ttl():
+    now = 0
+    cache = LRUCache(ttl=10, timer=lambda: now)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    now = 10
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    assert len(cache) == 0
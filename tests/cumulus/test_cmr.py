@@ -4,9 +4,10 @@ from moto import mock_aws
 try:
     import boto3
 
+    from cumulus_port._internal.cache import LRUCache
     from cumulus_port.cmr_client import CMR
     from cumulus_port.cmr_client.cmr import update_token
-    from cumulus_port.errors import MissingRequiredEnvVarError
+    from cumulus_port.errors import CMRInternalError, MissingRequiredEnvVarError
 except ImportError:
     pass
 
@@ -124,9 +125,56 @@ def test_search_concept(mocker):
         },
         format="json",
         recursive=True,
+        cache=None,
+        fields=None,
     )
 
 
+def test_search_concept_chunked(mocker, monkeypatch):
+    monkeypatch.delenv("CMR_LIMIT", raising=False)
+    cmr_client = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="the-token",
+    )
+    mock_search_concept = mocker.patch(
+        "cumulus_port.cmr_client.cmr.search_concept",
+    )
+    mock_search_concept_chunked = mocker.patch(
+        "cumulus_port.cmr_client.cmr.search_concept_chunked",
+        return_value=[{"foo": "bar"}],
+    )
+    granule_urs = [f"granule-{i}" for i in range(101)]
+
+    assert cmr_client.search_concept(
+        "granules",
+        {"granule_ur[]": granule_urs},
+    ) == [{"foo": "bar"}]
+    mock_search_concept.assert_not_called()
+    mock_search_concept_chunked.assert_called_once_with(
+        type="granules",
+        search_params={"granule_ur[]": granule_urs},
+        headers={
+            "Client-Id": "unit-test-client-id",
+            "Authorization": "the-token",
+        },
+        format="json",
+        cmr_limit=100,
+        fields=None,
+    )
+
+    # Values of other list params and of AND-ed params can't be split
+    mock_search_concept_chunked.reset_mock()
+    cmr_client.search_concept("granules", {"attribute[]": granule_urs})
+    cmr_client.search_concept(
+        "granules",
+        {"granule_ur[]": granule_urs, "options[granule_ur][and]": "true"},
+    )
+    mock_search_concept_chunked.assert_not_called()
+    assert mock_search_concept.call_count == 2
+
+
 def test_search_collections(mocker):
     cmr_client = CMR(
         provider="TEST",
@@ -155,6 +203,8 @@ def test_search_collections(mocker):
         },
         format="umm_json",
         recursive=True,
+        cache=None,
+        fields=None,
     )
 
 
@@ -186,4 +236,282 @@ def test_search_granules(mocker):
         },
         format="umm_json",
         recursive=True,
+        cache=None,
+        fields=None,
+    )
+
+
+def test_search_granules_sharded(mocker):
+    cmr_client = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="the-token",
+    )
+    mock_search_concept_sharded = mocker.patch(
+        "cumulus_port.cmr_client.cmr.search_concept_sharded",
+        return_value=[{"foo": "bar"}],
+    )
+
+    assert cmr_client.search_granules(
+        {"temporal": "2024-01-01T00:00:00Z,"},
+        shards=8,
+    ) == [{"foo": "bar"}]
+    mock_search_concept_sharded.assert_called_once_with(
+        type="granules",
+        search_params={
+            "provider_short_name": "TEST",
+            "temporal": "2024-01-01T00:00:00Z,",
+        },
+        headers={
+            "Client-Id": "unit-test-client-id",
+            "Authorization": "the-token",
+        },
+        format="json",
+        max_shards=8,
+        fields=None,
+    )
+
+
+def test_get_write_headers():
+    cmr_client = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+    )
+    assert cmr_client.get_write_headers() == {
+        "Client-Id": "unit-test-client-id",
+        "Content-type": "application/echo10+xml",
+    }
+    assert cmr_client.get_write_headers(
+        token="the-token",
+        ummg_version="1.6.6",
+        cmr_revision_id="5",
+    ) == {
+        "Client-Id": "unit-test-client-id",
+        "Content-type": "application/vnd.nasa.cmr.umm+json;version=1.6.6",
+        "Authorization": "the-token",
+        "Accept": "application/json",
+        "Cmr-Revision-Id": "5",
+    }
+
+
+def test_delete_granule(mocker):
+    cmr_client = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="the-token",
+    )
+    mock_delete_concept = mocker.patch(
+        "cumulus_port.cmr_client.cmr.delete_concept",
+    )
+
+    cmr_client.delete_granule("granule-1")
+    mock_delete_concept.assert_called_once_with(
+        type="granules",
+        identifier="granule-1",
+        provider="TEST",
+        headers={
+            "Client-Id": "unit-test-client-id",
+            "Content-type": "application/echo10+xml",
+            "Authorization": "the-token",
+        },
+    )
+
+
+def test_delete_granules(mocker):
+    cmr_client = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="the-token",
+    )
+    error = CMRInternalError("Failed to delete, statusCode: 500")
+
+    def delete_concept(*, identifier, **kwargs):
+        if identifier == "granule-failed":
+            raise error
+        return mocker.Mock(
+            status_code=404 if identifier == "granule-missing" else 200,
+        )
+
+    mocker.patch(
+        "cumulus_port.cmr_client.cmr.delete_concept",
+        side_effect=delete_concept,
+    )
+    mock_get_token = mocker.spy(cmr_client, "get_token")
+
+    assert cmr_client.delete_granules(
+        ["granule-1", "granule-missing", "granule-failed", "granule-2"],
+        max_workers=2,
+    ) == [
+        {"granuleUr": "granule-1", "status": "deleted", "error": None},
+        {"granuleUr": "granule-missing", "status": "not_found", "error": None},
+        {"granuleUr": "granule-failed", "status": "failed", "error": error},
+        {"granuleUr": "granule-2", "status": "deleted", "error": None},
+    ]
+    mock_get_token.assert_called_once_with()
+
+
+@pytest.fixture
+def cmr_client():
+    cmr_client = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="the-token",
+    )
+    cmr_client.granule_metadata_cache = LRUCache()
+    return cmr_client
+
+
+def test_get_granule_metadata(cmr_client, mocker):
+    mock_get_concept_metadata = mocker.patch(
+        "cumulus_port.cmr_client.cmr.get_concept_metadata",
+        return_value={"id": "G1-TEST"},
+    )
+    link = "https://cmr.test/search/granules.json?concept_id=G1-TEST"
+
+    assert cmr_client.get_granule_metadata(link) == {"id": "G1-TEST"}
+    assert cmr_client.get_granule_metadata(link) == {"id": "G1-TEST"}
+    mock_get_concept_metadata.assert_called_once_with(
+        link,
+        {
+            "Client-Id": "unit-test-client-id",
+            "Authorization": "the-token",
+        },
+    )
+
+
+def test_get_granule_metadata_not_found(cmr_client, mocker):
+    mock_get_concept_metadata = mocker.patch(
+        "cumulus_port.cmr_client.cmr.get_concept_metadata",
+        return_value=None,
+    )
+    link = "https://cmr.test/search/granules.json?concept_id=G1-TEST"
+
+    assert cmr_client.get_granule_metadata(link) is None
+    assert cmr_client.get_granule_metadata(link) is None
+    assert mock_get_concept_metadata.call_count == 2
+
+
+def test_get_granules_metadata(cmr_client, mocker):
+    def make_item(concept_id):
+        return {
+            "meta": {"concept-id": concept_id, "revision-id": 1},
+            "umm": {"GranuleUR": concept_id},
+        }
+
+    mock_search_concept = mocker.patch(
+        "cumulus_port.cmr_client.search_concept.search_concept",
+        side_effect=lambda search_params, **kwargs: [
+            make_item(concept_id)
+            for concept_id in search_params["concept_id[]"]
+            if concept_id != "G4-TEST"
+        ],
+    )
+    mock_get_concept_metadata = mocker.patch(
+        "cumulus_port.cmr_client.cmr.get_concept_metadata",
+        side_effect=lambda link, headers: {"link": link},
+    )
+    cmr_client.granule_metadata_cache.set(
+        ("G2-TEST", None, "umm_json"),
+        make_item("G2-TEST"),
+    )
+
+    links = [
+        "https://cmr.test/search/granules.umm_json?concept_id=G1-TEST",
+        "https://cmr.test/search/concepts/G2-TEST.umm_json",
+        "https://cmr.test/search/concepts/G3-TEST.umm_json",
+        "https://cmr.test/search/concepts/G4-TEST.umm_json",
+        "https://cmr.test/search/concepts/G5-TEST/2.umm_json",
+        "https://cmr.test/search/granules.json?concept_id=G1-TEST",
+    ]
+    assert cmr_client.get_granules_metadata(links, chunk_size=1) == [
+        make_item("G1-TEST"),
+        make_item("G2-TEST"),
+        make_item("G3-TEST"),
+        None,
+        {"link": links[4]},
+        {"link": links[5]},
+    ]
+    assert mock_search_concept.call_count == 3
+    headers = {
+        "Client-Id": "unit-test-client-id",
+        "Authorization": "the-token",
+    }
+    assert mock_get_concept_metadata.call_args_list == [
+        mocker.call(links[4], headers),
+        mocker.call(links[5], headers),
+    ]
+
+    mock_search_concept.reset_mock()
+    assert cmr_client.get_granules_metadata(links[:3]) == [
+        make_item("G1-TEST"),
+        make_item("G2-TEST"),
+        make_item("G3-TEST"),
+    ]
+    mock_search_concept.assert_not_called()
+
+
+def test_granule_metadata_cache_per_client(cmr_client):
+    cache = LRUCache()
+    other = CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="other-token",
+    )
+
+    assert other.granule_metadata_cache is not cmr_client.granule_metadata_cache
+    assert CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        granule_metadata_cache=cache,
+    ).granule_metadata_cache is cache
+
+
+def test_search_concept_to_file(cmr_client, mocker, tmp_path):
+    mock_search_concept_to_file = mocker.patch(
+        "cumulus_port.cmr_client.cmr.search_concept_to_file",
+    )
+
+    assert cmr_client.search_concept_to_file(
+        "granules",
+        {"a": "b"},
+        tmp_path / "results.ndjson",
+        compress=True,
+    ) is mock_search_concept_to_file.return_value
+    mock_search_concept_to_file.assert_called_once_with(
+        type="granules",
+        search_params={"a": "b"},
+        path=tmp_path / "results.ndjson",
+        headers={
+            "Client-Id": "unit-test-client-id",
+            "Authorization": "the-token",
+        },
+        format="json",
+        compress=True,
+        cmr_limit=None,
+    )
+
+
+def test_search_concept_to_file_unlimited(cmr_client, stub_cmr, monkeypatch, tmp_path):
+    monkeypatch.setenv("CMR_LIMIT", "100")
+
+    results = cmr_client.search_concept_to_file(
+        "granules",
+        {"provider_short_name": "TEST"},
+        tmp_path / "results.ndjson",
+    )
+    assert len(results) == 250
+
+    results = cmr_client.search_concept_to_file(
+        "granules",
+        {"provider_short_name": "TEST"},
+        tmp_path / "limited.ndjson",
+        cmr_limit=120,
     )
+    assert len(results) == 120
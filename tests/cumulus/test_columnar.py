@@ -0,0 +1,122 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+try:
+    from cumulus_port.cmr_client.columnar import (
+        GRANULE_COLUMNS,
+        UMM_GRANULE_COLUMNS,
+        ColumnarCollector,
+        search_concept_columnar,
+        sum_by_period,
+    )
+    from cumulus_port.cmr_client.search_concept import SearchPage
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+def test_columnar_collector():
+    collector = ColumnarCollector(GRANULE_COLUMNS)
+    collector.add_page([
+        {
+            "granule_size": "1.5",
+            "time_start": "2024-01-01T10:00:00.000Z",
+            "time_end": "2024-01-01T10:00:30.000Z",
+            "updated": "2024-01-02T00:00:00+01:00",
+        },
+        {"granule_size": "not a number", "time_start": "not a date"},
+    ])
+    collector.add_page([])
+    collector.add_page([{"granule_size": 2, "time_start": "2024-01-03T00:00:00Z"}])
+
+    columns = collector.to_arrays()
+
+    assert list(columns) == ["size", "time_start", "time_end", "updated"]
+    np.testing.assert_array_equal(columns["size"], [1.5, np.nan, 2.0])
+    np.testing.assert_array_equal(
+        columns["time_start"],
+        np.array(
+            ["2024-01-01T10:00:00", "NaT", "2024-01-03T00:00:00"],
+            dtype="datetime64[ms]",
+        ),
+    )
+    assert columns["updated"][0] == np.datetime64("2024-01-01T23:00:00")
+    assert np.isnat(columns["time_end"][1:]).all()
+
+
+def test_columnar_collector_empty():
+    columns = ColumnarCollector({"count": ("count", "int")}).to_arrays()
+
+    assert columns["count"].dtype == np.int64
+    assert len(columns["count"]) == 0
+
+
+def test_columnar_collector_invalid_kind():
+    with pytest.raises(ValueError, match="Invalid kind 'str' for column 'name'"):
+        ColumnarCollector({"name": ("title", "str")})
+
+
+def test_search_concept_columnar(mocker):
+    def item(i):
+        return {
+            "meta": {"revision-date": f"2024-02-0{i}T00:00:00.000Z"},
+            "umm": {
+                "DataGranule": {
+                    "ArchiveAndDistributionInformation": [{"Size": i * 10}],
+                },
+                "TemporalExtent": {
+                    "RangeDateTime": {
+                        "BeginningDateTime": f"2024-01-0{i}T00:00:00.000Z",
+                    },
+                },
+            },
+        }
+
+    mocker.patch(
+        "cumulus_port.cmr_client.columnar.search_concept_pages",
+        return_value=iter([
+            SearchPage([item(1), item(2)], 3, "after-1"),
+            SearchPage([item(3)], 3, None),
+        ]),
+    )
+
+    columns = search_concept_columnar(
+        type="granules",
+        search_params={},
+        columns=UMM_GRANULE_COLUMNS,
+        format="umm_json",
+        cmr_limit=2,
+    )
+
+    np.testing.assert_array_equal(columns["size"], [10.0, 20.0])
+    assert columns["updated"][1] == np.datetime64("2024-02-02")
+
+
+def test_sum_by_period():
+    times = np.array(
+        [
+            "2024-01-01T01:00:00",
+            "2024-01-01T23:00:00",
+            "NaT",
+            "2024-03-05T00:00:00",
+            "2024-03-06T00:00:00",
+        ],
+        dtype="datetime64[ms]",
+    )
+    values = np.array([1.0, 2.0, 4.0, 8.0, np.nan])
+
+    periods, sums = sum_by_period(times, values)
+    np.testing.assert_array_equal(
+        periods,
+        np.array(["2024-01-01", "2024-03-05"], dtype="datetime64[D]"),
+    )
+    np.testing.assert_array_equal(sums, [3.0, 8.0])
+
+    periods, sums = sum_by_period(times, values, unit="M")
+    np.testing.assert_array_equal(
+        periods,
+        np.array(["2024-01", "2024-03"], dtype="datetime64[M]"),
+    )
+    np.testing.assert_array_equal(sums, [3.0, 8.0])
@@ -0,0 +1,129 @@
+import re
+
+import pytest
+
+from cumulus_port.ingest import compiled_collection
+from cumulus_port.ingest.compiled_collection import (
+    CompiledCollection,
+    get_compiled_collection,
+)
+
+
+def test_compiled_collection(collection):
+    compiled = CompiledCollection(collection)
+
+    assert (compiled.name, compiled.version, compiled.updated_at) == (
+        "SAMPLE-COLLECTION",
+        "1",
+        1728584062910,
+    )
+    assert [file_spec.index for file_spec in compiled.file_specs] == [0, 1]
+    assert [file_spec.url_path for file_spec in compiled.file_specs] == [
+        "products/{granule.granuleId}/",
+        "default/{granule.granuleId}/",
+    ]
+
+
+def test_compiled_collection_lazy(collection):
+    # Invalid templates and granule id regexes only fail when they are used
+    collection["files"][1]["url_path"] = "{doStuff(file.source)}/"
+    collection["granuleIdExtraction"] = "(?<name>x)"
+
+    compiled = CompiledCollection(collection)
+
+    assert compiled.file_specs[0].render({"granule": {"granuleId": "G1"}}) == "products/G1/"
+    with pytest.raises(Exception, match="Could not support operation doStuff"):
+        compiled.file_specs[1].render({})
+    with pytest.raises(re.error):
+        compiled.extract_granule_id("SAMPLE_123456.nc")
+
+
+def test_match_file(collection):
+    compiled = CompiledCollection(collection)
+
+    match, = compiled.match_file("SAMPLE_123456.nc")
+    assert match.index == 0
+    match, = compiled.match_file("SAMPLE_123456.png.v20240101T000000000")
+    assert match.index == 1
+    assert compiled.match_file("OTHER_123456.nc") == []
+
+
+def test_extract_granule_id(collection):
+    compiled = CompiledCollection(collection)
+
+    assert compiled.extract_granule_id("SAMPLE_123456.nc") == "SAMPLE_123456"
+    assert compiled.extract_granule_id("SAMPLE_123456.png") is None
+
+    collection["granuleIdExtraction"] = "SAMPLE_[0-9]+"
+    assert CompiledCollection(collection).extract_granule_id("SAMPLE_123456.png") == "SAMPLE_123456"
+
+    del collection["granuleIdExtraction"]
+    assert CompiledCollection(collection).extract_granule_id("SAMPLE_123456.nc") is None
+
+
+def test_get_compiled_collection_cached(collection):
+    compiled = get_compiled_collection(collection)
+
+    assert get_compiled_collection(collection) is compiled
+    assert get_compiled_collection(dict(collection)) is compiled
+    assert compiled_collection.collection_cache.get(("SAMPLE-COLLECTION", "1")) is compiled
+
+
+def test_get_compiled_collection_updated(collection):
+    compiled = get_compiled_collection(collection)
+
+    collection["updatedAt"] += 1
+    updated = get_compiled_collection(collection)
+    assert updated is not compiled
+    assert get_compiled_collection(collection) is updated
+    assert len(compiled_collection.collection_cache) == 1
+
+
+def test_get_compiled_collection_edited(collection):
+    compiled = get_compiled_collection(collection)
+
+    # Edits that don't change the compiled collection keep it
+    collection["files"][0]["bucket"] = "private"
+    collection["files"][0] = dict(collection["files"][0])
+    assert get_compiled_collection(collection) is compiled
+
+    collection["files"][0]["url_path"] = "{cmrMetadata.GranuleUR}/"
+    edited = get_compiled_collection(collection)
+    assert edited is not compiled
+    assert edited.file_specs[0].url_path == "{cmrMetadata.GranuleUR}/"
+
+    collection["files"].append({"regex": "^extra$", "bucket": "private"})
+    assert len(get_compiled_collection(collection).file_specs) == 3
+
+
+@pytest.mark.parametrize("field", ["name", "version", "updatedAt"])
+def test_get_compiled_collection_not_cached(collection, field):
+    del collection[field]
+
+    assert get_compiled_collection(collection) is None
+    assert len(compiled_collection.collection_cache) == 0
+
+
+def test_get_compiled_collection_eviction(collection, monkeypatch):
+    monkeypatch.setattr(compiled_collection.collection_cache, "maxsize", 2)
+
+    compiled = [
+        get_compiled_collection({**collection, "version": str(version)})
+        for version in range(3)
+    ]
+
+    assert len(compiled_collection.collection_cache) == 2
+    assert get_compiled_collection({**collection, "version": "0"}) is not compiled[0]
+    assert get_compiled_collection({**collection, "version": "2"}) is compiled[2]
+
+
+def test_unversion_filenames(collection):
+    result = CompiledCollection(collection).unversion_filenames([
+        "SAMPLE_123456.nc",
+        "SAMPLE_123456.nc.v20240101T000000000",
+        "SAMPLE_123456.png",
+    ])
+
+    assert result.names == ["SAMPLE_123456.nc", "SAMPLE_123456.nc", "SAMPLE_123456.png"]
+    assert result.renamed == [False, True, False]
+    assert result.granule_ids == ["SAMPLE_123456", "SAMPLE_123456", None]
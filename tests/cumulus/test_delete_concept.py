@@ -0,0 +1,69 @@
+import pytest
+
+try:
+    from cumulus_port.cmr_client.delete_concept import delete_concept
+    from cumulus_port.errors import CMRInternalError
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+@pytest.fixture
+def mock_delete(mocker):
+    mocker.patch(
+        "cumulus_port.cmr_client.delete_concept.get_ingest_url",
+        return_value="https://cmr.test/ingest/providers/TEST/",
+    )
+    return mocker.patch("requests.delete")
+
+
+def test_delete_concept(mock_delete):
+    mock_delete.return_value.status_code = 200
+
+    response = delete_concept(
+        type="granules",
+        identifier="granule-1",
+        provider="TEST",
+        headers={"Client-Id": "unit-tests"},
+    )
+
+    assert response is mock_delete.return_value
+    mock_delete.assert_called_once_with(
+        "https://cmr.test/ingest/providers/TEST/granules/granule-1",
+        headers={"Client-Id": "unit-tests"},
+    )
+
+
+def test_delete_concept_not_found(mock_delete):
+    mock_delete.return_value.status_code = 404
+    mock_delete.return_value.text = (
+        "<errors><error>Concept with native-id [granule-1] and concept-id "
+        "[G1-TEST] is already deleted.</error></errors>"
+    )
+
+    response = delete_concept(
+        type="granules",
+        identifier="granule-1",
+        provider="TEST",
+        headers={},
+    )
+
+    assert response.status_code == 404
+
+
+def test_delete_concept_error(mock_delete):
+    mock_delete.return_value.status_code = 500
+    mock_delete.return_value.reason = "Internal Server Error"
+    mock_delete.return_value.text = "<errors><error>Oops</error></errors>"
+
+    with pytest.raises(
+        CMRInternalError,
+        match=r"statusCode: 500, statusMessage: Internal Server Error, CMR error message: \['Oops'\]",
+    ):
+        delete_concept(
+            type="granules",
+            identifier="granule-1",
+            provider="TEST",
+            headers={},
+        )
@@ -0,0 +1,73 @@
+import pytest
+
+try:
+    from cumulus_port.cmr_client.echo10 import iter_echo10_results
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+RESULTS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<results>
+  <hits>2</hits>
+  <took>10</took>
+  <result concept-id="G1-TEST" revision-id="1" format="application/echo10+xml">
+    <Granule>
+      <GranuleUR>granule-1</GranuleUR>
+      <OnlineAccessURLs>
+        <OnlineAccessURL><URL>https://example.com/granule-1.zip</URL></OnlineAccessURL>
+        <OnlineAccessURL><URL>https://example.com/granule-1.iso.xml</URL></OnlineAccessURL>
+      </OnlineAccessURLs>
+      <Orderable>true</Orderable>
+      <Empty/>
+    </Granule>
+  </result>
+  <result concept-id="G2-TEST" revision-id="1" format="application/echo10+xml">
+    <Granule>
+      <GranuleUR>granule-2</GranuleUR>
+    </Granule>
+  </result>
+</results>
+"""
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(RESULTS)])
+def test_iter_echo10_results(chunk_size):
+    assert list(iter_echo10_results(chunked(RESULTS, chunk_size))) == [
+        {
+            "Granule": {
+                "GranuleUR": "granule-1",
+                "OnlineAccessURLs": {
+                    "OnlineAccessURL": [
+                        {"URL": "https://example.com/granule-1.zip"},
+                        {"URL": "https://example.com/granule-1.iso.xml"},
+                    ],
+                },
+                "Orderable": "true",
+                "Empty": "",
+            },
+        },
+        {"Granule": {"GranuleUR": "granule-2"}},
+    ]
+
+
+def test_iter_echo10_results_lazy():
+    chunks = iter(chunked(RESULTS, 16))
+    results = iter_echo10_results(chunks)
+
+    assert next(results)["Granule"]["GranuleUR"] == "granule-1"
+    # The second record has not been read yet
+    assert next(chunks, None) is not None
+
+
+def test_iter_echo10_results_empty():
+    assert list(iter_echo10_results([b"<results><hits>0</hits></results>"])) == []
+
+
+def test_iter_echo10_results_invalid():
+    with pytest.raises(SyntaxError):
+        list(iter_echo10_results([b"<results><result>"]))
@@ -0,0 +1,46 @@
+import pytest
+
+try:
+    from cumulus_port.cmr_client.get_concept_metadata import (
+        get_concept_metadata,
+        parse_concept_link,
+    )
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+def test_parse_concept_link():
+    assert parse_concept_link(
+        "https://cmr.test/search/granules.json?concept_id=G1-TEST",
+    ) == ("G1-TEST", None, "json")
+    assert parse_concept_link(
+        "https://cmr.test/search/granules.umm_json?concept_id[]=G1-TEST&revision_id=3",
+    ) == ("G1-TEST", "3", "umm_json")
+    assert parse_concept_link(
+        "https://cmr.test/search/concepts/G1-TEST",
+    ) == ("G1-TEST", None, "json")
+    assert parse_concept_link(
+        "https://cmr.test/search/concepts/G1-TEST/3.umm_json",
+    ) == ("G1-TEST", "3", "umm_json")
+    assert parse_concept_link(
+        "https://cmr.test/search/granules.json?provider=TEST",
+    ) == (None, None, "json")
+
+
+def test_get_concept_metadata(mocker):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {
+        "feed": {"entry": [{"id": "G1-TEST"}]},
+    }
+    assert get_concept_metadata("https://cmr.test/link", {}) == {
+        "id": "G1-TEST",
+    }
+
+    mock_get.return_value.json.return_value = {"items": []}
+    assert get_concept_metadata("https://cmr.test/link", {}) is None
+
+    mock_get.return_value.status_code = 404
+    assert get_concept_metadata("https://cmr.test/link", {}) is None
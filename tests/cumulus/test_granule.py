@@ -1,4 +1,13 @@
-from cumulus_port.ingest.granule import unversion_filename
+import re
+
+import pytest
+
+from cumulus_port.ingest.granule import (
+    extract_granule_id,
+    is_file_renamed,
+    unversion_filename,
+    unversion_filenames,
+)
 
 
 def test_unversion_filename_noop():
@@ -27,3 +36,63 @@ def test_unversion_filename():
     assert unversion_filename(
         "foobar.txt.v99991231T235959999",
     ) == "foobar.txt"
+
+
+def test_extract_granule_id():
+    assert extract_granule_id("SAMPLE_1.nc", "(SAMPLE_[0-9]+)\\..*") == "SAMPLE_1"
+    assert extract_granule_id("SAMPLE_1.nc", re.compile("SAMPLE_[0-9]+")) == "SAMPLE_1"
+    assert extract_granule_id("OTHER_1.nc", "(SAMPLE_[0-9]+)\\..*") is None
+
+
+def test_unversion_filenames():
+    filenames = [
+        "SAMPLE_1.nc",
+        "SAMPLE_1.nc.v20241208T001155999",
+        "SAMPLE_2.nc.v20241208T001155999",
+        "SAMPLE_1.nc",
+        "foobar.txt.v99999999T999999999",
+        "OTHER_1.nc",
+    ]
+
+    result = unversion_filenames(filenames, granule_id_extraction="(SAMPLE_[0-9]+)\\..*")
+
+    assert result.names == [unversion_filename(filename) for filename in filenames]
+    assert result.renamed == [is_file_renamed(filename) for filename in filenames]
+    assert result.granule_ids == ["SAMPLE_1", "SAMPLE_1", "SAMPLE_2", "SAMPLE_1", None, None]
+
+
+def test_unversion_filenames_no_extraction():
+    result = unversion_filenames(iter(["SAMPLE_1.nc.v20241208T001155999"]))
+
+    assert result == (["SAMPLE_1.nc"], [True], [None])
+
+
+def test_unversion_filenames_empty():
+    assert unversion_filenames([]) == ([], [], [])
+
+
+def test_unversion_filenames_newline():
+    filenames = [
+        "foo\nbar.txt.v20241208T001155999",
+        "foobar.txt.v20241208T001155999\n",
+        "foo.v20241208T001155999\nbar.txt",
+    ]
+
+    result = unversion_filenames(filenames)
+
+    assert result.names == [unversion_filename(filename) for filename in filenames]
+    assert result.renamed == [True, True, False]
+
+
+def test_unversion_filenames_numpy():
+    np = pytest.importorskip("numpy")
+
+    result = unversion_filenames(
+        np.array(["SAMPLE_1.nc", "SAMPLE_1.nc.v20241208T001155999"]),
+        granule_id_extraction="(SAMPLE_[0-9]+)",
+    )
+
+    assert result.names == ["SAMPLE_1.nc", "SAMPLE_1.nc"]
+    assert all(isinstance(name, str) for name in result.names)
+    assert result.renamed == [False, True]
+    assert result.granule_ids == ["SAMPLE_1", "SAMPLE_1"]
@@ -0,0 +1,185 @@
+import json
+
+import pytest
+
+try:
+    import requests
+
+    from cumulus_port.cmr_client import CMR
+    from cumulus_port.cmr_client.harvest import harvest_concept, load_harvest_state
+    from cumulus_port.cmr_client.search_concept import SearchPage
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+@pytest.fixture
+def cmr_client():
+    return CMR(
+        provider="TEST",
+        client_id="unit-test-client-id",
+        oauth_provider="earthdata",
+        token="the-token",
+    )
+
+
+@pytest.fixture
+def mock_search_concept_pages(mocker):
+    pages = [
+        SearchPage([{"id": "G1-TEST"}, {"id": "G2-TEST"}], 3, "after-1"),
+        SearchPage([{"id": "G3-TEST"}], 3, "after-2"),
+    ]
+
+    def search_concept_pages(search_after, **kwargs):
+        if search_after in ("expired", "unavailable"):
+            status_code = 400 if search_after == "expired" else 503
+            raise requests.exceptions.HTTPError(
+                response=mocker.Mock(status_code=status_code),
+            )
+        start = 0 if search_after is None else int(search_after[-1])
+        yield from pages[start:]
+
+    return mocker.patch(
+        "cumulus_port.cmr_client.harvest.search_concept_pages",
+        side_effect=search_concept_pages,
+    )
+
+
+def test_harvest_concept(cmr_client, mock_search_concept_pages, tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({"watermark": "2024-01-01T00:00:00Z"}))
+
+    assert list(harvest_concept(
+        cmr_client,
+        type="granules",
+        state_file=state_file,
+        search_params={"short_name": "SAMPLE"},
+    )) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}, {"id": "G3-TEST"}]
+
+    kwargs = mock_search_concept_pages.call_args.kwargs
+    started_at = kwargs["search_params"]["revision_date"].split(",")[1]
+    assert kwargs["search_params"] == {
+        "provider_short_name": "TEST",
+        "short_name": "SAMPLE",
+        "revision_date": f"2024-01-01T00:00:00Z,{started_at}",
+    }
+    assert kwargs["search_after"] is None
+    assert load_harvest_state(state_file) == {"watermark": started_at}
+
+
+def test_harvest_concept_resume(cmr_client, mock_search_concept_pages, tmp_path):
+    state_file = tmp_path / "state.json"
+
+    harvest = harvest_concept(
+        cmr_client,
+        type="granules",
+        state_file=state_file,
+        watermark_param="updated_since",
+    )
+    # Consume the first page and part of the second, then stop
+    assert [next(harvest) for _ in range(3)] == [
+        {"id": "G1-TEST"},
+        {"id": "G2-TEST"},
+        {"id": "G3-TEST"},
+    ]
+    harvest.close()
+
+    state = load_harvest_state(state_file)
+    assert state["in_progress"]["search_after"] == "after-1"
+    assert state["in_progress"]["harvested"] == 2
+    assert "updated_since" not in mock_search_concept_pages.call_args.kwargs["search_params"]
+
+    assert list(harvest_concept(
+        cmr_client,
+        type="granules",
+        state_file=state_file,
+        watermark_param="updated_since",
+    )) == [{"id": "G3-TEST"}]
+    assert mock_search_concept_pages.call_args.kwargs["search_after"] == "after-1"
+    assert load_harvest_state(state_file) == {
+        "watermark": state["in_progress"]["started_at"],
+    }
+
+
+def make_in_progress(**kwargs):
+    return {
+        "since": "2024-01-01T00:00:00Z",
+        "started_at": "2024-02-01T00:00:00Z",
+        "watermark_param": "revision_date",
+        "search_params": {"short_name": "SAMPLE"},
+        "search_after": "after-1",
+        "harvested": 2,
+        **kwargs,
+    }
+
+
+def test_harvest_concept_search_after_expired(cmr_client, mock_search_concept_pages, tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({
+        "watermark": "2024-01-01T00:00:00Z",
+        "in_progress": make_in_progress(search_after="expired"),
+    }))
+
+    # The harvest in progress is restarted from its watermark
+    assert list(harvest_concept(
+        cmr_client,
+        type="granules",
+        state_file=state_file,
+        search_params={"short_name": "SAMPLE"},
+    )) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}, {"id": "G3-TEST"}]
+
+    kwargs = mock_search_concept_pages.call_args.kwargs
+    assert kwargs["search_after"] is None
+    assert kwargs["search_params"]["revision_date"] == "2024-01-01T00:00:00Z,2024-02-01T00:00:00Z"
+    assert load_harvest_state(state_file) == {"watermark": "2024-02-01T00:00:00Z"}
+
+
+def test_harvest_concept_search_error(cmr_client, mock_search_concept_pages, tmp_path):
+    state_file = tmp_path / "state.json"
+    state = {"in_progress": make_in_progress(search_after="unavailable")}
+    state_file.write_text(json.dumps(state))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        list(harvest_concept(
+            cmr_client,
+            type="granules",
+            state_file=state_file,
+            search_params={"short_name": "SAMPLE"},
+        ))
+    assert load_harvest_state(state_file) == state
+
+
+@pytest.mark.parametrize("changes", [
+    {"search_params": {"short_name": "OTHER"}},
+    {"watermark_param": "updated_since"},
+    {"watermark_param": None, "search_params": None},
+])
+def test_harvest_concept_changed_search(cmr_client, mock_search_concept_pages, tmp_path, changes):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({
+        "watermark": "2024-01-15T00:00:00Z",
+        "in_progress": make_in_progress(**changes),
+    }))
+
+    # The harvest in progress is discarded and a new one is started
+    assert len(list(harvest_concept(
+        cmr_client,
+        type="granules",
+        state_file=state_file,
+        search_params={"short_name": "SAMPLE"},
+    ))) == 3
+
+    kwargs = mock_search_concept_pages.call_args.kwargs
+    assert kwargs["search_after"] is None
+    assert kwargs["search_params"]["revision_date"].startswith("2024-01-15T00:00:00Z,")
+
+
+def test_harvest_concept_invalid_watermark_param(cmr_client, tmp_path):
+    with pytest.raises(ValueError, match="Invalid watermark_param"):
+        list(harvest_concept(
+            cmr_client,
+            type="granules",
+            state_file=tmp_path / "state.json",
+            watermark_param="created_at",
+        ))
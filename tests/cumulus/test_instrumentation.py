@@ -0,0 +1,199 @@
+import pytest
+from moto import mock_aws
+
+from cumulus_port import instrumentation
+from cumulus_port.instrumentation import (
+    Event,
+    add_hook,
+    current_span,
+    instrument,
+    remove_hook,
+)
+
+try:
+    import boto3
+
+    from cumulus_port.aws_client.s3 import get_object, s3_object_exists, s3_put_object
+    from cumulus_port.aws_client.secrets_manager import get_secret_string
+    from cumulus_port.cmr_client.earthdata_login import get_edl_token
+    from cumulus_port.cmr_client.search_concept import search_concept
+except ImportError:
+    pass
+
+
+@pytest.fixture
+def events():
+    events = []
+    hook = add_hook(events.append)
+    yield events
+    remove_hook(hook)
+
+
+def end_events(events, operation=None):
+    return [
+        event for event in events
+        if event.phase == "end" and operation in (None, event.operation)
+    ]
+
+
+def test_instrument_no_hooks():
+    span = instrument("test.operation", key="value")
+
+    with span:
+        assert current_span() is None
+        span.bytes = 10
+        span.retries += 1
+
+    assert not span.enabled
+    assert span.bytes is None
+    assert span.retries == 0
+    # The same span is reused
+    assert instrument("test.other") is span
+
+
+def test_instrument_events(events):
+    with instrument("test.operation", key="value") as span:
+        assert current_span() is span
+        span.bytes = 10
+        span.status = 200
+        span.retries += 1
+
+    assert current_span() is None
+    start, end = events
+    assert start == Event("start", "test.operation", {"key": "value"}, span.start)
+    assert end.phase == "end"
+    assert end.operation == "test.operation"
+    assert end.attributes == {"key": "value"}
+    assert end.duration >= 0
+    assert end.bytes == 10
+    assert end.status == 200
+    assert end.retries == 1
+    assert end.error is None
+
+
+def test_instrument_error(events):
+    with pytest.raises(ValueError):
+        with instrument("test.operation"):
+            raise ValueError("test error")
+
+    assert isinstance(events[-1].error, ValueError)
+
+
+def test_instrument_nested(events):
+    with instrument("test.outer") as outer:
+        with instrument("test.inner") as inner:
+            assert current_span() is inner
+        assert current_span() is outer
+
+    assert [(event.phase, event.operation) for event in events] == [
+        ("start", "test.outer"),
+        ("start", "test.inner"),
+        ("end", "test.inner"),
+        ("end", "test.outer"),
+    ]
+
+
+def test_broken_hook(events):
+    def broken(event):
+        raise RuntimeError("test error")
+
+    add_hook(broken)
+    try:
+        with instrument("test.operation"):
+            pass
+    finally:
+        remove_hook(broken)
+
+    assert len(events) == 2
+
+
+def test_remove_hook(events):
+    remove_hook(events.append)
+    with instrument("test.operation"):
+        pass
+
+    assert events == []
+    assert instrumentation.hooks._hooks == ()
+
+
+@pytest.mark.auth
+def test_search_concept_events(stub_cmr, events):
+    stub_cmr.throttle(1)
+
+    results = search_concept(
+        type="granules",
+        search_params={"provider_short_name": "TEST"},
+        headers={},
+        cmr_limit=20,
+        cmr_page_size=10,
+    )
+
+    assert len(results) == 20
+    first, second = end_events(events, "cmr.search")
+    assert first.attributes == {"url": f"{stub_cmr.url}/search/granules.json"}
+    assert first.status == 200
+    assert first.bytes > 0
+    assert first.retries == 1
+    assert second.retries == 0
+
+
+@pytest.mark.auth
+def test_search_concept_error_event(stub_cmr, events):
+    stub_cmr.throttle(10, status=500)
+
+    with pytest.raises(Exception):
+        search_concept(
+            type="granules",
+            search_params={},
+            headers={},
+        )
+
+    event, = end_events(events, "cmr.search")
+    assert event.status == 500
+    assert event.error is not None
+
+
+@pytest.mark.auth
+def test_edl_events(stub_cmr, events):
+    get_edl_token("user", "password", "UAT")
+
+    assert [
+        (event.operation, event.status)
+        for event in end_events(events)
+    ] == [
+        ("edl.retrieve_token", 200),
+        ("edl.create_token", 200),
+    ]
+
+
+@pytest.mark.auth
+def test_s3_events(s3_client, s3_bucket, events):
+    s3_put_object(s3_client, Bucket=s3_bucket.name, Key="file.txt", Body="content")
+    assert s3_object_exists(s3_client, Bucket=s3_bucket.name, Key="file.txt")
+    assert not s3_object_exists(s3_client, Bucket=s3_bucket.name, Key="missing.txt")
+    assert get_object(s3_client, Bucket=s3_bucket.name, Key="file.txt")["Body"].read() == b"content"
+
+    assert [
+        (event.operation, event.attributes["key"], event.status, event.bytes)
+        for event in end_events(events)
+    ] == [
+        ("s3.put_object", "file.txt", 200, 7),
+        ("s3.head_object", "file.txt", 200, None),
+        ("s3.head_object", "missing.txt", 404, None),
+        ("s3.get_object", "file.txt", 200, 7),
+    ]
+
+
+@pytest.mark.auth
+@mock_aws
+def test_secrets_manager_events(events):
+    boto3.client("secretsmanager").create_secret(Name="secret", SecretString="value")
+
+    assert get_secret_string("secret") == "value"
+    assert get_secret_string("missing") is None
+
+    found, missing = end_events(events, "secretsmanager.get_secret_value")
+    assert found.attributes == {"secret_id": "secret"}
+    assert found.status == 200
+    assert found.error is None
+    assert missing.error is not None
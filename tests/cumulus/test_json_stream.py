@@ -0,0 +1,82 @@
+import gzip
+import json
+
+import pytest
+
+try:
+    from cumulus_port.cmr_client.json_stream import iter_json_array
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+DOCUMENT = {
+    "hits": 6,
+    "took": 12,
+    "items": [
+        {
+            "meta": {"concept-id": "G1-TEST", "native-id": 'quoted "]}" brackets'},
+            "umm": {"Points": [[1.5, -2], [3, {"nested": None}]]},
+        },
+        {"meta": {"concept-id": "G2-TEST"}, "umm": {"GranuleUR": "unicode é☃"}},
+        {},
+        "string",
+        12345,
+        [True, False],
+    ],
+}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 100_000])
+def test_iter_json_array(chunk_size):
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+
+    assert list(iter_json_array(chunked(data, chunk_size), ("items",))) == DOCUMENT["items"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100_000])
+def test_iter_json_array_gzip(chunk_size):
+    data = gzip.compress(json.dumps(DOCUMENT).encode())
+
+    assert list(iter_json_array(chunked(data, chunk_size), ("items",))) == DOCUMENT["items"]
+
+
+def test_iter_json_array_nested_path():
+    data = json.dumps({
+        "items": ["not", "this"],
+        "feed": {"items": [], "entry": [{"id": "C1-TEST"}, {"id": "C2-TEST"}]},
+    }).encode()
+
+    assert list(iter_json_array(chunked(data, 3), ("feed", "entry"))) == [
+        {"id": "C1-TEST"},
+        {"id": "C2-TEST"},
+    ]
+
+
+def test_iter_json_array_lazy():
+    data = json.dumps(DOCUMENT).encode()
+    chunks = iter(chunked(data, 16))
+    items = iter_json_array(chunks, ("items",))
+
+    assert next(items) == DOCUMENT["items"][0]
+    assert next(chunks, None) is not None
+
+
+def test_iter_json_array_missing():
+    assert list(iter_json_array([b'{"feed": {"entry": [1]}}'], ("items",))) == []
+    assert list(iter_json_array([b"{}"], ("items",))) == []
+    assert list(iter_json_array([], ("items",))) == []
+
+
+def test_iter_json_array_incomplete():
+    with pytest.raises(ValueError, match="Incomplete JSON document"):
+        list(iter_json_array([b'{"items": [{"id": 1}, {"id"'], ("items",)))
+
+
+def test_iter_json_array_invalid():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"items": [{"id": }]}'], ("items",)))
@@ -0,0 +1,142 @@
+import time
+
+import pytest
+from moto import mock_aws
+
+import cumulus_port
+from cumulus_port.lambda_init import warmup
+
+try:
+    import boto3
+
+    from cumulus_port.aws_client import services
+    from cumulus_port.cmrjs.cmr_utils import get_cmr_settings
+    from cumulus_port.ingest.url_path_template import compile_template
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+@pytest.fixture
+def cmr_config():
+    return {
+        "oauthProvider": "earthdata",
+        "provider": "TEST",
+        "clientId": "unit-tests",
+        "username": "user",
+        "passwordSecretName": "cmr-password",
+    }
+
+
+def test_warmup_export():
+    assert cumulus_port.warmup is warmup
+
+
+def test_warmup_nothing():
+    report = warmup(aws_services=())
+
+    assert report.steps == []
+    assert report.ok
+    assert report.cmr_settings is None
+
+
+@mock_aws
+def test_warmup_aws_clients():
+    report = warmup(aws_services=("s3", "sqs"))
+
+    step, = report.steps
+    assert step.name == "aws_clients"
+    assert step.loaded == ["s3 client", "sqs client"]
+    assert step.duration <= report.duration
+    assert set(services._clients) == {("s3", ()), ("sqs", ())}
+    assert services.s3() is services._clients[("s3", ())]
+
+
+def test_warmup_collection(collection):
+    compile_template.cache_clear()
+
+    report = warmup(collection=collection, aws_services=())
+
+    step, = report.steps
+    assert step.name == "collection"
+    assert step.loaded == ["2 file regexes", "2 url_path templates"]
+    assert compile_template.cache_info().currsize == 2
+
+
+@mock_aws
+def test_warmup_cmr(stub_cmr, collection, cmr_config):
+    boto3.client("secretsmanager").create_secret(
+        Name="cmr-password",
+        SecretString="password",
+    )
+
+    report = warmup(collection=collection, cmr_config=cmr_config)
+
+    assert report.ok
+    assert [step.name for step in report.steps] == ["aws_clients", "collection", "cmr"]
+    assert report.steps[2].loaded == ["earthdata token"]
+    assert report.cmr_settings == {
+        "provider": "TEST",
+        "client_id": "unit-tests",
+        "oauth_provider": "earthdata",
+        "username": "user",
+        "password": "password",
+        "token": stub_cmr.tokens[0]["access_token"],
+    }
+    assert report.to_dict()["steps"][2] == {
+        "name": "cmr",
+        "duration": report.steps[2].duration,
+        "loaded": ["earthdata token"],
+        "error": None,
+    }
+
+
+@mock_aws
+def test_warmup_cmr_launchpad(mocker):
+    mocker.patch(
+        "cumulus_port.cmrjs.cmr_utils.get_cmr_settings",
+        return_value={"oauth_provider": "launchpad", "token": "launchpad-token"},
+    )
+
+    report = warmup(cmr_config={"oauthProvider": "launchpad"}, aws_services=())
+
+    assert report.steps[0].loaded == ["launchpad token"]
+    assert report.cmr_settings["token"] == "launchpad-token"
+
+
+@mock_aws
+def test_warmup_cmr_launchpad_refresh(s3_bucket, mocker, monkeypatch):
+    request_token = mocker.patch(
+        "cumulus_port.launchpad_auth.LaunchpadToken.request_token",
+        side_effect=[
+            {"sm_token": "first-token", "session_maxtimeout": 3600},
+            {"sm_token": "second-token", "session_maxtimeout": 3600},
+        ],
+    )
+    monkeypatch.setenv("system_bucket", s3_bucket.name)
+    monkeypatch.setenv("stackName", "test-stack")
+    cmr_config = {"oauthProvider": "launchpad", "api": "api", "certificate": "cert"}
+
+    warmup(cmr_config=cmr_config, aws_services=())
+
+    # Invocations reuse the token of the warmup until it expires
+    assert get_cmr_settings(cmr_config)["token"] == "first-token"
+    assert request_token.call_count == 1
+
+    mocker.patch("time.time", return_value=time.time() + 3600)
+    assert get_cmr_settings(cmr_config)["token"] == "second-token"
+
+
+@mock_aws
+def test_warmup_error(cmr_config):
+    report = warmup(cmr_config=cmr_config, aws_services=())
+
+    assert not report.ok
+    step, = report.steps
+    assert str(step.error) == "No CMR password set"
+    assert report.cmr_settings is None
+    assert report.to_dict()["steps"][0]["error"] == "Exception('No CMR password set')"
+
+    with pytest.raises(Exception, match="No CMR password set"):
+        warmup(cmr_config=cmr_config, aws_services=(), raise_errors=True)
@@ -0,0 +1,80 @@
+import subprocess
+import sys
+import types
+
+import pytest
+
+from cumulus_port._internal.lazy_import import lazy_exports
+
+HEAVY_MODULES = ("boto3", "botocore", "cryptography", "jsonpath_ng", "jwt", "requests")
+
+
+@pytest.fixture
+def package(monkeypatch):
+    package = types.ModuleType("test_lazy_package")
+    package.__getattr__, package.__dir__ = lazy_exports(package.__name__, {
+        "dumps": "json",
+        "join": "os.path",
+    })
+    monkeypatch.setitem(sys.modules, package.__name__, package)
+    return package
+
+
+def test_lazy_exports(package):
+    import json
+
+    assert "dumps" not in vars(package)
+    assert package.dumps is json.dumps
+    assert vars(package)["dumps"] is json.dumps
+
+
+def test_lazy_exports_missing(package):
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        package.missing
+
+
+def test_lazy_exports_dir(package):
+    assert {"dumps", "join"} <= set(dir(package))
+
+
+def imported_modules(module: str) -> set[str]:
+    """Import a module in a new interpreter
+
+    :returns: set[str] - the heavy modules that were imported with it
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {module}; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split()) & set(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize("module", [
+    "cumulus_port",
+    "cumulus_port.aws_client.s3",
+    "cumulus_port.aws_client.secrets_manager",
+    "cumulus_port.cmr_client",
+    "cumulus_port.cmrjs.cmr_utils",
+    "cumulus_port.instrumentation",
+    "cumulus_port.launchpad_auth",
+    "cumulus_port.move_granules",
+])
+def test_no_heavy_imports(module):
+    assert imported_modules(module) == set()
+
+
+@pytest.mark.auth
+def test_cmr_client_imports():
+    assert imported_modules("cumulus_port.cmr_client.cmr") == {"requests"}
+
+
+def test_cmr_client_exports():
+    import cumulus_port.cmr_client
+
+    assert "CMR" in dir(cumulus_port.cmr_client)
@@ -0,0 +1,197 @@
+import json
+import math
+import threading
+
+import pytest
+
+from cumulus_port.instrumentation import (
+    Histogram,
+    Metrics,
+    disable_metrics,
+    enable_metrics,
+    get_metrics,
+    instrument,
+)
+from cumulus_port.move_granules import get_bucket_and_key_for_file
+
+
+@pytest.fixture
+def metrics():
+    metrics = enable_metrics()
+    yield metrics
+    disable_metrics()
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1, 2, 3, 4))
+    for value in (0.5, 1.5, 1.5, 2.5, 3.5, 10):
+        histogram.observe(value)
+
+    assert histogram.count == 6
+    assert histogram.sum == 19.5
+    assert histogram.min == 0.5
+    assert histogram.max == 10
+    assert histogram.quantile(0) == 0.5
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.quantile(1) == 10
+    assert histogram.cumulative_counts() == [
+        (1, 1),
+        (2, 3),
+        (3, 4),
+        (4, 5),
+        (math.inf, 6),
+    ]
+
+
+def test_histogram_quantiles_within_observed_range():
+    histogram = Histogram((1, 10))
+    for _ in range(100):
+        histogram.observe(5)
+
+    assert histogram.quantile(0.5) == 5
+    assert histogram.quantile(0.99) == 5
+
+
+def test_histogram_empty():
+    assert Histogram().quantile(0.5) is None
+
+
+def test_histogram_invalid_bounds():
+    with pytest.raises(ValueError):
+        Histogram((1, 1, 2))
+    with pytest.raises(ValueError):
+        Histogram((2, 1))
+
+
+def test_metrics_snapshot():
+    metrics = Metrics(buckets=(0.1, 1))
+    metrics.observe("cmr.search", 0.05, bytes=100, status=200)
+    metrics.observe("cmr.search", 0.5, bytes=200, status=200, retries=2)
+    metrics.observe("cmr.search", 2.0, status=500, error=True)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot == {
+        "cmr.search": {
+            "calls": 3,
+            "errors": 1,
+            "retries": 2,
+            "bytes": 300,
+            "statuses": {"200": 2, "500": 1},
+            "latency": {
+                "count": 3,
+                "sum": 2.55,
+                "min": 0.05,
+                "max": 2.0,
+                "p50": pytest.approx(0.55),
+                "p90": pytest.approx(1.7),
+                "p99": pytest.approx(1.97),
+                "buckets": [(0.1, 1), (1, 2), (math.inf, 3)],
+            },
+        },
+    }
+    # The snapshot is a copy
+    metrics.observe("cmr.search", 0.05)
+    assert snapshot["cmr.search"]["calls"] == 3
+    assert metrics.snapshot()["cmr.search"]["calls"] == 4
+
+
+def test_metrics_snapshot_reset():
+    metrics = Metrics()
+    metrics.observe("s3.head_object", 0.01)
+
+    assert "s3.head_object" in metrics.snapshot(reset=True)
+    assert metrics.snapshot() == {}
+
+
+def test_metrics_to_json():
+    metrics = Metrics()
+    metrics.observe("s3.head_object", 0.01, status=200)
+
+    blob = json.loads(metrics.to_json())
+
+    assert blob["s3.head_object"]["calls"] == 1
+    assert blob["s3.head_object"]["latency"]["p50"] == 0.01
+    assert "buckets" not in blob["s3.head_object"]["latency"]
+
+
+def test_metrics_to_prometheus():
+    metrics = Metrics(buckets=(0.1, 1))
+    metrics.observe("cmr.search", 0.05, bytes=100)
+    metrics.observe("cmr.search", 0.5, retries=1, error=True)
+
+    text = metrics.to_prometheus(namespace="test")
+
+    assert text.splitlines() == [
+        "# HELP test_operation_duration_seconds Duration of the instrumented operations.",
+        "# TYPE test_operation_duration_seconds histogram",
+        'test_operation_duration_seconds_bucket{operation="cmr.search",le="0.1"} 1',
+        'test_operation_duration_seconds_bucket{operation="cmr.search",le="1.0"} 2',
+        'test_operation_duration_seconds_bucket{operation="cmr.search",le="+Inf"} 2',
+        'test_operation_duration_seconds_sum{operation="cmr.search"} 0.55',
+        'test_operation_duration_seconds_count{operation="cmr.search"} 2',
+        "# HELP test_operation_errors_total Number of failed operations.",
+        "# TYPE test_operation_errors_total counter",
+        'test_operation_errors_total{operation="cmr.search"} 1',
+        "# HELP test_operation_retries_total Number of retried requests.",
+        "# TYPE test_operation_retries_total counter",
+        'test_operation_retries_total{operation="cmr.search"} 1',
+        "# HELP test_operation_bytes_total Number of bytes received or sent.",
+        "# TYPE test_operation_bytes_total counter",
+        'test_operation_bytes_total{operation="cmr.search"} 100',
+    ]
+
+
+def test_metrics_threads():
+    metrics = Metrics()
+
+    def observe():
+        for _ in range(1000):
+            metrics.observe("operation", 0.001)
+
+    threads = [threading.Thread(target=observe) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.snapshot()["operation"]["calls"] == 8000
+
+
+def test_enable_metrics(metrics):
+    assert get_metrics() is metrics
+    assert enable_metrics() is metrics
+
+    with instrument("test.operation") as span:
+        span.status = 200
+    with pytest.raises(ValueError):
+        with instrument("test.operation"):
+            raise ValueError("test error")
+
+    snapshot = metrics.snapshot()["test.operation"]
+    assert snapshot["calls"] == 2
+    assert snapshot["errors"] == 1
+    assert snapshot["statuses"] == {"200": 1}
+
+
+def test_disable_metrics(metrics):
+    disable_metrics()
+    with instrument("test.operation"):
+        pass
+
+    assert get_metrics() is None
+    assert metrics.snapshot() == {}
+
+
+def test_move_granules_metrics(metrics, collection, buckets_config):
+    get_bucket_and_key_for_file(
+        {"key": "staging/SAMPLE_001.nc"},
+        {"granuleId": "SAMPLE_001"},
+        collection,
+        {},
+        buckets_config,
+    )
+
+    snapshot = metrics.snapshot()
+    assert snapshot["granule.file_match"]["calls"] == 1
+    assert snapshot["template.render"]["calls"] == 1
@@ -1,6 +1,9 @@
 import pytest
 
-from cumulus_port.move_granules import get_bucket_and_key_for_file
+from cumulus_port.move_granules import (
+    collection_uses_cmr_metadata,
+    get_bucket_and_key_for_file,
+)
 
 
 @pytest.fixture
@@ -72,6 +75,56 @@ def test_get_bucket_and_key_for_file(granule, collection, buckets_config):
     ) == ("stack-cumulus-dev-protected", "products/SAMPLE_123456/SAMPLE_123456.nc")
 
 
+def test_get_bucket_and_key_for_file_lazy_cmr_metadata(
+    granule,
+    collection,
+    buckets_config,
+    mocker,
+):
+    file = [
+        file
+        for file in granule["files"]
+        if file["fileName"].endswith(".nc")
+    ][0]
+    get_cmr_metadata = mocker.Mock(
+        return_value={"GranuleUR": "SAMPLE_123456_UR"},
+    )
+
+    assert get_bucket_and_key_for_file(
+        file,
+        granule,
+        collection,
+        get_cmr_metadata,
+        buckets_config,
+    ) == ("stack-cumulus-dev-protected", "products/SAMPLE_123456/SAMPLE_123456.nc")
+    get_cmr_metadata.assert_not_called()
+
+    collection["files"][0]["url_path"] = "products/{cmrMetadata.GranuleUR}/"
+    assert get_bucket_and_key_for_file(
+        file,
+        granule,
+        collection,
+        get_cmr_metadata,
+        buckets_config,
+    ) == ("stack-cumulus-dev-protected", "products/SAMPLE_123456_UR/SAMPLE_123456.nc")
+    get_cmr_metadata.assert_called_once_with()
+
+
+def test_collection_uses_cmr_metadata(collection):
+    assert collection_uses_cmr_metadata(collection) is False
+
+    collection["url_path"] = "{cmrMetadata.GranuleUR}/"
+    assert collection_uses_cmr_metadata(collection) is True
+
+    del collection["url_path"]
+    assert collection_uses_cmr_metadata(collection) is False
+
+    collection["files"][1]["url_path"] = (
+        "{extractYear(cmrMetadata.TemporalExtent.RangeDateTime.BeginningDateTime)}/"
+    )
+    assert collection_uses_cmr_metadata(collection) is True
+
+
 def test_get_bucket_and_key_for_file_invalid_collection(
     granule,
     collection,
@@ -146,3 +199,28 @@ def test_get_bucket_and_key_for_file_missing_file(
             {},
             buckets_config,
         )
+
+
+@pytest.mark.parametrize("updated_at", [1728584062910, None])
+def test_get_bucket_and_key_for_file_unused_invalid_entries(
+    granule,
+    collection,
+    buckets_config,
+    updated_at,
+):
+    collection["updatedAt"] = updated_at
+    collection["files"][1]["url_path"] = "{doStuff(file.source)}/"
+    collection["granuleIdExtraction"] = "(?<name>x)"
+
+    file = [
+        file
+        for file in granule["files"]
+        if file["fileName"].endswith(".nc")
+    ][0]
+    assert get_bucket_and_key_for_file(
+        file,
+        granule,
+        collection,
+        {},
+        buckets_config,
+    ) == ("stack-cumulus-dev-protected", "products/SAMPLE_123456/SAMPLE_123456.nc")
@@ -0,0 +1,51 @@
+import gzip
+import json
+
+import pytest
+
+try:
+    from cumulus_port.cmr_client.ndjson import NDJSONWriter
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+PAGES = [
+    [{"id": "G1-TEST"}, {"id": "G2-TEST", "title": "ünïcode"}],
+    [],
+    [{"id": "G3-TEST"}],
+    [{"id": "G4-TEST"}, {"id": "G5-TEST"}],
+]
+RECORDS = [record for page in PAGES for record in page]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_ndjson(tmp_path, compress):
+    path = tmp_path / "results.ndjson"
+    with NDJSONWriter(path, compress=compress) as writer:
+        for page in PAGES:
+            writer.write_page(page)
+        reader = writer.close()
+
+    with reader:
+        assert len(reader) == 5
+        assert list(reader) == RECORDS
+        assert [reader[i] for i in (4, 0, 2, 3, 1)] == [
+            RECORDS[i] for i in (4, 0, 2, 3, 1)
+        ]
+        assert reader[-1] == {"id": "G5-TEST"}
+        assert reader[1:3] == RECORDS[1:3]
+        with pytest.raises(IndexError):
+            reader[5]
+
+    opener = gzip.open if compress else open
+    with opener(path, "rt") as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+
+def test_ndjson_empty(tmp_path):
+    with NDJSONWriter(tmp_path / "results.ndjson", compress=True) as writer:
+        reader = writer.close()
+
+    assert len(reader) == 0
+    assert list(reader) == []
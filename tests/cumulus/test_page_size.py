@@ -0,0 +1,64 @@
+import pytest
+
+try:
+    from cumulus_port.cmr_client.page_size import PageSizeController
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+def test_page_size_controller_grows():
+    controller = PageSizeController(50, target_duration=2.0, target_bytes=10_000_000)
+
+    # 10ms and 1KB per record
+    assert controller.update(50, 0.5, 50_000) == 100
+    assert controller.update(100, 1.0, 100_000) == 200
+    assert controller.update(200, 2.0, 200_000) == 200
+    assert controller.page_size == 200
+
+
+def test_page_size_controller_bytes_target():
+    controller = PageSizeController(1000, target_duration=60, target_bytes=1_000_000)
+
+    # 10KB per record
+    assert controller.update(1000, 1.0, 10_000_000) == 100
+
+
+def test_page_size_controller_shrinks_immediately():
+    controller = PageSizeController(1000, target_duration=1.0, smoothing=1.0)
+
+    assert controller.update(1000, 10.0, 1000) == 100
+
+
+def test_page_size_controller_limits():
+    controller = PageSizeController(10, max_growth=1000, smoothing=1.0)
+
+    assert controller.update(10, 0.000001, 10) == 2000
+    assert controller.update(2000, 100_000.0, 10) == 1
+
+    controller = PageSizeController(
+        10,
+        min_size=5,
+        max_size=20,
+        max_growth=1000,
+        smoothing=1.0,
+    )
+    assert controller.page_size == 10
+    assert controller.update(10, 0.000001, 10) == 20
+    assert controller.update(20, 100_000.0, 10) == 5
+
+
+def test_page_size_controller_empty_page():
+    controller = PageSizeController(50)
+
+    assert controller.update(0, 5.0, 100) == 50
+
+
+def test_page_size_controller_invalid():
+    with pytest.raises(ValueError):
+        PageSizeController(max_size=5000)
+    with pytest.raises(ValueError):
+        PageSizeController(min_size=10, max_size=5)
+    with pytest.raises(ValueError):
+        PageSizeController(smoothing=0)
@@ -0,0 +1,177 @@
+import os
+import pstats
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+from cumulus_port.instrumentation import profiling
+from cumulus_port.instrumentation.profiling import configure_profiling, profiled
+from cumulus_port.move_granules import get_bucket_and_key_for_file
+
+
+@pytest.fixture(autouse=True)
+def restore_config(monkeypatch):
+    monkeypatch.setattr(profiling, "_config", profiling._config)
+
+
+@profiled
+def allocate(size):
+    return [str(i) for i in range(size)]
+
+
+@profiled
+def outer():
+    return allocate(10)
+
+
+@profiled
+def fail():
+    raise ValueError("test error")
+
+
+def test_profiling_disabled(tmp_path):
+    configure_profiling((), directory=tmp_path)
+
+    assert allocate(10) == [str(i) for i in range(10)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cprofile(tmp_path):
+    configure_profiling(("cprofile",), directory=tmp_path)
+
+    assert len(allocate(10)) == 10
+
+    path, = tmp_path.iterdir()
+    assert path.name.startswith(f"{__name__}.allocate-")
+    assert path.suffix == ".prof"
+    stats = pstats.Stats(str(path))
+    assert any(function == "allocate" for _, _, function in stats.stats)
+
+
+def test_tracemalloc(tmp_path):
+    configure_profiling(("tracemalloc",), directory=tmp_path, top=5)
+
+    allocate(10_000)
+
+    path, = tmp_path.iterdir()
+    assert path.name.endswith(".tracemalloc.txt")
+    lines = path.read_text().splitlines()
+    assert lines[0].startswith(f"# Top 5 allocation sites of {__name__}.allocate ")
+    assert 1 < len(lines) <= 6
+    assert "test_profiling.py" in lines[1]
+    assert not tracemalloc.is_tracing()
+
+
+def test_sample_rate(tmp_path):
+    configure_profiling(("cprofile",), directory=tmp_path, sample_rate=3)
+
+    for _ in range(6):
+        allocate(10)
+
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_nested_calls(tmp_path):
+    configure_profiling(("cprofile", "tracemalloc"), directory=tmp_path)
+
+    outer()
+
+    assert [path.name.split("-")[0] for path in tmp_path.iterdir()] == [
+        f"{__name__}.outer",
+        f"{__name__}.outer",
+    ]
+
+
+def test_exception(tmp_path):
+    configure_profiling(("cprofile",), directory=tmp_path)
+
+    with pytest.raises(ValueError, match="test error"):
+        fail()
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_write_failure(tmp_path):
+    path = tmp_path / "file"
+    path.write_text("")
+    configure_profiling(("cprofile",), directory=path)
+
+    assert len(allocate(10)) == 10
+
+
+def test_configure_profiling_invalid():
+    with pytest.raises(ValueError):
+        configure_profiling(("unknown",))
+    with pytest.raises(ValueError):
+        configure_profiling(sample_rate=0)
+
+
+def test_config_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("CUMULUS_PROFILE", "cProfile, tracemalloc")
+    monkeypatch.setenv("CUMULUS_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("CUMULUS_PROFILE_SAMPLE_RATE", "10")
+
+    config = profiling._config_from_env()
+
+    assert config.profilers == {"cprofile", "tracemalloc"}
+    assert config.directory == tmp_path
+    assert config.sample_rate == 10
+    assert config.top == 25
+
+
+def test_config_from_env_disabled(monkeypatch):
+    monkeypatch.delenv("CUMULUS_PROFILE", raising=False)
+
+    assert profiling._config_from_env() is None
+
+
+@pytest.mark.parametrize("name, value", [
+    ("CUMULUS_PROFILE", "yes"),
+    ("CUMULUS_PROFILE_SAMPLE_RATE", "0.1"),
+    ("CUMULUS_PROFILE_TOP", "all"),
+])
+def test_config_from_env_invalid(monkeypatch, caplog, name, value):
+    monkeypatch.setenv("CUMULUS_PROFILE", "cprofile")
+    monkeypatch.setenv(name, value)
+    monkeypatch.setattr(profiling, "_config", profiling._UNSET)
+
+    assert len(allocate(10)) == 10
+    assert profiling.get_profiling_config() is None
+    assert "profiling is disabled" in caplog.text
+
+
+def test_config_from_env_on_first_use(monkeypatch, tmp_path):
+    monkeypatch.setenv("CUMULUS_PROFILE", "cprofile")
+    monkeypatch.setenv("CUMULUS_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "_config", profiling._UNSET)
+
+    assert len(allocate(10)) == 10
+    assert profiling.get_profiling_config().profilers == {"cprofile"}
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+
+def test_import_with_invalid_env():
+    result = subprocess.run(
+        [sys.executable, "-c", "import cumulus_port.move_granules"],
+        env={**os.environ, "CUMULUS_PROFILE": "yes"},
+        capture_output=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_entry_point(tmp_path, collection, buckets_config):
+    configure_profiling(("cprofile",), directory=tmp_path)
+
+    get_bucket_and_key_for_file(
+        {"key": "staging/SAMPLE_001.nc"},
+        {"granuleId": "SAMPLE_001"},
+        collection,
+        {},
+        buckets_config,
+    )
+
+    path, = tmp_path.iterdir()
+    assert path.name.startswith("cumulus_port.move_granules.get_bucket_and_key_for_file-")
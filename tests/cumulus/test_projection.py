@@ -0,0 +1,57 @@
+import pytest
+
+try:
+    from cumulus_port.cmr_client.projection import Projection, get_projection
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+def test_projection():
+    projection = Projection(["id", "title", "links.0.href", "meta.concept-id", "class"])
+    record = projection({
+        "id": "G1-TEST",
+        "title": "granule_1",
+        "links": [{"href": "https://example.com/granule_1.nc"}],
+        "time_start": "2024-01-01T00:00:00Z",
+    })
+
+    assert record.id == "G1-TEST"
+    assert record.links_0_href == "https://example.com/granule_1.nc"
+    assert record.meta_concept_id is None
+    assert record._class is None
+    assert record["title"] == "granule_1"
+    assert record[0] == "G1-TEST"
+    assert record.get("time_start") is None
+    assert tuple(record) == (
+        "G1-TEST",
+        "granule_1",
+        "https://example.com/granule_1.nc",
+        None,
+        None,
+    )
+    assert record.to_dict() == {
+        "id": "G1-TEST",
+        "title": "granule_1",
+        "links.0.href": "https://example.com/granule_1.nc",
+        "meta.concept-id": None,
+        "class": None,
+    }
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.time_start = "2024-01-01T00:00:00Z"
+
+
+def test_projection_duplicate_names():
+    record = Projection(["a.b", "a_b"])({"a": {"b": 1}, "a_b": 2})
+    assert record.a_b == 1
+    assert record.a_b_1 == 2
+
+
+def test_get_projection():
+    assert get_projection(("id",)) is get_projection(("id",))
+    assert get_projection(("id",)).project([{"id": 1}, {"id": 2}]) == [
+        get_projection(("id",))({"id": 1}),
+        get_projection(("id",))({"id": 2}),
+    ]
@@ -0,0 +1,148 @@
+import os
+import time
+
+import pytest
+
+try:
+    from cumulus_port.cmr_client.search_cache import SearchCache
+    from cumulus_port.cmr_client.search_concept import search_concept
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+def test_make_key():
+    key = SearchCache.make_key(
+        url="https://cmr.test/search/granules.json",
+        search_params={"a": "1", "b": ["x", "y"], "page_num": 1},
+        provider="TEST",
+    )
+    assert key == SearchCache.make_key(
+        url="https://cmr.test/search/granules.json",
+        search_params={"page_num": "1", "b": ["x", "y"], "a": 1},
+        provider="TEST",
+    )
+    assert key != SearchCache.make_key(
+        url="https://cmr.test/search/granules.umm_json",
+        search_params={"a": "1", "b": ["x", "y"], "page_num": 1},
+        provider="TEST",
+    )
+    assert key != SearchCache.make_key(
+        url="https://cmr.test/search/granules.json",
+        search_params={"a": "1", "b": ["x", "y"], "page_num": 2},
+        provider="TEST",
+    )
+
+    token_key = SearchCache.make_key(
+        url="https://cmr.test/search/granules.json",
+        search_params={"a": "1", "b": ["x", "y"], "page_num": 1},
+        provider="TEST",
+        token="token-1",
+    )
+    assert token_key != key
+    assert token_key != SearchCache.make_key(
+        url="https://cmr.test/search/granules.json",
+        search_params={"a": "1", "b": ["x", "y"], "page_num": 1},
+        provider="TEST",
+        token="token-2",
+    )
+
+
+def test_search_cache(tmp_path):
+    cache = SearchCache(tmp_path)
+
+    assert cache.get("abc") is None
+    cache.set("abc", {"items": [1, 2, 3], "hits": 3})
+    assert cache.get("abc") == {"items": [1, 2, 3], "hits": 3}
+
+    # Entries are shared through the directory
+    assert SearchCache(tmp_path).get("abc") == {"items": [1, 2, 3], "hits": 3}
+
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "hitRatio": 0.5,
+    }
+
+    cache.clear()
+    assert cache.get("abc") is None
+
+
+def test_search_cache_overwrite(tmp_path, mocker):
+    # The size of an entry depends on its creation time
+    mocker.patch("time.time", return_value=1700000000.0)
+    cache = SearchCache(tmp_path)
+    cache.set("abc", "value")
+    size = cache._size
+
+    cache.set("abc", "value")
+    assert cache._size == size == cache._scan_size()
+
+
+def test_search_cache_ttl(tmp_path, mocker):
+    cache = SearchCache(tmp_path, ttl=10)
+    cache.set("abc", "value")
+
+    mocker.patch("time.time", return_value=time.time() + 10)
+    assert cache.get("abc") is None
+    assert list(tmp_path.glob("*/*")) == []
+
+
+def test_search_cache_eviction(tmp_path):
+    cache = SearchCache(tmp_path)
+    value = "x" * 1000
+    for i, key in enumerate(["a0", "b0", "c0"]):
+        cache.set(key, value)
+        # Make sure the modification times differ
+        os.utime(cache._path(key), (i, i))
+
+    # Room for 3.5 entries
+    cache.max_size = cache._path("a0").stat().st_size * 3.5
+
+    assert cache.get("a0") == value
+    cache.set("d0", value)
+
+    assert cache.get("a0") == value
+    assert cache.get("b0") is None
+    assert cache.get("c0") == value
+    assert cache.get("d0") == value
+    assert cache.stats()["evictions"] == 1
+
+
+def test_search_concept_cache(tmp_path, mocker):
+    response = mocker.Mock(headers={"cmr-hits": "1"})
+    response.json.return_value = {"feed": {"entry": [{"id": "G1-TEST"}]}}
+    mock_get = mocker.patch("requests.get", return_value=response)
+    cache = SearchCache(tmp_path)
+
+    for _ in range(2):
+        assert search_concept(
+            type="granules",
+            search_params={"provider_short_name": "TEST"},
+            cmr_environment="UAT",
+            cache=cache,
+        ) == [{"id": "G1-TEST"}]
+
+    mock_get.assert_called_once()
+    assert cache.stats()["hits"] == 1
+
+
+def test_search_concept_cache_token(tmp_path, mocker):
+    response = mocker.Mock(headers={"cmr-hits": "1"})
+    response.json.return_value = {"feed": {"entry": [{"id": "G1-TEST"}]}}
+    mock_get = mocker.patch("requests.get", return_value=response)
+    cache = SearchCache(tmp_path)
+
+    for token in ("token-1", "token-2", "token-1"):
+        search_concept(
+            type="granules",
+            search_params={"provider_short_name": "TEST"},
+            headers={"Authorization": token},
+            cmr_environment="UAT",
+            cache=cache,
+        )
+
+    assert mock_get.call_count == 2
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,565 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+try:
+    from cumulus_port.cmr_client.page_size import PageSizeController
+    from cumulus_port.cmr_client.search_concept import (
+        SearchPage,
+        deduplicate_results,
+        get_chunk_size,
+        get_chunkable_param,
+        iter_search_concept,
+        search_concept,
+        search_concept_chunked,
+        search_concept_pages,
+        search_concept_sharded,
+        search_concept_to_file,
+    )
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+@pytest.fixture
+def mock_requests(mocker):
+    response = mocker.Mock(headers={"cmr-hits": "1"})
+    response.json.return_value = {"feed": {"entry": [{"id": "G1-TEST"}]}}
+
+    return (
+        mocker.patch("requests.get", return_value=response),
+        mocker.patch("requests.post", return_value=response),
+    )
+
+
+def test_search_concept_get(mock_requests):
+    mock_get, mock_post = mock_requests
+
+    assert search_concept(
+        type="granules",
+        search_params={"granule_ur[]": ["granule-1", "granule-2"]},
+        cmr_environment="UAT",
+    ) == [{"id": "G1-TEST"}]
+    mock_get.assert_called_once_with(
+        "https://cmr.uat.earthdata.nasa.gov/search/granules.json",
+        params={
+            "granule_ur[]": ["granule-1", "granule-2"],
+            "page_num": 1,
+            "page_size": "50",
+        },
+        headers={},
+        stream=False,
+    )
+    mock_post.assert_not_called()
+
+
+def test_search_concept_post(mock_requests):
+    mock_get, mock_post = mock_requests
+    granule_urs = [f"S1A_IW_GRDH_1SDV_{i:010d}" for i in range(500)]
+
+    assert search_concept(
+        type="granules",
+        search_params={"granule_ur[]": granule_urs},
+        cmr_environment="UAT",
+    ) == [{"id": "G1-TEST"}]
+    mock_post.assert_called_once_with(
+        "https://cmr.uat.earthdata.nasa.gov/search/granules.json",
+        data={
+            "granule_ur[]": granule_urs,
+            "page_num": 1,
+            "page_size": "50",
+        },
+        headers={},
+        stream=False,
+    )
+    mock_get.assert_not_called()
+
+
+def test_search_concept_recursive(mocker):
+    pages = [
+        [{"id": "G1-TEST"}, {"id": "G2-TEST"}],
+        [{"id": "G3-TEST"}, {"id": "G4-TEST"}],
+        [{"id": "G5-TEST"}],
+    ]
+
+    def get(url, params, headers, stream):
+        response = mocker.Mock(headers={"cmr-hits": "5"})
+        response.json.return_value = {"items": pages[params["page_num"] - 1]}
+        return response
+
+    mock_get = mocker.patch("requests.get", side_effect=get)
+
+    assert search_concept(
+        type="granules",
+        search_params={},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_limit=4,
+        cmr_page_size=2,
+    ) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}, {"id": "G3-TEST"}, {"id": "G4-TEST"}]
+    assert mock_get.call_count == 2
+
+
+def echo10_page(granule_urs):
+    results = "".join(
+        f"<result><Granule><GranuleUR>{granule_ur}</GranuleUR></Granule></result>"
+        for granule_ur in granule_urs
+    )
+    return f"<results><hits>3</hits>{results}</results>".encode()
+
+
+def test_search_concept_echo10(mocker):
+    response = mocker.Mock(headers={"cmr-hits": "2"})
+    response.iter_content.return_value = [echo10_page(["granule-1", "granule-2"])]
+    mock_get = mocker.patch("requests.get", return_value=response)
+
+    assert search_concept(
+        type="granules",
+        search_params={},
+        format="echo10",
+        cmr_environment="UAT",
+    ) == [
+        {"Granule": {"GranuleUR": "granule-1"}},
+        {"Granule": {"GranuleUR": "granule-2"}},
+    ]
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+def test_iter_search_concept(mocker):
+    pages = [["granule-1", "granule-2"], ["granule-3"]]
+    responses = []
+
+    def get(url, params, headers, stream):
+        assert stream is True
+        response = mocker.MagicMock(headers={"cmr-hits": "3"})
+        response.iter_content.return_value = [echo10_page(pages[params["page_num"] - 1])]
+        responses.append(response)
+        return response
+
+    mocker.patch("requests.get", side_effect=get)
+
+    results = iter_search_concept(
+        type="granules",
+        search_params={},
+        format="echo10",
+        cmr_environment="UAT",
+        cmr_page_size=2,
+    )
+    assert next(results) == {"Granule": {"GranuleUR": "granule-1"}}
+    assert len(responses) == 1
+    assert [result["Granule"]["GranuleUR"] for result in results] == [
+        "granule-2",
+        "granule-3",
+    ]
+    assert len(responses) == 2
+    for response in responses:
+        response.__exit__.assert_called_once()
+
+
+def test_iter_search_concept_limit(mocker):
+    response = mocker.MagicMock(headers={"cmr-hits": "10"})
+    response.iter_content.side_effect = lambda chunk_size: [
+        b'{"hits": 10, "items": [{"id": "G1-TEST"}, {"id": "G2-TEST"}]}',
+    ]
+    mock_get = mocker.patch("requests.get", return_value=response)
+
+    assert list(iter_search_concept(
+        type="granules",
+        search_params={},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_limit=3,
+        cmr_page_size=2,
+    )) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}, {"id": "G1-TEST"}]
+    assert mock_get.call_count == 2
+
+
+def test_search_concept_stream(mocker):
+    pages = [
+        [{"meta": {"concept-id": "G1-TEST"}, "umm": {"GranuleUR": "granule-1"}}],
+        [{"meta": {"concept-id": "G2-TEST"}, "umm": {"GranuleUR": "granule-2"}}],
+    ]
+
+    def get(url, params, headers, stream):
+        assert stream is True
+        body = json.dumps({"hits": 2, "items": pages[params["page_num"] - 1]})
+        data = gzip.compress(body.encode())
+        response = mocker.MagicMock(headers={"cmr-hits": "2"})
+        response.iter_content.return_value = [
+            data[i:i + 8] for i in range(0, len(data), 8)
+        ]
+        return response
+
+    mocker.patch("requests.get", side_effect=get)
+
+    assert search_concept(
+        type="granules",
+        search_params={},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_page_size=1,
+        stream=True,
+    ) == pages[0] + pages[1]
+
+    results = search_concept(
+        type="granules",
+        search_params={},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_page_size=1,
+        fields=["umm.GranuleUR"],
+        stream=True,
+    )
+    assert [result.to_dict() for result in results] == [
+        {"umm.GranuleUR": "granule-1"},
+        {"umm.GranuleUR": "granule-2"},
+    ]
+
+
+def test_search_concept_stream_json_feed(mocker):
+    response = mocker.MagicMock(headers={"cmr-hits": "1"})
+    response.iter_content.return_value = [
+        b'{"feed": {"updated": "2024-01-01", "entry": [{"id": "G1-TEST"}]}}',
+    ]
+    mocker.patch("requests.get", return_value=response)
+
+    assert search_concept(
+        type="granules",
+        search_params={},
+        cmr_environment="UAT",
+        stream=True,
+    ) == [{"id": "G1-TEST"}]
+    response.json.assert_not_called()
+
+
+def test_deduplicate_results():
+    assert deduplicate_results([
+        {"id": "C1-TEST"},
+        {"meta": {"concept-id": "G1-TEST"}},
+        {"id": "C1-TEST", "duplicate": True},
+        {"meta": {"concept-id": "G1-TEST"}, "duplicate": True},
+        {"no": "id"},
+        {"no": "id"},
+    ]) == [
+        {"id": "C1-TEST"},
+        {"meta": {"concept-id": "G1-TEST"}},
+        {"no": "id"},
+        {"no": "id"},
+    ]
+
+
+def test_get_chunk_size():
+    assert get_chunk_size(0, 4) == 1
+    assert get_chunk_size(10, 4) == 3
+    assert get_chunk_size(20_000, 4) == 2000
+
+
+def test_search_concept_chunked(mocker):
+    mock_search_concept = mocker.patch(
+        "cumulus_port.cmr_client.search_concept.search_concept",
+        side_effect=lambda search_params, **kwargs: [
+            {"id": f"G{granule_ur[-1]}-TEST"}
+            for granule_ur in search_params["granule_ur[]"]
+        ],
+    )
+
+    assert search_concept_chunked(
+        type="granules",
+        search_params={
+            "provider": "TEST",
+            "granule_ur[]": ["granule-1", "granule-2", "granule-1", "granule-3"],
+        },
+        cmr_environment="UAT",
+        max_workers=2,
+    ) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}, {"id": "G3-TEST"}]
+    assert mock_search_concept.call_count == 2
+    mock_search_concept.assert_any_call(
+        type="granules",
+        search_params={
+            "provider": "TEST",
+            "granule_ur[]": ["granule-1", "granule-2"],
+        },
+        previous_results=[],
+        headers={},
+        format="json",
+        cmr_environment="UAT",
+        cmr_limit=mocker.ANY,
+        cmr_page_size=2,
+    )
+
+    mock_search_concept.reset_mock()
+    assert search_concept_chunked(
+        type="granules",
+        search_params={"granule_ur[]": ["granule-1", "granule-2", "granule-3"]},
+        cmr_limit=2,
+        chunk_size=1,
+    ) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}]
+    assert mock_search_concept.call_count == 3
+
+
+def test_search_concept_chunked_not_chunkable(mocker):
+    mock_search_concept = mocker.patch(
+        "cumulus_port.cmr_client.search_concept.search_concept",
+        return_value=[{"id": "G1-TEST"}],
+    )
+    search_params = {"attribute[]": ["int,a,1", "int,b,2", "int,c,3"]}
+
+    assert search_concept_chunked(
+        type="granules",
+        search_params=search_params,
+        chunk_size=1,
+    ) == [{"id": "G1-TEST"}]
+    mock_search_concept.assert_called_once()
+    assert mock_search_concept.call_args.kwargs["search_params"] == search_params
+
+
+def test_get_chunkable_param():
+    assert get_chunkable_param({"provider": "TEST"}) is None
+    assert get_chunkable_param({"attribute[]": ["a", "b"]}) is None
+    assert get_chunkable_param({
+        "concept_id[]": ["G1-TEST"],
+        "granule_ur[]": ["granule-1", "granule-2"],
+        "attribute[]": ["a", "b", "c"],
+    }) == ("granule_ur[]", ["granule-1", "granule-2"])
+    assert get_chunkable_param({
+        "concept_id[]": ["G1-TEST"],
+        "granule_ur[]": ["granule-1", "granule-2"],
+        "options[granule_ur][and]": "true",
+    }) == ("concept_id[]", ["G1-TEST"])
+
+
+def test_search_concept_pages(mocker):
+    responses = [
+        mocker.Mock(headers={"cmr-hits": "3", "CMR-Search-After": "after-1"}),
+        mocker.Mock(headers={"cmr-hits": "3", "CMR-Search-After": "after-2"}),
+        mocker.Mock(headers={"cmr-hits": "3"}),
+    ]
+    responses[0].json.return_value = {"items": [{"id": "G1-TEST"}, {"id": "G2-TEST"}]}
+    responses[1].json.return_value = {"items": [{"id": "G3-TEST"}]}
+    responses[2].json.return_value = {"items": []}
+    mock_get = mocker.patch("requests.get", side_effect=responses)
+
+    pages = search_concept_pages(
+        type="granules",
+        search_params={"provider": "TEST"},
+        headers={"Client-Id": "unit-tests"},
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_page_size=2,
+    )
+    assert list(pages) == [
+        SearchPage([{"id": "G1-TEST"}, {"id": "G2-TEST"}], 3, "after-1"),
+        SearchPage([{"id": "G3-TEST"}], 3, "after-2"),
+    ]
+    assert [call.kwargs["headers"] for call in mock_get.call_args_list] == [
+        {"Client-Id": "unit-tests"},
+        {"Client-Id": "unit-tests", "CMR-Search-After": "after-1"},
+        {"Client-Id": "unit-tests", "CMR-Search-After": "after-2"},
+    ]
+    assert mock_get.call_args.kwargs["params"] == {
+        "provider": "TEST",
+        "page_size": "2",
+    }
+
+
+@pytest.fixture
+def mock_cmr_granules(mocker):
+    """Fake CMR search over 100 granules, one per hour of 2024-01-01"""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    granules = [
+        {"id": f"G{i}-TEST", "time_start": start + timedelta(hours=i)}
+        for i in range(100)
+    ]
+
+    def get(url, params, headers, stream):
+        range_start, range_end = (
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+            for value in params["temporal"].split(",")[:2]
+        )
+        matches = [
+            granule
+            for granule in granules
+            if range_start <= granule["time_start"] <= range_end
+        ]
+        offset = int(headers.get("CMR-Search-After", 0))
+        page_size = int(params["page_size"])
+        response = mocker.Mock(headers={"cmr-hits": str(len(matches))})
+        if offset + page_size < len(matches):
+            response.headers["CMR-Search-After"] = str(offset + page_size)
+        response.json.return_value = {
+            "feed": {"entry": matches[offset:offset + page_size]},
+        }
+        response.content = b"x" * 100 * len(response.json.return_value["feed"]["entry"])
+        return response
+
+    return mocker.patch("requests.get", side_effect=get)
+
+
+def test_search_concept_adaptive(mock_cmr_granules):
+    controller = PageSizeController(5, target_bytes=2000)
+    get = mock_cmr_granules.side_effect
+    page_sizes = []
+
+    def get_page(url, params, **kwargs):
+        page_sizes.append(params["page_size"])
+        return get(url, params, **kwargs)
+
+    mock_cmr_granules.side_effect = get_page
+
+    results = search_concept(
+        type="granules",
+        search_params={"temporal": "2024-01-01T00:00:00Z,2024-01-05T03:00:00Z"},
+        cmr_environment="UAT",
+        cmr_limit=60,
+        page_size_controller=controller,
+    )
+
+    assert [granule["id"] for granule in results] == [f"G{i}-TEST" for i in range(60)]
+    # Pages grow until the responses reach the target size of 20 records
+    assert page_sizes == ["5", "10", "20", "20", "20"]
+    assert controller.page_size == 20
+
+
+def test_search_concept_sharded(mock_cmr_granules):
+    results = search_concept_sharded(
+        type="granules",
+        search_params={"temporal": "2024-01-01T00:00:00Z,2024-01-05T03:00:00Z"},
+        cmr_environment="UAT",
+        cmr_page_size=10,
+        max_shards=4,
+        records_per_shard=20,
+    )
+
+    assert [granule["id"] for granule in results] == [
+        f"G{i}-TEST" for i in range(100)
+    ]
+    probes = [
+        call
+        for call in mock_cmr_granules.call_args_list
+        if call.kwargs["params"]["page_size"] == "0"
+    ]
+    # One probe for the whole range and one for each of the 4 shards
+    assert len(probes) == 5
+
+
+def test_search_concept_sharded_adaptive(mock_cmr_granules):
+    # Most of the range is empty, so the shard holding the granules is split
+    # in half until there are 8 shards, 2 of which have granules
+    results = search_concept_sharded(
+        type="granules",
+        search_params={"temporal": "2024-01-01T00:00:00Z,2024-12-31T00:00:00Z"},
+        cmr_environment="UAT",
+        cmr_page_size=10,
+        cmr_limit=50,
+        max_shards=8,
+        records_per_shard=40,
+    )
+
+    assert [granule["id"] for granule in results] == [
+        f"G{i}-TEST" for i in range(50)
+    ]
+    searched_shards = {
+        call.kwargs["params"]["temporal"]
+        for call in mock_cmr_granules.call_args_list
+        if call.kwargs["params"]["page_size"] != "0"
+    }
+    assert len(searched_shards) == 2
+
+
+def test_search_concept_sharded_periodic(mock_cmr_granules):
+    search_concept_sharded(
+        type="granules",
+        search_params={"temporal": "2024-01-01T00:00:00Z,2024-01-05T03:00:00Z,1,2"},
+        cmr_environment="UAT",
+        cmr_page_size=10,
+        max_shards=4,
+        records_per_shard=20,
+    )
+
+    temporals = [call.kwargs["params"]["temporal"] for call in mock_cmr_granules.call_args_list]
+    assert len(set(temporals)) == 5
+    assert all(temporal.endswith("Z,1,2") for temporal in temporals)
+
+
+def test_search_concept_sharded_fractional_start(mock_cmr_granules):
+    # G0 is half a second before the start of the range
+    results = search_concept_sharded(
+        type="granules",
+        search_params={"temporal": "2024-01-01T00:00:00.500Z,2024-01-05T03:00:00Z"},
+        cmr_environment="UAT",
+        cmr_page_size=10,
+        max_shards=4,
+        records_per_shard=20,
+    )
+
+    assert [granule["id"] for granule in results] == [
+        f"G{i}-TEST" for i in range(1, 100)
+    ]
+    temporals = [call.kwargs["params"]["temporal"] for call in mock_cmr_granules.call_args_list]
+    assert temporals[0] == "2024-01-01T00:00:00.500000Z,2024-01-05T03:00:00Z"
+
+
+def test_search_concept_sharded_invalid_temporal():
+    with pytest.raises(ValueError, match="require a single temporal range"):
+        search_concept_sharded(type="granules", search_params={})
+    with pytest.raises(ValueError, match="require a temporal start date"):
+        search_concept_sharded(
+            type="granules",
+            search_params={"temporal": ",2024-01-01T00:00:00Z"},
+        )
+
+
+def test_search_concept_to_file(mocker, tmp_path):
+    responses = [
+        mocker.Mock(headers={"cmr-hits": "5", "CMR-Search-After": "after-1"}),
+        mocker.Mock(headers={"cmr-hits": "5", "CMR-Search-After": "after-2"}),
+    ]
+    responses[0].json.return_value = {"items": [{"id": "G1-TEST"}, {"id": "G2-TEST"}]}
+    responses[1].json.return_value = {"items": [{"id": "G3-TEST"}, {"id": "G4-TEST"}]}
+    mocker.patch("requests.get", side_effect=responses)
+
+    results = search_concept_to_file(
+        type="granules",
+        search_params={},
+        path=tmp_path / "results.ndjson.gz",
+        format="umm_json",
+        cmr_environment="UAT",
+        cmr_limit=3,
+        compress=True,
+    )
+
+    assert len(results) == 3
+    assert results[2] == {"id": "G3-TEST"}
+    assert list(results) == [{"id": "G1-TEST"}, {"id": "G2-TEST"}, {"id": "G3-TEST"}]
+
+
+def test_search_concept_fields(mock_requests):
+    results = search_concept(
+        type="granules",
+        search_params={},
+        cmr_environment="UAT",
+        fields=["id", "title"],
+    )
+
+    assert [record.to_dict() for record in results] == [
+        {"id": "G1-TEST", "title": None},
+    ]
+
+
+def test_search_concept_sharded_fields(mock_cmr_granules):
+    results = search_concept_sharded(
+        type="granules",
+        search_params={"temporal": "2024-01-01T00:00:00Z,2024-01-05T03:00:00Z"},
+        cmr_environment="UAT",
+        cmr_page_size=10,
+        max_shards=4,
+        records_per_shard=20,
+        fields=["id"],
+    )
+
+    assert [record.id for record in results] == [
+        f"G{i}-TEST" for i in range(100)
+    ]
@@ -0,0 +1,27 @@
+import pytest
+from moto import mock_aws
+
+try:
+    from cumulus_port.aws_client import services
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+@mock_aws
+def test_aws_client_memoized():
+    s3 = services.s3()
+
+    assert services.s3() is s3
+    assert services.aws_client("s3") is s3
+    assert services.aws_client("s3", region_name="us-west-2") is not s3
+    assert services.secrets_manager() is not s3
+
+
+@mock_aws
+def test_clear_clients():
+    s3 = services.s3()
+    services.clear_clients()
+
+    assert services.s3() is not s3
@@ -0,0 +1,131 @@
+import pytest
+
+try:
+    from cumulus_port._internal.throttle import get_throttle
+    from cumulus_port.cmr_client import CMR
+    from cumulus_port.cmr_client.earthdata_login import get_edl_token
+    from cumulus_port.cmr_client.search_concept import (
+        iter_search_concept,
+        search_concept,
+        search_concept_chunked,
+        search_concept_pages,
+    )
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+@pytest.fixture
+def cmr_client(stub_cmr):
+    return CMR(
+        provider="TEST",
+        client_id="unit-tests",
+        token="token",
+        oauth_provider="earthdata",
+    )
+
+
+def test_search_granules(cmr_client, stub_cmr):
+    granules = cmr_client.search_granules({"page_size": "40"})
+
+    assert [granule["title"] for granule in granules] == [
+        f"granule-{i:06d}" for i in range(100)
+    ]
+    requests = stub_cmr.search_requests()
+    assert [request.params["page_num"] for request in requests] == [["1"], ["2"], ["3"]]
+    assert requests[0].params["provider_short_name"] == ["TEST"]
+    assert requests[0].headers["Client-Id"] == "unit-tests"
+    assert requests[0].headers["Authorization"] == "token"
+
+
+def test_search_collections(cmr_client, stub_cmr):
+    collections = cmr_client.search_collections(format="umm_json")
+
+    assert [c["umm"]["ShortName"] for c in collections] == [
+        f"COLLECTION-{i}" for i in range(5)
+    ]
+
+
+def test_search_concept_pages(stub_cmr):
+    pages = list(search_concept_pages(
+        type="granules",
+        search_params={"provider": "TEST"},
+        format="umm_json",
+        cmr_page_size=100,
+    ))
+
+    assert [len(page.items) for page in pages] == [100, 100, 50]
+    assert [page.search_after for page in pages] == ["100", "200", None]
+    assert [
+        request.headers.get("CMR-Search-After")
+        for request in stub_cmr.search_requests()
+    ] == [None, "100", "200"]
+
+
+@pytest.mark.parametrize("format", ["json", "umm_json", "echo10"])
+def test_iter_search_concept(stub_cmr, format):
+    results = list(iter_search_concept(
+        type="granules",
+        search_params={"temporal": "2024-01-02T00:00:00Z,2024-01-02T23:59:59Z"},
+        format=format,
+        cmr_limit=1000,
+        cmr_page_size=10,
+    ))
+
+    assert len(results) == 24
+    assert len(stub_cmr.search_requests()) == 3
+
+
+def test_throttled_search(stub_cmr):
+    stub_cmr.throttle(2, retry_after="0")
+
+    results = search_concept(
+        type="granules",
+        search_params={},
+        cmr_page_size=10,
+        cmr_limit=20,
+    )
+
+    assert len(results) == 20
+    assert len(stub_cmr.search_requests()) == 4
+    assert get_throttle().stats()["retriesByStatus"] == {429: 2}
+
+
+def test_throttled_search_exhausted(stub_cmr):
+    stub_cmr.throttle(10, status=503)
+
+    with pytest.raises(Exception, match="503"):
+        search_concept(type="granules", search_params={})
+
+    assert get_throttle().stats()["retries"] == 5
+
+
+def test_concurrent_search(stub_cmr):
+    stub_cmr.latency = 0.05
+    granule_urs = [f"granule-{i:06d}" for i in range(0, 250, 2)]
+
+    results = search_concept_chunked(
+        type="granules",
+        search_params={"granule_ur[]": granule_urs},
+        chunk_size=25,
+        max_workers=5,
+    )
+
+    assert sorted(result["title"] for result in results) == granule_urs
+    assert stub_cmr.max_in_flight == 5
+    # requests does not reuse connections outside of a session
+    assert len(stub_cmr.connections) == len(stub_cmr.requests)
+
+
+def test_get_edl_token(stub_cmr):
+    token = get_edl_token("user", "password", "UAT")
+
+    assert token == stub_cmr.tokens[0]["access_token"]
+    assert get_edl_token("user", "password", "UAT") == token
+    assert [request.method for request in stub_cmr.requests] == ["GET", "POST", "GET"]
+
+
+def test_get_edl_token_invalid_credentials(stub_cmr):
+    with pytest.raises(Exception, match="EarthdataLogin error"):
+        get_edl_token("user", "wrong", "UAT")
@@ -0,0 +1,263 @@
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+try:
+    from cumulus_port._internal import throttle
+    from cumulus_port._internal.throttle import (
+        RetryPolicy,
+        Throttle,
+        TokenBucket,
+        configure_throttle,
+        get_throttle,
+        parse_retry_after,
+    )
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.auth
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def shared_throttle(monkeypatch):
+    sleeps = []
+    shared = Throttle(
+        None,
+        RetryPolicy(3, jitter=lambda low, high: high),
+        sleep=sleeps.append,
+    )
+    monkeypatch.setattr(throttle, "_throttle", shared)
+    shared.sleeps = sleeps
+    return shared
+
+
+def make_response(mocker, status_code, headers={}):
+    return mocker.Mock(status_code=status_code, headers=dict(headers))
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, timer=clock, sleep=clock.sleep)
+
+    # Burst of up to 3 requests
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 0.5
+    assert bucket.acquire() == 0.5
+    assert clock.now == 1.0
+
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 0.5
+
+
+def test_token_bucket_invalid():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after("invalid") is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 28 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_retry_policy_delay(mocker):
+    policy = RetryPolicy(10, base_delay=1, max_delay=5, jitter=lambda low, high: high)
+
+    assert [policy.get_delay({}, attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+    assert policy.get_delay({"Retry-After": "3"}, 0) == 3
+    assert policy.get_delay({"Retry-After": "3600"}, 0) == 5
+
+
+def test_retry_policy_jitter():
+    policy = RetryPolicy(base_delay=1)
+
+    for _ in range(100):
+        assert 0 <= policy.get_delay({}, 2) <= 4
+
+
+def test_retry_policy_should_retry():
+    policy = RetryPolicy(2)
+
+    assert policy.should_retry(429, 0)
+    assert policy.should_retry(503, 1)
+    assert not policy.should_retry(429, 2)
+    assert not policy.should_retry(500, 0)
+    assert not policy.should_retry(200, 0)
+
+
+def test_throttle_retries(mocker):
+    responses = [
+        make_response(mocker, 429, {"Retry-After": "3"}),
+        make_response(mocker, 503),
+        make_response(mocker, 200),
+    ]
+    send = mocker.Mock(side_effect=responses)
+    sleeps = []
+    throttle = Throttle(
+        None,
+        RetryPolicy(base_delay=1, jitter=lambda low, high: high),
+        sleep=sleeps.append,
+    )
+
+    assert throttle.call(send, "https://example.com", params={"a": 1}) is responses[2]
+    assert send.call_count == 3
+    send.assert_called_with("https://example.com", params={"a": 1})
+    assert sleeps == [3, 2]
+    responses[0].close.assert_called_once()
+    responses[1].close.assert_called_once()
+    assert throttle.stats() == {
+        "requests": 3,
+        "throttled": 2,
+        "retries": 2,
+        "retriesByStatus": {429: 1, 503: 1},
+        "waitSeconds": 5,
+    }
+
+    throttle.reset_stats()
+    assert throttle.stats()["requests"] == 0
+
+
+def test_throttle_gives_up(mocker):
+    send = mocker.Mock(return_value=make_response(mocker, 429))
+    throttle = Throttle(None, RetryPolicy(2), sleep=lambda seconds: None)
+
+    assert throttle.call(send).status_code == 429
+    assert send.call_count == 3
+    assert throttle.stats()["retries"] == 2
+    assert throttle.stats()["throttled"] == 3
+
+
+def test_throttle_rate_limit(mocker):
+    clock = FakeClock()
+    send = mocker.Mock(return_value=make_response(mocker, 200))
+    throttle = Throttle(TokenBucket(rate=10, capacity=1, timer=clock, sleep=clock.sleep))
+
+    for _ in range(5):
+        throttle.call(send)
+
+    assert clock.now == pytest.approx(0.4)
+    assert throttle.stats()["waitSeconds"] == pytest.approx(0.4)
+
+
+def test_throttle_call_async(mocker):
+    responses = [
+        mocker.Mock(status=429, headers={"Retry-After": "0"}),
+        mocker.Mock(status=200, headers={}),
+    ]
+    send = mocker.AsyncMock(side_effect=responses)
+    throttle = Throttle(TokenBucket(rate=1000), RetryPolicy())
+
+    assert asyncio.run(throttle.call_async(send)) is responses[1]
+    assert send.await_count == 2
+    responses[0].release.assert_called_once()
+    assert throttle.stats()["retriesByStatus"] == {429: 1}
+
+
+def test_configure_throttle(monkeypatch):
+    monkeypatch.setattr(throttle, "_throttle", get_throttle())
+
+    configured = configure_throttle(rate=5, burst=10, max_retries=2)
+    assert get_throttle() is configured
+    assert configured.bucket.rate == 5
+    assert configured.bucket.capacity == 10
+    assert configured.retry_policy.max_retries == 2
+
+    assert configure_throttle().bucket is None
+
+
+def test_throttle_from_env(monkeypatch):
+    monkeypatch.setenv("CMR_RATE_LIMIT", "20")
+    monkeypatch.setenv("CMR_MAX_RETRIES", "7")
+
+    from_env = throttle._throttle_from_env()
+    assert from_env.bucket.rate == 20
+    assert from_env.bucket.capacity == 20
+    assert from_env.retry_policy.max_retries == 7
+
+
+@pytest.mark.parametrize("name, value", [
+    ("CMR_RATE_LIMIT", "fast"),
+    ("CMR_RATE_LIMIT", "0"),
+    ("CMR_RATE_BURST", "many"),
+    ("CMR_MAX_RETRIES", "1.5"),
+])
+def test_throttle_from_env_invalid(monkeypatch, caplog, name, value):
+    monkeypatch.setenv("CMR_RATE_LIMIT", "20")
+    monkeypatch.setenv(name, value)
+    monkeypatch.setattr(throttle, "_throttle", throttle._UNSET)
+
+    from_env = get_throttle()
+    assert from_env.bucket is None
+    assert from_env.retry_policy.max_retries == 5
+    assert get_throttle() is from_env
+    assert "using the defaults" in caplog.text
+
+
+def test_import_with_invalid_env():
+    result = subprocess.run(
+        [sys.executable, "-c", "import cumulus_port.cmr_client.cmr"],
+        env={**os.environ, "CMR_RATE_LIMIT": "fast"},
+        capture_output=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_search_concept_retries(mocker, shared_throttle):
+    from cumulus_port.cmr_client.search_concept import search_concept
+
+    ok = mocker.Mock(status_code=200, headers={"cmr-hits": "1"})
+    ok.json.return_value = {"feed": {"entry": [{"id": "G1-TEST"}]}}
+    mock_get = mocker.patch(
+        "requests.get",
+        side_effect=[make_response(mocker, 429, {"Retry-After": "1"}), ok],
+    )
+
+    assert search_concept(
+        type="granules",
+        search_params={},
+        cmr_environment="UAT",
+    ) == [{"id": "G1-TEST"}]
+    assert mock_get.call_count == 2
+    assert shared_throttle.sleeps == [1]
+    assert shared_throttle.stats()["retriesByStatus"] == {429: 1}
+
+
+def test_edl_retries(mocker, shared_throttle):
+    from cumulus_port.cmr_client.earthdata_login import create_edl_token
+
+    ok = mocker.Mock(status_code=200)
+    ok.json.return_value = {"access_token": "token"}
+    mocker.patch(
+        "requests.post",
+        side_effect=[make_response(mocker, 503), make_response(mocker, 503), ok],
+    )
+
+    assert create_edl_token("user", "pass", "UAT") == "token"
+    assert shared_throttle.sleeps == [0.5, 1.0]
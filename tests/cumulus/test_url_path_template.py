@@ -1,4 +1,12 @@
-from cumulus_port.ingest.url_path_template import url_path_template
+import pytest
+
+from cumulus_port._internal.lazy_mapping import LazyMapping
+from cumulus_port.ingest.url_path_template import (
+    evaluate_operation,
+    get_template_paths,
+    get_template_root_fields,
+    url_path_template,
+)
 
 
 def test_noop():
@@ -39,3 +47,125 @@ def test_jsonpath():
             },
         },
     ) == "test"
+
+
+def test_lazy_context(mocker):
+    loader = mocker.Mock(return_value={"bar": "lazy"})
+    context = LazyMapping({"foo": "test"}, loaders={"baz": loader})
+
+    assert url_path_template("{foo}", context) == "test"
+    loader.assert_not_called()
+
+    assert url_path_template("{foo}/{baz.bar}/{baz.bar}", context) == "test/lazy/lazy"
+    loader.assert_called_once_with()
+
+
+def test_get_template_paths():
+    assert get_template_paths("foo") == []
+    assert get_template_paths(
+        "{foo.bar}/{extractYear(baz.qux)}/{substring(a.b, 0, 3)}/",
+    ) == ["foo.bar", "baz.qux", "a.b"]
+
+
+def test_get_template_root_fields():
+    assert get_template_root_fields("foo/") == set()
+    assert get_template_root_fields(
+        "{granule.granuleId}/{file.name}/{granule.dataType}",
+    ) == {"granule", "file"}
+    assert get_template_root_fields(
+        "{$.cmrMetadata.TemporalExtent}/{$['granule'].granuleId}",
+    ) == {"cmrMetadata", "granule"}
+    assert get_template_root_fields(
+        "{extractYear(cmrMetadata.TemporalExtent.RangeDateTime.BeginningDateTime)}",
+    ) == {"cmrMetadata"}
+
+
+def test_operations():
+    context = {
+        "cmrMetadata": {
+            "BeginningDateTime": "2024-03-05T07:08:09.123456Z",
+            "ProductionDateTime": "2024-12-31T23:30:00-02:00",
+            "GranuleUR": "S1A_IW_GRDH_1SDV",
+        },
+        "granule": {"createdAt": 1728584239122},
+    }
+
+    assert url_path_template(
+        "{extractYear(cmrMetadata.BeginningDateTime)}/"
+        "{extractMonth(cmrMetadata.BeginningDateTime)}/"
+        "{extractDate(cmrMetadata.BeginningDateTime)}/"
+        "{extractHour(cmrMetadata.BeginningDateTime)}/",
+        context,
+    ) == "2024/3/5/7/"
+    assert url_path_template(
+        "{extractYear(cmrMetadata.ProductionDateTime)}",
+        context,
+    ) == "2025"
+    assert url_path_template(
+        "{extractYear(granule.createdAt)}",
+        context,
+    ) == "2024"
+    assert url_path_template(
+        "{dateFormat(cmrMetadata.BeginningDateTime, YYYY/MM/DD/DDDD)}",
+        context,
+    ) == "2024/03/05/065"
+    assert url_path_template(
+        "{dateFormat(cmrMetadata.BeginningDateTime, YYYYMMDD[T]HHmmss.SSS)}",
+        context,
+    ) == "20240305T070809.123"
+    assert url_path_template(
+        "{dateFormat(cmrMetadata.BeginningDateTime)}",
+        context,
+    ) == "2024-03-05T07:08:09Z"
+    assert url_path_template(
+        "{substring(cmrMetadata.GranuleUR, 0, 3)}/"
+        "{substring(cmrMetadata.GranuleUR, 4)}/"
+        "{substring(cmrMetadata.GranuleUR, 7, 4)}",
+        context,
+    ) == "S1A/IW_GRDH_1SDV/IW_"
+    assert url_path_template(
+        "{defaultTo(granule.missing, unknown)}/"
+        "{defaultTo(cmrMetadata.GranuleUR, unknown)}",
+        context,
+    ) == "unknown/S1A_IW_GRDH_1SDV"
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("/data/2024/01/file.nc", "/data/2024/01"),
+    ("data/2024/file.nc", "data/2024"),
+    ("data/2024/", "data"),
+    ("/data//file.nc", "/data/"),
+    ("/file.nc", "/"),
+    ("file.nc", "."),
+    ("", "."),
+])
+def test_extract_path(source, expected):
+    assert url_path_template(
+        "{extractPath(file.source)}",
+        {"file": {"source": source}},
+    ) == expected
+
+
+def test_operation_errors():
+    context = {"foo": "not a date"}
+
+    with pytest.raises(Exception, match="Could not support operation doStuff"):
+        url_path_template("{doStuff(foo)}", context)
+    with pytest.raises(Exception, match="Invalid date 'not a date'"):
+        url_path_template("{extractYear(foo)}", context)
+    with pytest.raises(Exception, match="Could not resolve path 'bar'"):
+        url_path_template("{extractYear(bar)}", context)
+
+
+def test_evaluate_operation():
+    assert evaluate_operation("extractYear", ["2024-03-05T07:08:09Z"]) == "2024"
+    assert evaluate_operation("substring", ["abcdef", "1", "3"]) == "bc"
+    with pytest.raises(Exception, match="Could not support operation doStuff"):
+        evaluate_operation("doStuff", ["foo"])
+
+
+def test_nested_template():
+    assert url_path_template(
+        "{foo}/{extractYear(date)}",
+        {"foo": "{bar}", "bar": "test", "date": "2020-01-01"},
+    ) == "test/2020"